@@ -10,7 +10,8 @@ from mcc.cognitive.service import CognitiveSimulationService
 
 def create_service() -> CognitiveSimulationService:
     base_workdir = os.environ.get("P1_WORKDIR", str(Path(__file__).resolve().parents[1] / "sim_jobs"))
-    return CognitiveSimulationService(base_workdir=base_workdir)
+    memory_backend = os.environ.get("P1_MEMORY_BACKEND", "jsonl")
+    return CognitiveSimulationService(base_workdir=base_workdir, memory_backend=memory_backend)
 
 
 def create_app():
@@ -113,10 +114,28 @@ def create_app():
                 objectives=payload["objectives"],
                 constraints=payload.get("constraints", []),
                 n=int(payload.get("n", 1)),
+                transfer_from=payload.get("transfer_from"),
             )
         except Exception as e:
             api_error(400, "SUGGEST_FAILED", "Could not suggest experiments", str(e))
 
+    @app.post("/experiments/promote")
+    def promote(payload: Dict[str, Any]):
+        try:
+            return service.promote_experiments(
+                domain=payload["domain"],
+                backend=payload["backend"],
+                low_fidelity_domain=payload["low_fidelity_domain"],
+                design_space=payload["design_space"],
+                objectives=payload["objectives"],
+                constraints=payload.get("constraints", []),
+                fixed_parameters=payload.get("fixed_parameters"),
+                costs=payload.get("costs"),
+                n=int(payload.get("n", 1)),
+            )
+        except Exception as e:
+            api_error(400, "PROMOTE_FAILED", "Could not promote experiments", str(e))
+
     @app.get("/health/live")
     def health_live():
         return {"status": "ok", "ts": int(time.time())}
@@ -154,6 +173,7 @@ def create_app():
                 "path": os.environ.get("P1_AUDIT_LOG_PATH", str(Path(__file__).resolve().parents[1] / "sim_jobs" / "api_audit.jsonl")),
             },
             "workdir": os.environ.get("P1_WORKDIR", str(Path(__file__).resolve().parents[1] / "sim_jobs")),
+            "memory_backend": service.memory_backend,
         }
 
     return app
@@ -1,9 +1,33 @@
 from .schema import ConstraintSpec, ExperimentSpec, ObjectiveSpec, RunResult
-from .planner import DesignSpace, ExperimentPlanner, BaselineGridPlanner, ModelBasedPlanner, OptunaTPEPlanner
-from .memory import CognitiveMemoryStore
-from .engine import CognitiveEngine
-from .pareto import pareto_front, dominates, objective_vector
+from .planner import (
+    DesignSpace,
+    Dimension,
+    ExperimentPlanner,
+    BaselineGridPlanner,
+    ModelBasedPlanner,
+    GaussianProcessPlanner,
+    ExpectedHypervolumePlanner,
+    TrustRegionPlanner,
+    MultiFidelityPlanner,
+    OptunaTPEPlanner,
+)
+from .frame import HistoryFrame
+from .memory import CognitiveMemoryStore, MemoryStore, SQLiteMemoryStore, open_memory
+from .engine import AsyncCognitiveEngine, CognitiveEngine
+from .hypervolume import HypervolumeTrace, HypervolumePlateau
+from .pareto import (
+    pareto_front,
+    pareto_layers,
+    dominates,
+    objective_vector,
+    non_dominated_sort,
+    crowding_distance,
+    epsilon_front_mask,
+    ParetoArchive,
+)
 from .domain_bridge import DomainSimulationBridge
+from .transfer import TransferPrior
+from .scheduler import SuccessiveHalvingScheduler
 
 __all__ = [
     "ConstraintSpec",
@@ -11,14 +35,33 @@ __all__ = [
     "ObjectiveSpec",
     "RunResult",
     "DesignSpace",
+    "Dimension",
     "ExperimentPlanner",
     "BaselineGridPlanner",
     "ModelBasedPlanner",
+    "GaussianProcessPlanner",
+    "ExpectedHypervolumePlanner",
+    "TrustRegionPlanner",
+    "MultiFidelityPlanner",
     "OptunaTPEPlanner",
+    "HistoryFrame",
     "CognitiveMemoryStore",
+    "MemoryStore",
+    "SQLiteMemoryStore",
+    "open_memory",
     "CognitiveEngine",
+    "AsyncCognitiveEngine",
+    "HypervolumeTrace",
+    "HypervolumePlateau",
     "pareto_front",
+    "pareto_layers",
     "dominates",
     "objective_vector",
+    "non_dominated_sort",
+    "crowding_distance",
+    "epsilon_front_mask",
+    "ParetoArchive",
     "DomainSimulationBridge",
+    "TransferPrior",
+    "SuccessiveHalvingScheduler",
 ]
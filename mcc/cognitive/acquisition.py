@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Literal, Tuple
+
+import numpy as np
+
+# Helpers for maximizing an acquisition function over a box: scoring very large
+# candidate pools in chunks (optionally on a worker pool) and polishing the best
+# candidates with a local optimizer.
+
+ExecutorKind = Literal["thread", "process"]
+RefineMethod = Literal["auto", "nelder_mead", "lbfgsb"]
+
+
+def map_chunks(
+    fn: Callable[[np.ndarray], object],
+    points: np.ndarray,
+    *,
+    chunk_size: int = 4096,
+    workers: int = 1,
+    executor: ExecutorKind = "thread",
+) -> List[object]:
+    """Apply `fn` to consecutive row chunks of `points`; results keep chunk order.
+
+    With `workers > 1` chunks run on a thread pool (NumPy releases the GIL in
+    its kernels) or, for `executor="process"`, a process pool, in which case
+    `fn` must be picklable.
+    """
+    chunks = [points[i:i + chunk_size] for i in range(0, len(points), max(1, chunk_size))]
+    if workers <= 1 or len(chunks) <= 1:
+        return [fn(c) for c in chunks]
+    with _executor(executor, min(workers, len(chunks))) as pool:
+        return list(pool.map(fn, chunks))
+
+
+def refine(
+    objective: Callable[[np.ndarray], float],
+    starts: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    *,
+    method: RefineMethod = "auto",
+    max_iter: int = 50,
+    workers: int = 1,
+    executor: ExecutorKind = "thread",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Multi-start local maximization of `objective` inside [lower, upper].
+
+    "auto" uses SciPy's L-BFGS-B when SciPy is installed and the NumPy
+    Nelder-Mead below otherwise. Returns (points, values), one row per start.
+    """
+    if method == "auto":
+        try:
+            import scipy.optimize  # noqa: F401  # type: ignore
+            method = "lbfgsb"
+        except Exception:
+            method = "nelder_mead"
+    run = _LocalSearch(objective, np.asarray(lower, dtype=float), np.asarray(upper, dtype=float), method, max_iter)
+    starts = np.atleast_2d(np.asarray(starts, dtype=float))
+    if workers <= 1 or len(starts) <= 1:
+        results = [run(x) for x in starts]
+    else:
+        with _executor(executor, min(workers, len(starts))) as pool:
+            results = list(pool.map(run, starts))
+    points = np.array([x for x, _ in results]).reshape(len(starts), -1)
+    return points, np.array([v for _, v in results], dtype=float)
+
+
+def nelder_mead(
+    objective: Callable[[np.ndarray], float],
+    x0: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    *,
+    max_iter: int = 50,
+    step: float = 0.05,
+    tol: float = 1e-8,
+) -> Tuple[np.ndarray, float]:
+    """Maximize `objective` from `x0` with Nelder-Mead inside a box.
+
+    Vertices may leave the box; they are scored at their projection minus a
+    penalty growing with the distance outside, which keeps the simplex from
+    collapsing onto a face. `step` sizes the initial simplex as a fraction of
+    each axis span.
+    """
+    span = np.where(upper > lower, upper - lower, 1.0)
+
+    def f(x: np.ndarray) -> float:
+        inside = np.clip(x, lower, upper)
+        value = objective(inside)
+        excess = float(np.abs((x - inside) / span).sum())
+        return value - excess * (1.0 + abs(value)) if excess > 0 else value
+
+    x0 = np.clip(np.asarray(x0, dtype=float), lower, upper)
+    simplex = np.vstack([x0, x0 + np.diag(step * span)])
+    values = np.array([f(x) for x in simplex], dtype=float)
+
+    for _ in range(max_iter):
+        order = np.argsort(-values, kind="stable")
+        simplex, values = simplex[order], values[order]
+        if values[0] - values[-1] <= tol * (abs(values[0]) + tol):
+            break
+        centroid = simplex[:-1].mean(axis=0)
+        worst = simplex[-1]
+
+        reflected = centroid + (centroid - worst)
+        fr = f(reflected)
+        if fr > values[0]:
+            expanded = centroid + 2.0 * (centroid - worst)
+            fe = f(expanded)
+            simplex[-1], values[-1] = (expanded, fe) if fe > fr else (reflected, fr)
+            continue
+        if fr > values[-2]:
+            simplex[-1], values[-1] = reflected, fr
+            continue
+
+        contracted = centroid + 0.5 * (worst - centroid)
+        fc = f(contracted)
+        if fc > values[-1]:
+            simplex[-1], values[-1] = contracted, fc
+            continue
+
+        # shrink every vertex towards the best one
+        simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+        values[1:] = [f(x) for x in simplex[1:]]
+
+    best = int(np.argmax(values))
+    x = np.clip(simplex[best], lower, upper)
+    return x, float(objective(x))
+
+
+def top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, best first (stable for ties)."""
+    k = min(k, len(values))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    part = np.argpartition(-values, k - 1)[:k]
+    return part[np.argsort(-values[part], kind="stable")]
+
+
+class _LocalSearch:
+    """Picklable per-start worker for `refine`."""
+
+    def __init__(self, objective, lower: np.ndarray, upper: np.ndarray, method: str, max_iter: int):
+        self.objective = objective
+        self.lower = lower
+        self.upper = upper
+        self.method = method
+        self.max_iter = max_iter
+
+    def __call__(self, x0: np.ndarray) -> Tuple[np.ndarray, float]:
+        if self.method == "lbfgsb":
+            from scipy.optimize import minimize  # type: ignore
+
+            res = minimize(
+                lambda x: -self.objective(x),
+                x0,
+                method="L-BFGS-B",
+                bounds=list(zip(self.lower, self.upper)),
+                options={"maxiter": self.max_iter},
+            )
+            return np.clip(res.x, self.lower, self.upper), float(-res.fun)
+        return nelder_mead(self.objective, x0, self.lower, self.upper, max_iter=self.max_iter)
+
+
+def _executor(kind: ExecutorKind, workers: int) -> Executor:
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers)
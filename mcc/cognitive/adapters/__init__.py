@@ -1,4 +1,4 @@
-from .base import SimulationAdapter, SimulationJob, SimulationResult
+from .base import RunningSimulation, SimulationAdapter, SimulationJob, SimulationResult
 from .openfoam_adapter import OpenFOAMAdapter
 from .lammps_adapter import LAMMPSAdapter
 from .su2_adapter import SU2Adapter
@@ -6,6 +6,7 @@ from .codesaturne_adapter import CodeSaturneAdapter
 from .qe_adapter import QuantumEspressoAdapter
 
 __all__ = [
+    "RunningSimulation",
     "SimulationAdapter",
     "SimulationJob",
     "SimulationResult",
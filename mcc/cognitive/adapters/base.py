@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import json
+import os
+import signal
+import subprocess
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, List, Literal, Optional
+from pathlib import Path
+from typing import Callable, Dict, List, Literal, Optional
 
 
 JobStatus = Literal["queued", "running", "completed", "failed"]
@@ -27,8 +33,84 @@ class SimulationResult:
     error: Optional[str] = None
 
 
+class RunningSimulation:
+    """A solver process started by `SimulationAdapter.launch`, logging to a file.
+
+    `poll_metrics` parses the complete log lines appended since the previous
+    call with the adapter's log parser and merges them into `metrics`, so the
+    "_last" values follow the run while it goes; means cover the new text only.
+    """
+
+    def __init__(
+        self,
+        job: SimulationJob,
+        process: subprocess.Popen,
+        log_path: Path,
+        parser: Callable[[str], Dict[str, float]],
+    ):
+        self.job = job
+        self.process = process
+        self.log_path = log_path
+        self.parser = parser
+        self.metrics: Dict[str, float] = {}
+        self.started_at = time.monotonic()
+        self._offset = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def poll(self) -> Optional[int]:
+        """Exit code, or None while the solver is still running."""
+        return self.process.poll()
+
+    def poll_metrics(self) -> Dict[str, float]:
+        if not self.log_path.exists():
+            return dict(self.metrics)
+        exited = self.process.poll() is not None
+        with self.log_path.open("rb") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        # a partial last line is parsed once it is complete (or the solver exited)
+        end = len(chunk) if exited else chunk.rfind(b"\n") + 1
+        if end > 0:
+            self._offset += end
+            self.metrics.update(self.parser(chunk[:end].decode("utf-8", errors="replace")))
+        return dict(self.metrics)
+
+    def log_tail(self, size: int = 4000) -> str:
+        if not self.log_path.exists():
+            return ""
+        with self.log_path.open("rb") as f:
+            f.seek(max(0, self.log_path.stat().st_size - size))
+            return f.read().decode("utf-8", errors="replace")
+
+    def kill(self, grace_seconds: float = 5.0) -> None:
+        """Terminate the solver and everything it spawned, escalating to SIGKILL after the grace period."""
+        if self.process.poll() is not None:
+            return
+        if os.name == "posix":
+            os.killpg(self.process.pid, signal.SIGTERM)
+        else:
+            self.process.terminate()
+        try:
+            self.process.wait(timeout=grace_seconds)
+        except subprocess.TimeoutExpired:
+            if os.name == "posix":
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+            self.process.wait()
+
+
 class SimulationAdapter(ABC):
-    """Unified adapter contract for all simulation backends."""
+    """Unified adapter contract for all simulation backends.
+
+    Backends that implement `command` (and usually `parse_log`) can also be
+    started with `launch`, which streams the solver output to `solver.log` in
+    the job directory so a scheduler can watch intermediate metrics and stop
+    the run early; `collect` turns the finished process into a result.
+    """
 
     @abstractmethod
     def backend_name(self) -> str:
@@ -45,3 +127,60 @@ class SimulationAdapter(ABC):
     @abstractmethod
     def parse_results(self, job: SimulationJob) -> SimulationResult:
         pass
+
+    def command(self, job: SimulationJob) -> Optional[List[str]]:
+        """Solver command line for `job`, or None when it cannot be launched here."""
+        return None
+
+    def parse_log(self, text: str) -> Dict[str, float]:
+        """Metrics found in a piece of solver output."""
+        return {}
+
+    def launch(self, job: SimulationJob) -> Optional[RunningSimulation]:
+        """Start the solver in the background; None if this backend cannot be launched."""
+        cmd = self.command(job)
+        if cmd is None:
+            return None
+        log_path = Path(job.workdir) / "solver.log"
+        with log_path.open("wb") as log:
+            process = subprocess.Popen(
+                cmd,
+                cwd=job.workdir,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=os.environ.copy(),
+                # own process group, so `kill` also reaches the solver's children
+                start_new_session=os.name == "posix",
+            )
+        return RunningSimulation(job, process, log_path, self.parse_log)
+
+    def collect(self, running: RunningSimulation) -> SimulationResult:
+        """Result of a launched job once its process has exited."""
+        job = running.job
+        code = running.process.wait()
+        running.poll_metrics()
+        logs = [tail for tail in [running.log_tail()] if tail]
+        if code != 0:
+            return SimulationResult(
+                job_id=job.job_id,
+                status="failed",
+                metrics=dict(running.metrics),
+                error=f"{self.backend_name()} failed with code {code}",
+                logs=logs,
+            )
+
+        metrics_file = Path(job.workdir) / "metrics.json"
+        if not metrics_file.exists():
+            extracted = self.parse_log(running.log_path.read_text(encoding="utf-8", errors="replace"))
+            if not extracted:
+                return SimulationResult(
+                    job_id=job.job_id,
+                    status="failed",
+                    error=f"{self.backend_name()} completed but metrics.json not found.",
+                    logs=logs,
+                )
+            metrics_file.write_text(json.dumps({"metrics": extracted}, indent=2), encoding="utf-8")
+            logs.append("Auto-extracted metrics from solver.log")
+        parsed = self.parse_results(job)
+        parsed.logs.extend(logs)
+        return parsed
@@ -5,7 +5,7 @@ import os
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 
 from .base import SimulationAdapter, SimulationJob, SimulationResult
 from .parsers import parse_lammps_metrics
@@ -46,33 +46,15 @@ class LAMMPSAdapter(SimulationAdapter):
             return self.parse_results(job)
 
         cmd = os.environ.get("LAMMPS_CMD", "lmp")
-        exe = shutil.which(cmd)
-        wsl = shutil.which("wsl")
-        wsl_distro = os.environ.get("P1_WSL_DISTRO", "Ubuntu")
-
-        if exe is not None:
+        argv = self.command(job)
+        if argv is not None:
             proc = subprocess.run(
-                [exe, "-in", "in.simulation"],
+                argv,
                 cwd=str(job_dir),
                 capture_output=True,
                 text=True,
                 env=os.environ.copy(),
             )
-        elif wsl is not None:
-            win_path = str(job_dir).replace('\\', '/')
-            if ':' in win_path:
-                drive = win_path[0].lower()
-                tail = win_path[2:]
-                wsl_dir = f"/mnt/{drive}{tail}"
-            else:
-                wsl_dir = win_path
-            cmdline = f"cd '{wsl_dir}' && {cmd} -in in.simulation"
-            proc = subprocess.run(
-                [wsl, "-d", wsl_distro, "bash", "-lc", cmdline],
-                capture_output=True,
-                text=True,
-                env=os.environ.copy(),
-            )
         else:
             return SimulationResult(
                 job_id=job.job_id,
@@ -116,6 +98,28 @@ class LAMMPSAdapter(SimulationAdapter):
             logs=logs,
         )
 
+    def command(self, job: SimulationJob) -> Optional[List[str]]:
+        cmd = os.environ.get("LAMMPS_CMD", "lmp")
+        exe = shutil.which(cmd)
+        if exe is not None:
+            return [exe, "-in", "in.simulation"]
+        wsl = shutil.which("wsl")
+        if wsl is None:
+            return None
+        wsl_distro = os.environ.get("P1_WSL_DISTRO", "Ubuntu")
+        win_path = str(job.workdir).replace('\\', '/')
+        if ':' in win_path:
+            drive = win_path[0].lower()
+            tail = win_path[2:]
+            wsl_dir = f"/mnt/{drive}{tail}"
+        else:
+            wsl_dir = win_path
+        cmdline = f"cd '{wsl_dir}' && {cmd} -in in.simulation"
+        return [wsl, "-d", wsl_distro, "bash", "-lc", cmdline]
+
+    def parse_log(self, text: str) -> Dict[str, float]:
+        return parse_lammps_metrics(text)
+
     def parse_results(self, job: SimulationJob) -> SimulationResult:
         metrics_file = Path(job.workdir) / "metrics.json"
         if not metrics_file.exists():
@@ -5,7 +5,7 @@ import os
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 
 from .base import SimulationAdapter, SimulationJob, SimulationResult
 from .parsers import parse_openfoam_metrics
@@ -52,33 +52,15 @@ class OpenFOAMAdapter(SimulationAdapter):
         if not allrun.exists():
             return SimulationResult(job_id=job.job_id, status="failed", error="Allrun not found")
 
-        shell = shutil.which("bash") or shutil.which("sh")
-        wsl = shutil.which("wsl")
-        wsl_distro = os.environ.get("P1_WSL_DISTRO", "Ubuntu")
-
-        if shell is not None:
+        cmd = self.command(job)
+        if cmd is not None:
             proc = subprocess.run(
-                [shell, str(allrun)],
+                cmd,
                 cwd=str(job_dir),
                 capture_output=True,
                 text=True,
                 env=os.environ.copy(),
             )
-        elif wsl is not None:
-            win_path = str(job_dir).replace("\\", "/")
-            if ":" in win_path:
-                drive = win_path[0].lower()
-                tail = win_path[2:]
-                wsl_dir = f"/mnt/{drive}{tail}"
-            else:
-                wsl_dir = win_path
-            cmdline = f"cd '{wsl_dir}' && bash ./Allrun"
-            proc = subprocess.run(
-                [wsl, "-d", wsl_distro, "bash", "-lc", cmdline],
-                capture_output=True,
-                text=True,
-                env=os.environ.copy(),
-            )
         else:
             return SimulationResult(
                 job_id=job.job_id,
@@ -121,6 +103,32 @@ class OpenFOAMAdapter(SimulationAdapter):
             logs=logs,
         )
 
+    def command(self, job: SimulationJob) -> Optional[List[str]]:
+        job_dir = Path(job.workdir)
+        allrun = job_dir / "Allrun"
+        if not allrun.exists():
+            return None
+
+        shell = shutil.which("bash") or shutil.which("sh")
+        if shell is not None:
+            return [shell, str(allrun)]
+        wsl = shutil.which("wsl")
+        if wsl is None:
+            return None
+        wsl_distro = os.environ.get("P1_WSL_DISTRO", "Ubuntu")
+        win_path = str(job_dir).replace("\\", "/")
+        if ":" in win_path:
+            drive = win_path[0].lower()
+            tail = win_path[2:]
+            wsl_dir = f"/mnt/{drive}{tail}"
+        else:
+            wsl_dir = win_path
+        cmdline = f"cd '{wsl_dir}' && bash ./Allrun"
+        return [wsl, "-d", wsl_distro, "bash", "-lc", cmdline]
+
+    def parse_log(self, text: str) -> Dict[str, float]:
+        return parse_openfoam_metrics(text)
+
     def parse_results(self, job: SimulationJob) -> SimulationResult:
         metrics_file = Path(job.workdir) / "metrics.json"
         if not metrics_file.exists():
@@ -48,3 +48,47 @@ def parse_lammps_metrics(text: str) -> Dict[str, float]:
         metrics["Press_last"] = float(press[-1])
 
     return metrics
+
+
+def parse_su2_metrics(text: str) -> Dict[str, float]:
+    metrics: Dict[str, float] = {}
+
+    # Screen output is a "|"-separated table: a header row of field names, then numeric rows
+    #   |  Inner_Iter|    rms[Rho]|   rms[RhoU]|          CL|          CD|
+    #   |          10|   -3.123456|   -2.654321|    0.251234|    0.012345|
+    header, last = None, None
+    for line in text.splitlines():
+        if "|" not in line:
+            continue
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        try:
+            values = [float(c) for c in cells]
+        except ValueError:
+            header = cells
+            continue
+        if header is not None and len(values) == len(header):
+            last = dict(zip(header, values))
+
+    if last:
+        for name, value in last.items():
+            key = name.upper()
+            if key in ("INNER_ITER", "OUTER_ITER", "TIME_ITER"):
+                metrics["iteration_last"] = value
+            elif key == "CL":
+                metrics["Cl_last"] = value
+            elif key == "CD":
+                metrics["Cd_last"] = value
+        rms = [v for k, v in last.items() if k.lower().startswith("rms[")]
+        if rms:
+            # SU2 prints log10 of the RMS residuals; track the slowest-converging one
+            metrics["residual_log10_rms_last"] = max(rms)
+
+    # Coefficient summaries written as "Cl = ..." / "Cd = ..." lines
+    m = re.findall(r"\bCl\b\s*=\s*([0-9eE+\-.]+)", text)
+    if m:
+        metrics["Cl_last"] = float(m[-1])
+    m = re.findall(r"\bCd\b\s*=\s*([0-9eE+\-.]+)", text)
+    if m:
+        metrics["Cd_last"] = float(m[-1])
+
+    return metrics
@@ -5,9 +5,10 @@ import os
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 
 from .base import SimulationAdapter, SimulationJob, SimulationResult
+from .parsers import parse_su2_metrics
 
 
 class SU2Adapter(SimulationAdapter):
@@ -37,12 +38,15 @@ class SU2Adapter(SimulationAdapter):
         if metrics_file.exists():
             return self.parse_results(job)
 
-        cmd = os.environ.get("SU2_CMD", "SU2_CFD")
-        exe = shutil.which(cmd)
-        if exe is None:
-            return SimulationResult(job_id=job.job_id, status="failed", error=f"SU2 executable not found: {cmd}")
+        cmd = self.command(job)
+        if cmd is None:
+            return SimulationResult(
+                job_id=job.job_id,
+                status="failed",
+                error=f"SU2 executable not found: {os.environ.get('SU2_CMD', 'SU2_CFD')}",
+            )
 
-        proc = subprocess.run([exe, "config.cfg"], cwd=str(job_dir), capture_output=True, text=True)
+        proc = subprocess.run(cmd, cwd=str(job_dir), capture_output=True, text=True)
         logs = [x for x in [proc.stdout[-4000:] if proc.stdout else "", proc.stderr[-4000:] if proc.stderr else ""] if x]
 
         if proc.returncode != 0:
@@ -55,6 +59,13 @@ class SU2Adapter(SimulationAdapter):
 
         return SimulationResult(job_id=job.job_id, status="failed", error="SU2 completed but metrics.json not found.", logs=logs)
 
+    def command(self, job: SimulationJob) -> Optional[List[str]]:
+        exe = shutil.which(os.environ.get("SU2_CMD", "SU2_CFD"))
+        return [exe, "config.cfg"] if exe is not None else None
+
+    def parse_log(self, text: str) -> Dict[str, float]:
+        return parse_su2_metrics(text)
+
     def parse_results(self, job: SimulationJob) -> SimulationResult:
         metrics_file = Path(job.workdir) / "metrics.json"
         if not metrics_file.exists():
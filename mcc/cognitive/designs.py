@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Literal
+
+import numpy as np
+
+# Space-filling designs on the unit cube. Every generator is addressed by point
+# index, so a restarted caller that knows how many points it has consumed picks
+# up exactly where the sequence left off.
+
+DesignKind = Literal["sobol", "halton", "lhs", "diagonal"]
+
+_SOBOL_BITS = 30
+
+
+def sobol(start: int, count: int, dims: int, *, scramble: bool = True, seed: int = 0) -> np.ndarray:
+    """Points `start .. start+count-1` of a `dims`-dimensional Sobol sequence.
+
+    Direction numbers come from primitive polynomials over GF(2), enumerated in
+    order of degree, with odd initial values drawn from a fixed seed. With
+    `scramble`, a random linear matrix scramble plus digital shift (also fixed
+    by `seed`) is applied; it keeps the (t, s) net structure.
+    """
+    v = _sobol_directions(dims, scramble, seed)
+    idx = np.arange(start, start + count, dtype=np.int64)
+    x = np.zeros((count, dims), dtype=np.int64)
+    for k in range(_SOBOL_BITS):
+        bit = ((idx >> k) & 1).astype(bool)
+        if bit.any():
+            x[bit] ^= v[:, k]
+    if scramble:
+        x ^= _digital_shift(dims, seed)
+    return (x + 0.5) / float(1 << _SOBOL_BITS)
+
+
+def halton(start: int, count: int, dims: int, *, scramble: bool = True, seed: int = 0) -> np.ndarray:
+    """Points `start .. start+count-1` of a Halton sequence (the origin is skipped).
+
+    With `scramble`, the digits of each base go through a fixed random
+    permutation that keeps 0 in place, which removes the correlation between
+    high-dimensional coordinates.
+    """
+    idx = np.arange(start + 1, start + count + 1, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    out = np.empty((count, dims))
+    for j, base in enumerate(_primes(dims)):
+        perm = np.arange(base)
+        if scramble:
+            perm[1:] = 1 + rng.permutation(base - 1)
+        n = idx.copy()
+        value = np.zeros(count)
+        scale = 1.0 / base
+        while n.any():
+            value += perm[n % base] * scale
+            n //= base
+            scale /= base
+        out[:, j] = value
+    return out
+
+
+def maximin_lhs(start: int, count: int, dims: int, *, block: int = 16, candidates: int = 32, seed: int = 0) -> np.ndarray:
+    """Points `start .. start+count-1` from consecutive maximin Latin hypercubes.
+
+    The sequence is cut into blocks of `block` points; each block is the best
+    of `candidates` random Latin hypercubes by minimum pairwise distance, drawn
+    from a generator seeded by (seed, block number).
+    """
+    first, last = start // block, (start + count - 1) // block
+    blocks = [_lhs_block(b, dims, block, candidates, seed) for b in range(first, last + 1)]
+    pts = np.vstack(blocks) if blocks else np.empty((0, dims))
+    offset = start - first * block
+    return pts[offset: offset + count]
+
+
+def diagonal(start: int, count: int, dims: int) -> np.ndarray:
+    """The legacy lockstep sweep: every coordinate at min(1, step / max(10, step))."""
+    step = np.arange(start + 1, start + count + 1, dtype=float)
+    frac = np.minimum(1.0, step / np.maximum(10.0, step))
+    return np.repeat(frac[:, None], dims, axis=1)
+
+
+def design_points(kind: DesignKind, start: int, count: int, dims: int, *, seed: int = 0) -> np.ndarray:
+    if kind == "sobol":
+        return sobol(start, count, dims, seed=seed)
+    if kind == "halton":
+        return halton(start, count, dims, seed=seed)
+    if kind == "lhs":
+        return maximin_lhs(start, count, dims, seed=seed)
+    if kind == "diagonal":
+        return diagonal(start, count, dims)
+    raise ValueError(f"Unsupported design: {kind}")
+
+
+def _lhs_block(number: int, dims: int, size: int, candidates: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng([seed, number])
+    strata = np.argsort(rng.uniform(size=(candidates, size, dims)), axis=1)
+    designs = (strata + rng.uniform(size=(candidates, size, dims))) / size
+    diff = designs[:, :, None, :] - designs[:, None, :, :]
+    d2 = (diff * diff).sum(axis=3)
+    d2[:, np.arange(size), np.arange(size)] = np.inf
+    return designs[int(np.argmax(d2.min(axis=(1, 2))))]
+
+
+def _digital_shift(dims: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng([seed, 1])
+    return rng.integers(0, 1 << _SOBOL_BITS, size=dims, dtype=np.int64)
+
+
+@lru_cache(maxsize=16)
+def _sobol_directions(dims: int, scramble: bool, seed: int) -> np.ndarray:
+    """(dims, bits) direction numbers V[j, k] = m_k << (bits - 1 - k)."""
+    rng = np.random.default_rng([seed, 0])
+    v = np.zeros((dims, _SOBOL_BITS), dtype=np.int64)
+    v[0] = [1 << (_SOBOL_BITS - 1 - k) for k in range(_SOBOL_BITS)]
+    for j, poly in enumerate(_primitive_polynomials(dims - 1), start=1):
+        s = poly.bit_length() - 1
+        # free initial values: m_k odd and below 2^(k+1)
+        m = [2 * int(rng.integers(0, 1 << k)) + 1 for k in range(s)]
+        for k in range(s, _SOBOL_BITS):
+            new = m[k - s] ^ (m[k - s] << s)
+            for i in range(1, s):
+                if (poly >> (s - i)) & 1:
+                    new ^= m[k - i] << i
+            m.append(new)
+        v[j] = [m[k] << (_SOBOL_BITS - 1 - k) for k in range(_SOBOL_BITS)]
+
+    if scramble:
+        # left-multiply each generator matrix by a random unit lower-triangular bit matrix
+        for j in range(dims):
+            # row r: unit diagonal plus random bits in the more significant columns c < r
+            rows = [
+                (1 << (_SOBOL_BITS - 1 - r)) | (int(rng.integers(0, 1 << r)) << (_SOBOL_BITS - r))
+                for r in range(_SOBOL_BITS)
+            ]
+            v[j] = [_lower_triangular_apply(rows, int(col)) for col in v[j]]
+    return v
+
+
+def _lower_triangular_apply(rows: List[int], col: int) -> int:
+    out = 0
+    for r, row in enumerate(rows):
+        if bin(row & col).count("1") & 1:
+            out |= 1 << (_SOBOL_BITS - 1 - r)
+    return out
+
+
+def _primitive_polynomials(count: int) -> List[int]:
+    """The first `count` primitive polynomials over GF(2) as bit masks, by degree."""
+    out: List[int] = []
+    degree = 1
+    while len(out) < count:
+        for poly in range(1 << degree | 1, 1 << (degree + 1), 2):
+            if _is_primitive(poly, degree):
+                out.append(poly)
+                if len(out) == count:
+                    break
+        degree += 1
+    return out
+
+
+def _is_primitive(poly: int, degree: int) -> bool:
+    order = (1 << degree) - 1
+    if _x_power_mod(order, poly, degree) != 1:
+        return False
+    return all(_x_power_mod(order // q, poly, degree) != 1 for q in _prime_factors(order))
+
+
+def _x_power_mod(e: int, poly: int, degree: int) -> int:
+    # x itself must be reduced when the modulus is linear
+    result, base = 1, 2 if degree > 1 else 2 ^ poly
+    while e:
+        if e & 1:
+            result = _mulmod(result, base, poly, degree)
+        base = _mulmod(base, base, poly, degree)
+        e >>= 1
+    return result
+
+
+def _mulmod(a: int, b: int, poly: int, degree: int) -> int:
+    out = 0
+    while b:
+        if b & 1:
+            out ^= a
+        b >>= 1
+        a <<= 1
+        if a >> degree & 1:
+            a ^= poly
+    return out
+
+
+def _prime_factors(n: int) -> List[int]:
+    out, p = [], 2
+    while p * p <= n:
+        if n % p == 0:
+            out.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        out.append(n)
+    return out
+
+
+def _primes(count: int) -> List[int]:
+    out: List[int] = []
+    n = 2
+    while len(out) < count:
+        if all(n % p for p in out if p * p <= n):
+            out.append(n)
+        n += 1
+    return out
@@ -1,23 +1,59 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Dict, List, Literal
+import asyncio
+import inspect
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Literal, Optional, Sequence, Union
 
-from .memory import CognitiveMemoryStore
-from .pareto import pareto_front
+from .acquisition import ExecutorKind, _executor
+from .hypervolume import HypervolumeTrace
+from .memory import MemoryStore
+from .pareto import ParetoArchive
 from .planner import DesignSpace, ExperimentPlanner
-from .schema import ConstraintSpec, ObjectiveSpec, RunResult
+from .schema import ConstraintSpec, ExperimentSpec, ObjectiveSpec, RunResult
 
-SimulatorFn = Callable[[Dict[str, float]], Dict[str, float]]
+SimulatorFn = Callable[[Dict[str, float]], Union[Dict[str, float], Awaitable[Dict[str, float]]]]
 PenaltyMode = Literal["discard", "soft"]
+StopRule = Callable[[HypervolumeTrace], bool]
+_Refill = Callable[[List[ExperimentSpec], int], List[ExperimentSpec]]
+_Done = Callable[[ExperimentSpec, object], None]
+
+# how often `_pump` checks whether queued runs have started, so their timeout clocks can begin
+_QUEUE_POLL = 0.01
 
 
 @dataclass
 class CognitiveEngine:
+    """Plan, simulate and record one batch of experiments per `run_iteration`.
+
+    By default the specs of an iteration are simulated one after another
+    and a simulator exception propagates. With `workers` > 1, a `timeout`,
+    an `Executor` instance, or an `async def` simulator they run
+    concurrently instead: up to `workers` at a time on a thread or process
+    pool (`executor`, a kind or a caller-owned pool; process pools need a
+    picklable simulator) or as asyncio tasks. Each run then has `timeout`
+    seconds from its start, and exceptions and timeouts are recorded as
+    "failed" runs with an error note rather than raised. Results always
+    keep the order of the proposed specs. A timed-out run on an owned
+    process pool is killed with the pool's workers (runs in flight there
+    start over on a new pool); on a thread pool or a caller-owned executor
+    it is abandoned and finishes in the background.
+    """
+
     domain: str
     planner: ExperimentPlanner
-    memory: CognitiveMemoryStore
+    memory: MemoryStore
     simulator: SimulatorFn
+    # raw objective values for the hypervolume trace; None fixes it from the first feasible runs
+    hypervolume_reference: Optional[Dict[str, float]] = None
+    workers: int = 1
+    executor: Union[ExecutorKind, Executor] = "thread"
+    timeout: Optional[float] = None
+    # Pareto archives and hypervolume traces per objective set, kept in step with the memory between calls
+    _archives: Dict[tuple, ParetoArchive] = field(default_factory=dict, init=False, repr=False)
+    _traces: Dict[tuple, HypervolumeTrace] = field(default_factory=dict, init=False, repr=False)
 
     def run_iteration(
         self,
@@ -28,8 +64,9 @@ class CognitiveEngine:
         n: int = 1,
         penalty_mode: PenaltyMode = "discard",
         penalty_value: float = 1e6,
+        pending: Sequence[Dict[str, float]] = (),
     ) -> List[RunResult]:
-        history = self.memory.load_all()
+        history = self.memory.load_frame()
         specs = self.planner.propose(
             domain=self.domain,
             design_space=design_space,
@@ -37,45 +74,219 @@ class CognitiveEngine:
             constraints=constraints,
             history=history,
             n=n,
+            pending=pending,
         )
 
         results: List[RunResult] = []
-        for spec in specs:
-            outputs = self.simulator(spec.parameters)
-            status = self._check_constraints(outputs, spec.constraints)
+        try:
+            self._evaluate(specs, results, penalty_mode, penalty_value)
+        finally:
+            # one batched write per iteration; runs finished before a simulator error are kept
+            self.memory.append_many(results)
+        if objectives:
+            self.hypervolume_trace(objectives).record(self.memory.load_frame())
+        return results
 
-            if status == "ok":
-                score = self._score(outputs, spec.objectives)
-            elif penalty_mode == "soft":
-                score = -abs(penalty_value)
-            else:
-                score = None
-
-            notes = []
-            if spec.metadata:
-                planner_name = spec.metadata.get("planner")
-                acq = spec.metadata.get("acquisition")
-                if planner_name:
-                    notes.append(f"planner={planner_name}")
-                if acq:
-                    notes.append(f"acquisition={acq}")
-
-            result = RunResult(
-                experiment_id=spec.experiment_id,
-                status=status,
-                parameters=dict(spec.parameters),
-                outputs=outputs,
-                score=score,
-                notes=notes,
+    def run_campaign(
+        self,
+        *,
+        max_iterations: int,
+        stop: Optional[StopRule] = None,
+        design_space: DesignSpace,
+        objectives: List[ObjectiveSpec],
+        constraints: List[ConstraintSpec],
+        **iteration_kwargs,
+    ) -> List[RunResult]:
+        """Run iterations until `stop` (e.g. `HypervolumePlateau`) accepts the hypervolume trace, or `max_iterations`."""
+        results: List[RunResult] = []
+        for _ in range(max_iterations):
+            results.extend(
+                self.run_iteration(
+                    design_space=design_space,
+                    objectives=objectives,
+                    constraints=constraints,
+                    **iteration_kwargs,
+                )
             )
-            self.memory.append(result)
-            results.append(result)
-
+            if stop is not None and objectives and stop(self.hypervolume_trace(objectives)):
+                break
         return results
 
+    def _evaluate(
+        self,
+        specs: List[ExperimentSpec],
+        results: List[RunResult],
+        penalty_mode: PenaltyMode,
+        penalty_value: float,
+    ) -> None:
+        for spec, outcome in zip(specs, self._simulate(specs)):
+            results.append(self._result(spec, outcome, penalty_mode, penalty_value))
+
+    def _result(
+        self,
+        spec: ExperimentSpec,
+        outcome: object,
+        penalty_mode: PenaltyMode,
+        penalty_value: float,
+    ) -> RunResult:
+        """RunResult for a spec from its simulator outputs, or from the exception it ended with."""
+        if isinstance(outcome, BaseException):
+            outputs: Dict[str, float] = {}
+            status = "failed"
+        else:
+            outputs = outcome
+            status = self._check_constraints(outputs, spec.constraints)
+
+        if status == "ok":
+            score = self._score(outputs, spec.objectives)
+        elif penalty_mode == "soft":
+            score = -abs(penalty_value)
+        else:
+            score = None
+
+        notes = []
+        if spec.metadata:
+            planner_name = spec.metadata.get("planner")
+            acq = spec.metadata.get("acquisition")
+            if planner_name:
+                notes.append(f"planner={planner_name}")
+            if acq:
+                notes.append(f"acquisition={acq}")
+        if isinstance(outcome, BaseException):
+            notes.append(f"error={type(outcome).__name__}: {outcome}")
+
+        return RunResult(
+            experiment_id=spec.experiment_id,
+            status=status,
+            parameters=dict(spec.parameters),
+            outputs=outputs,
+            score=score,
+            notes=notes,
+        )
+
+    def _simulate(self, specs: List[ExperimentSpec]):
+        """Simulator outputs per spec, in spec order; concurrent modes yield exceptions instead of raising."""
+        serial = self.workers <= 1 and self.timeout is None and not isinstance(self.executor, Executor)
+        if serial and not _is_async(self.simulator):
+            for spec in specs:
+                yield self.simulator(spec.parameters)
+            return
+        outcomes: List[object] = [None] * len(specs)
+        position = {id(spec): i for i, spec in enumerate(specs)}
+        queue = list(specs)
+
+        def refill(running: List[ExperimentSpec], free: int) -> List[ExperimentSpec]:
+            taken = queue[:free]
+            del queue[:free]
+            return taken
+
+        def done(spec: ExperimentSpec, outcome: object) -> None:
+            outcomes[position[id(spec)]] = outcome
+
+        self._pump(refill, done, max(1, self.workers), len(specs))
+        yield from outcomes
+
+    def _pump(self, refill: _Refill, done: _Done, limit: int, total: int) -> None:
+        """Keep up to `limit` simulations running until `refill` has nothing more to start.
+
+        `refill(running specs, free slots)` returns the specs to start next;
+        `done(spec, outcome)` receives each one's outputs, or the exception or
+        `TimeoutError` it ended with, in launch order among runs finishing
+        together. `total` bounds how many runs an owned pool may ever see.
+
+        A run's timeout clock starts once its future is seen running, not at
+        submit. Abandoned threads cannot be stopped, so an owned thread pool
+        may grow to one thread per run. An owned process pool is torn down
+        after an abandonment instead: its workers are terminated, and the runs
+        still in flight there start over on a fresh pool with fresh clocks.
+        """
+        if _is_async(self.simulator):
+            asyncio.run(self._pump_async(refill, done, limit))
+            return
+        owned = not isinstance(self.executor, Executor)
+        size = max(1, total if self.executor == "thread" else min(limit, total))
+        pool = _executor(self.executor, size) if owned else self.executor
+        # future -> [spec, monotonic time it was first seen running, or None while queued]
+        running: Dict[Future, List] = {}
+        try:
+            while True:
+                for spec in refill([spec for spec, _ in running.values()], limit - len(running)):
+                    running[pool.submit(self.simulator, spec.parameters)] = [spec, None]
+                if not running:
+                    break
+                deadline = None
+                if self.timeout is not None:
+                    now = time.monotonic()
+                    for future, entry in running.items():
+                        if entry[1] is None and future.running():
+                            entry[1] = now
+                    started = [t for _, t in running.values() if t is not None]
+                    if started:
+                        deadline = max(0.0, min(started) + self.timeout - now)
+                    if len(started) < len(running):
+                        # queued runs have no clock yet; look again shortly
+                        deadline = _QUEUE_POLL if deadline is None else min(deadline, _QUEUE_POLL)
+                finished, _ = wait(running, timeout=deadline, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                abandoned = False
+                for future, (spec, started) in list(running.items()):
+                    if future in finished:
+                        del running[future]
+                        try:
+                            done(spec, future.result())
+                        except Exception as exc:
+                            done(spec, exc)
+                    elif started is not None and now - started >= self.timeout:
+                        del running[future]
+                        abandoned = True
+                        done(spec, TimeoutError(f"no result after {self.timeout:g}s"))
+                if abandoned and owned and self.executor == "process":
+                    _terminate(pool)
+                    pool = _executor(self.executor, size)
+                    resubmitted = [spec for spec, _ in running.values()]
+                    running = {pool.submit(self.simulator, spec.parameters): [spec, None] for spec in resubmitted}
+        finally:
+            if owned:
+                if self.executor == "process" and running:
+                    _terminate(pool)
+                else:
+                    pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _pump_async(self, refill: _Refill, done: _Done, limit: int) -> None:
+        async def one(params: Dict[str, float]) -> object:
+            try:
+                return await asyncio.wait_for(self.simulator(params), self.timeout)
+            except asyncio.TimeoutError:
+                return TimeoutError(f"no result after {self.timeout:g}s")
+            except Exception as exc:
+                return exc
+
+        running: Dict[asyncio.Task, ExperimentSpec] = {}
+        while True:
+            for spec in refill(list(running.values()), limit - len(running)):
+                running[asyncio.ensure_future(one(spec.parameters))] = spec
+            if not running:
+                break
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in [t for t in running if t in finished]:
+                done(running.pop(task), task.result())
+
     def current_pareto_front(self, objectives: List[ObjectiveSpec]) -> List[RunResult]:
-        history = self.memory.load_all()
-        return pareto_front(history, objectives)
+        """Non-dominated "ok" runs; only runs stored since the previous call are merged in."""
+        return self._archive(objectives).sync(self.memory.load_frame()).front
+
+    def hypervolume_trace(self, objectives: List[ObjectiveSpec]) -> HypervolumeTrace:
+        """Hypervolume after each `run_iteration` with these objectives, against the evaluations so far."""
+        key = tuple((o.name, o.direction) for o in objectives)
+        if key not in self._traces:
+            self._traces[key] = HypervolumeTrace(
+                objectives, self.hypervolume_reference, archive=self._archive(objectives)
+            )
+        return self._traces[key]
+
+    def _archive(self, objectives: List[ObjectiveSpec]) -> ParetoArchive:
+        key = tuple((o.name, o.direction) for o in objectives)
+        return self._archives.setdefault(key, ParetoArchive(objectives))
 
     @staticmethod
     def _score(outputs: Dict[str, float], objectives: List[ObjectiveSpec]) -> float:
@@ -104,3 +315,93 @@ class CognitiveEngine:
             elif c.kind == "eq" and c.value is not None and abs(val - c.value) > 1e-9:
                 return "infeasible"
         return "ok"
+
+
+@dataclass
+class AsyncCognitiveEngine(CognitiveEngine):
+    """Steady-state optimization loop: `in_flight` evaluations always running, no batch barrier.
+
+    `run` starts `in_flight` proposals; every time one finishes, its result
+    is stored and the planner is asked for a single replacement, with the
+    points still running passed as `pending` so it plans around them.
+    Simulators run as in concurrent `run_iteration` mode: on the `executor`
+    pool or as asyncio tasks, with per-run `timeout`, and exceptions and
+    timeouts stored as "failed" runs. The hypervolume trace gets one record
+    per completed run.
+    """
+
+    in_flight: int = 4
+
+    def run(
+        self,
+        *,
+        design_space: DesignSpace,
+        objectives: List[ObjectiveSpec],
+        constraints: List[ConstraintSpec],
+        budget: int,
+        penalty_mode: PenaltyMode = "discard",
+        penalty_value: float = 1e6,
+        stop: Optional[StopRule] = None,
+    ) -> List[RunResult]:
+        """Evaluate up to `budget` points; results in completion order.
+
+        Once `stop` accepts the hypervolume trace no new points are started;
+        runs already in flight are still finished and stored.
+        """
+        results: List[RunResult] = []
+        launched = 0
+        stopped = False
+
+        def propose(n: int, pending: List[ExperimentSpec]) -> List[ExperimentSpec]:
+            return self.planner.propose(
+                domain=self.domain,
+                design_space=design_space,
+                objectives=objectives,
+                constraints=constraints,
+                history=self.memory.load_frame(),
+                n=n,
+                pending=[spec.parameters for spec in pending],
+            )
+
+        def refill(running: List[ExperimentSpec], free: int) -> List[ExperimentSpec]:
+            nonlocal launched
+            n = 0 if stopped else min(free, budget - launched)
+            # the slots are filled as one batch, then one replacement per finished run
+            specs = propose(n, []) if n > 0 and not running else []
+            while len(specs) < n and running:
+                picked = propose(1, running + specs)
+                if not picked:
+                    break
+                specs.extend(picked)
+            launched += len(specs)
+            return specs
+
+        def done(spec: ExperimentSpec, outcome: object) -> None:
+            nonlocal stopped
+            result = self._result(spec, outcome, penalty_mode, penalty_value)
+            self.memory.append(result)
+            results.append(result)
+            if objectives:
+                trace = self.hypervolume_trace(objectives)
+                trace.record(self.memory.load_frame())
+                stopped = stopped or (stop is not None and stop(trace))
+
+        self._pump(refill, done, max(1, self.in_flight), budget)
+        return results
+
+
+def _terminate(pool: Executor) -> None:
+    """Shut a process pool down and kill its workers, hung simulations included."""
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(5.0)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def _is_async(fn: Callable) -> bool:
+    return inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(getattr(fn, "__call__", None))
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .frame import output_matrix, parameter_matrix, status_mask
+from .gp import GaussianProcess, norm_cdf, squared_distances
+from .schema import ConstraintSpec, RunResult
+
+_CHUNK_ELEMENTS = 4_000_000
+
+
+class FeasibilityModel:
+    """Probability that a design point passes its constraints, learned from history.
+
+    Two parts, both over unit-box parameters:
+      - one GP per constrained output field, fitted on every run that reported
+        the field (ok and infeasible alike); P(constraint met) follows from the
+        Gaussian predictive distribution
+      - a kernel-smoothed status classifier with a Beta(`prior`) prior, which
+        covers what the regressions cannot: runs that "failed" without outputs,
+        and all infeasibility when a constraint field was never observed
+
+    Constraints are treated as independent, so P(feasible) is the product of
+    the per-constraint probabilities and the classifier's estimate. With
+    `enabled=False` nothing is learned and every point counts as feasible.
+
+    Both parts train on the newest `max_points` rows at most; the window start
+    moves in half-window steps. Rows are parsed once as the history grows
+    (same prefix check as the planners' packed history), and a regression whose
+    window only gained rows is extended instead of refitted.
+    """
+
+    def __init__(
+        self,
+        length_scale: float = 0.2,
+        prior: tuple[float, float] = (1.0, 1.0),
+        threshold: float = 0.05,
+        min_rows: int = 5,
+        max_points: int = 512,
+        noise: float = 1e-4,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.length_scale = length_scale
+        self.prior = prior
+        self.threshold = threshold
+        self.min_rows = min_rows
+        self.max_points = max_points
+        self.noise = noise
+        self._regressions: List[tuple[ConstraintSpec, GaussianProcess]] = []
+        self._status_x = np.empty((0, 0))
+        self._status_y = np.empty(0)
+        self._categorical: np.ndarray | None = None
+        # raw columns of every run with a known status, appended to as the history grows
+        self._key: tuple | None = None
+        self._rows = 0
+        self._last_id: str | None = None
+        self._x = np.empty((0, 0))
+        self._ok = np.empty(0, dtype=bool)
+        self._failed = np.empty(0, dtype=bool)
+        self._fields = np.empty((0, 0))
+        # per constraint field: fitted GP and the rows it was trained on, in GP order
+        self._scale: tuple | None = None
+        self._gps: Dict[str, tuple[GaussianProcess, np.ndarray]] = {}
+
+    def fit(
+        self,
+        history: Sequence[RunResult],
+        names: Sequence[str],
+        lower: np.ndarray,
+        span: np.ndarray,
+        constraints: Sequence[ConstraintSpec],
+        categorical: np.ndarray | None = None,
+    ) -> "FeasibilityModel":
+        """Update from `history`; `categorical` flags unit columns compared by Hamming distance."""
+        safe_span = np.where(span > 0, span, 1.0)
+        self._sync(history, names, [c.field for c in constraints])
+
+        self._regressions = []
+        self._categorical = categorical
+        if not self.enabled:
+            self._status_x, self._status_y = np.empty((0, len(names))), np.empty(0)
+            return self
+        scale = (tuple(lower), tuple(safe_span), None if categorical is None else tuple(categorical))
+        if scale != self._scale:
+            self._scale, self._gps = scale, {}
+        for j, c in enumerate(constraints):
+            if c.kind == "eq":
+                continue
+            seen = self._window(np.nonzero(~np.isnan(self._fields[:, j]))[0])
+            if len(seen) < self.min_rows:
+                continue
+            self._regressions.append((c, self._regression(c.field, j, seen, lower, safe_span)))
+
+        # with every constraint modelled, the classifier only has to learn crashes
+        modelled = {id(c) for c, _ in self._regressions}
+        if constraints and all(id(c) in modelled for c in constraints):
+            ok = ~self._failed
+        else:
+            ok = self._ok
+        rows = self._window(np.arange(len(ok)))
+        if len(rows) and not ok[rows].all():
+            self._status_x, self._status_y = self._unit(rows, lower, safe_span), ok[rows].astype(float)
+        else:
+            self._status_x, self._status_y = np.empty((0, len(names))), np.empty(0)
+        return self
+
+    def _sync(self, history: Sequence[RunResult], names: Sequence[str], fields: Sequence[str]) -> None:
+        """Parse the rows appended since the last fit; a rewritten history starts over."""
+        key = (tuple(names), tuple(fields))
+        stale = (
+            key != self._key
+            or len(history) < self._rows
+            or (self._rows > 0 and history[self._rows - 1].experiment_id != self._last_id)
+        )
+        if stale:
+            self._key, self._rows, self._last_id = key, 0, None
+            self._x = np.empty((0, len(names)))
+            self._ok = np.empty(0, dtype=bool)
+            self._failed = np.empty(0, dtype=bool)
+            self._fields = np.empty((0, len(fields)))
+            self._gps = {}
+        new = history[self._rows:]
+        if len(new):
+            known = status_mask(new, "ok", "infeasible", "failed")
+            self._x = np.vstack([self._x, parameter_matrix(new, names)[known]])
+            self._ok = np.append(self._ok, status_mask(new, "ok")[known])
+            self._failed = np.append(self._failed, status_mask(new, "failed")[known])
+            self._fields = np.vstack([self._fields, output_matrix(new, fields)[known]])
+            self._rows = len(history)
+            self._last_id = history[-1].experiment_id
+
+    def _window(self, rows: np.ndarray) -> np.ndarray:
+        """The newest `max_points` of `rows`, starting on a half-window step."""
+        step = max(1, self.max_points // 2)
+        excess = max(0, len(rows) - self.max_points)
+        return rows[-(-excess // step) * step:]
+
+    def _unit(self, rows: np.ndarray, lower: np.ndarray, safe_span: np.ndarray) -> np.ndarray:
+        x = self._x[rows]
+        return np.where(np.isnan(x), 0.5, (x - lower) / safe_span)
+
+    def _regression(
+        self, field: str, j: int, rows: np.ndarray, lower: np.ndarray, safe_span: np.ndarray
+    ) -> GaussianProcess:
+        gp, known = self._gps.get(field, (None, np.empty(0, dtype=int)))
+        if gp is None or not np.array_equal(rows[:len(known)], known):
+            gp = GaussianProcess(length_scale=self.length_scale, noise=self.noise, categorical=self._categorical)
+            gp.fit(self._unit(rows, lower, safe_span), self._fields[rows, j])
+        else:
+            added = rows[len(known):]
+            for u, y in zip(self._unit(added, lower, safe_span), self._fields[added, j]):
+                gp.add(u, y)
+        self._gps[field] = (gp, rows)
+        return gp
+
+    @property
+    def trivial(self) -> bool:
+        """True when nothing was learned and every point is predicted feasible."""
+        return not self._regressions and not len(self._status_y)
+
+    def predict(self, unit_points: np.ndarray) -> np.ndarray:
+        """P(feasible) for each row of unit-box coordinates."""
+        u = np.atleast_2d(np.asarray(unit_points, dtype=float))
+        p = np.ones(len(u))
+        for c, gp in self._regressions:
+            mean, var = gp.predict(u)
+            p *= self._constraint_probability(c, mean, np.sqrt(var))
+        if len(self._status_y):
+            p *= self._status_probability(u)
+        return p
+
+    def keep_mask(self, p: np.ndarray, n: int) -> np.ndarray:
+        """Candidates to keep: P(feasible) >= threshold, or the n most likely if too few pass."""
+        keep = p >= self.threshold
+        if keep.sum() < n:
+            keep = np.zeros(len(p), dtype=bool)
+            keep[np.argsort(-p, kind="stable")[:n]] = True
+        return keep
+
+    @staticmethod
+    def _constraint_probability(c: ConstraintSpec, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+        std = np.maximum(std, 1e-12)
+        if c.kind == "lte":
+            return norm_cdf((c.value - mean) / std) if c.value is not None else np.ones(len(mean))
+        if c.kind == "gte":
+            return 1.0 - norm_cdf((c.value - mean) / std) if c.value is not None else np.ones(len(mean))
+        upper = norm_cdf((c.high - mean) / std) if c.high is not None else np.ones(len(mean))
+        lower = norm_cdf((c.low - mean) / std) if c.low is not None else np.zeros(len(mean))
+        return np.maximum(upper - lower, 0.0)
+
+    def _status_probability(self, u: np.ndarray) -> np.ndarray:
+        a, b = self.prior
+        out = np.empty(len(u))
+        chunk = max(1, _CHUNK_ELEMENTS // max(1, self._status_x.size))
+        for start in range(0, len(u), chunk):
+            q = u[start:start + chunk]
+            sq = squared_distances(q, self._status_x, self._categorical)
+            w = np.exp(-0.5 * sq / self.length_scale**2)
+            out[start:start + chunk] = (a + w @ self._status_y) / (a + b + w.sum(axis=1))
+        return out
+
+
+def feasibility_weighted(values: np.ndarray, p_feasible: np.ndarray) -> np.ndarray:
+    """Acquisition times P(feasible); signed acquisitions are shifted to be non-negative first."""
+    finite = values[np.isfinite(values)]
+    floor = min(0.0, float(finite.min())) if finite.size else 0.0
+    return (values - floor) * p_feasible
+
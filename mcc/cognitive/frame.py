@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, overload
+
+import numpy as np
+
+from .schema import RunResult
+
+# status codes of HistoryFrame rows; statuses outside this list get codes after it
+STATUS_NAMES = ("ok", "failed", "infeasible")
+
+# largest integer a float64 column holds exactly
+_EXACT_INT = 2**53
+
+
+class _Columns:
+    """Named float64 columns over a growing row buffer.
+
+    Each column has a kind: "int" and "float" columns hold numbers (NaN marks
+    a missing key), "text" columns hold the index of the value in `levels`.
+    Values that do not fit the column (booleans, NaN, huge integers, text in
+    a numeric column and vice versa) are returned to the caller to keep
+    elsewhere.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.kinds: List[str | None] = []
+        self.levels: List[List[object]] = []
+        self.level_index: List[Dict[object, int]] = []
+        self.data = np.empty((capacity, 0))
+
+    def copy_header(self, data: np.ndarray) -> "_Columns":
+        out = _Columns()
+        out.names = list(self.names)
+        out.index = dict(self.index)
+        out.kinds = list(self.kinds)
+        out.levels = [list(lv) for lv in self.levels]
+        out.level_index = [dict(li) for li in self.level_index]
+        out.data = data
+        return out
+
+    def reserve(self, rows: int) -> None:
+        if rows > len(self.data):
+            grown = np.full((max(rows, 2 * len(self.data), 64), len(self.names)), np.nan)
+            grown[:len(self.data)] = self.data
+            self.data = grown
+
+    def _column(self, name: str) -> int:
+        j = self.index.get(name)
+        if j is None:
+            j = len(self.names)
+            self.names.append(name)
+            self.index[name] = j
+            self.kinds.append(None)
+            self.levels.append([])
+            self.level_index.append({})
+            self.data = np.hstack([self.data, np.full((len(self.data), 1), np.nan)])
+        return j
+
+    def put(self, row: int, values: Mapping[str, object]) -> Dict[str, object] | None:
+        extra: Dict[str, object] | None = None
+        for name, value in values.items():
+            j = self._column(name)
+            kind = self.kinds[j]
+            if isinstance(value, str) and kind in (None, "text"):
+                code = self.level_index[j].get(value)
+                if code is None:
+                    code = self.level_index[j][value] = len(self.levels[j])
+                    self.levels[j].append(value)
+                self.kinds[j] = "text"
+                self.data[row, j] = code
+                continue
+            if kind != "text" and not isinstance(value, (bool, np.bool_)):
+                if isinstance(value, (int, np.integer)) and abs(value) <= _EXACT_INT:
+                    self.kinds[j] = kind or "int"
+                    self.data[row, j] = value
+                    continue
+                if isinstance(value, (float, np.floating)) and not math.isnan(value):
+                    self.kinds[j] = "float"
+                    self.data[row, j] = value
+                    continue
+            extra = extra or {}
+            extra[name] = value
+        return extra
+
+    def value(self, j: int, x: float) -> object:
+        kind = self.kinds[j]
+        if kind == "text":
+            return self.levels[j][int(x)]
+        return int(x) if kind == "int" else float(x)
+
+    def row(self, i: int) -> Dict[str, object]:
+        values = self.data[i]
+        return {name: self.value(j, values[j]) for j, name in enumerate(self.names) if not np.isnan(values[j])}
+
+
+class HistoryFrame(Sequence[RunResult]):
+    """Columnar, append-only history of RunResults.
+
+    Parameter and output names are stored once; values live in float64 NumPy
+    columns (NaN where a run lacks the key), text parameters as codes into a
+    per-column level list, status as a small-int code (see `STATUS_NAMES`),
+    and identical note lists are shared. Rows read back as RunResult views
+    built on access, so the frame drops in wherever a `Sequence[RunResult]`
+    is expected; planners, `pareto_front` and the engine also read its
+    columns directly (`parameter_matrix`, `output_matrix`, `status_mask`).
+
+    Values a float column cannot represent exactly (booleans, NaN, integers
+    beyond 2**53, text mixed into numeric columns) are kept per row as they
+    are. Slices are cheap views that do not see rows appended later.
+    """
+
+    def __init__(self, runs: Iterable[RunResult] = ()):
+        self._n = 0
+        self._ids: List[str] = []
+        self._notes: List[tuple] = []
+        self._shared_notes: Dict[tuple, tuple] = {}
+        self._status = np.empty(0, dtype=np.int8)
+        self._status_names: List[str] = list(STATUS_NAMES)
+        self._score = np.empty(0)
+        self._parameters = _Columns()
+        self._outputs = _Columns()
+        # row -> (parameters, outputs) values kept outside the columns
+        self._extra: Dict[int, tuple[Dict[str, object], Dict[str, object]]] = {}
+        self._view = False
+        self.extend(runs)
+
+    @classmethod
+    def from_runs(cls, runs: Iterable[RunResult]) -> "HistoryFrame":
+        return cls(runs)
+
+    def __len__(self) -> int:
+        return self._n
+
+    @overload
+    def __getitem__(self, i: int) -> RunResult: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "HistoryFrame": ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._take(*i.indices(self._n))
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("HistoryFrame index out of range")
+        return self._run(i)
+
+    def __iter__(self) -> Iterator[RunResult]:
+        for i in range(self._n):
+            yield self._run(i)
+
+    def __repr__(self) -> str:
+        return (
+            f"HistoryFrame(rows={self._n}, parameters={self.parameter_names}, "
+            f"outputs={self.output_names})"
+        )
+
+    @property
+    def parameter_names(self) -> tuple[str, ...]:
+        return tuple(self._parameters.names)
+
+    @property
+    def output_names(self) -> tuple[str, ...]:
+        return tuple(self._outputs.names)
+
+    @property
+    def experiment_ids(self) -> Sequence[str]:
+        return self._ids
+
+    @property
+    def scores(self) -> np.ndarray:
+        """Score per row, NaN where a run has none."""
+        return self._score[:self._n]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the NumPy columns (ids, notes and text levels not included)."""
+        n = self._n
+        return (
+            self._parameters.data[:n].nbytes
+            + self._outputs.data[:n].nbytes
+            + self._status[:n].nbytes
+            + self._score[:n].nbytes
+        )
+
+    def status_mask(self, *statuses: str) -> np.ndarray:
+        codes = [self._status_names.index(s) for s in statuses if s in self._status_names]
+        return np.isin(self._status[:self._n], codes)
+
+    def parameter_matrix(self, names: Sequence[str]) -> np.ndarray:
+        """Numeric parameter values, one column per name (NaN where missing or not numeric)."""
+        return self._matrix(self._parameters, names, 0)
+
+    def output_matrix(self, names: Sequence[str]) -> np.ndarray:
+        """Output values, one column per name (NaN where missing or not numeric)."""
+        return self._matrix(self._outputs, names, 1)
+
+    def encode_parameter(
+        self,
+        name: str,
+        scalar: Callable[[object], float],
+        array: Callable[[np.ndarray], np.ndarray],
+    ) -> np.ndarray:
+        """One parameter column passed through an encoder.
+
+        Numeric values go through `array` in one call, each text level and
+        each value kept outside the columns through `scalar`. NaN where the
+        run lacks the parameter or `scalar` rejects the value.
+        """
+        out = np.full(self._n, np.nan)
+        j = self._parameters.index.get(name)
+        if j is not None:
+            col = self._parameters.data[:self._n, j]
+            if self._parameters.kinds[j] == "text":
+                table = np.array([_try(scalar, v) for v in self._parameters.levels[j]] + [np.nan])
+                codes = np.where(np.isnan(col), len(table) - 1, col).astype(np.int64)
+                out = table[codes]
+            else:
+                out = np.asarray(array(col), dtype=float)
+        for i, (params, _) in self._extra.items():
+            if name in params:
+                out[i] = _try(scalar, params[name])
+        return out
+
+    def with_parameters(self, columns: Mapping[str, np.ndarray]) -> "HistoryFrame":
+        """View with the named parameter columns replaced by float columns (NaN = missing)."""
+        out = self._take(0, self._n, 1)
+        out._parameters.data = out._parameters.data.copy()
+        for name, values in columns.items():
+            j = out._parameters._column(name)
+            out._parameters.data[:, j] = values
+            out._parameters.kinds[j] = "float"
+            for params, _ in out._extra.values():
+                params.pop(name, None)
+        return out
+
+    def extend(self, runs: Iterable[RunResult]) -> "HistoryFrame":
+        runs = list(runs)
+        if not runs:
+            return self
+        if self._view:
+            self._own()
+        n = self._n + len(runs)
+        if n > len(self._status):
+            capacity = max(n, 2 * len(self._status), 64)
+            self._status = np.resize(self._status, capacity)
+            self._score = np.resize(self._score, capacity)
+        self._parameters.reserve(n)
+        self._outputs.reserve(n)
+
+        for i, r in enumerate(runs, start=self._n):
+            code = self._status_code(r.status)
+            self._status[i] = code
+            self._score[i] = np.nan if r.score is None else float(r.score)
+            self._ids.append(r.experiment_id)
+            notes = tuple(r.notes)
+            self._notes.append(self._shared_notes.setdefault(notes, notes))
+            extra_parameters = self._parameters.put(i, r.parameters)
+            extra_outputs = self._outputs.put(i, r.outputs)
+            if r.score is not None and math.isnan(r.score):
+                extra_outputs = dict(extra_outputs or {})
+                extra_outputs[_NAN_SCORE] = True
+            if extra_parameters or extra_outputs:
+                self._extra[i] = (extra_parameters or {}, extra_outputs or {})
+        self._n = n
+        return self
+
+    def append(self, run: RunResult) -> "HistoryFrame":
+        return self.extend([run])
+
+    def _status_code(self, status: str) -> int:
+        if status not in self._status_names:
+            self._status_names.append(status)
+        return self._status_names.index(status)
+
+    def _run(self, i: int) -> RunResult:
+        parameters = self._parameters.row(i)
+        outputs = self._outputs.row(i)
+        score: float | None = None if np.isnan(self._score[i]) else float(self._score[i])
+        extra = self._extra.get(i)
+        if extra is not None:
+            parameters.update(extra[0])
+            outputs.update(extra[1])
+            if outputs.pop(_NAN_SCORE, False):
+                score = float("nan")
+        return RunResult(
+            experiment_id=self._ids[i],
+            status=self._status_names[self._status[i]],  # type: ignore[arg-type]
+            parameters=parameters,
+            outputs=outputs,
+            score=score,
+            notes=list(self._notes[i]),
+        )
+
+    def _matrix(self, columns: _Columns, names: Sequence[str], side: int) -> np.ndarray:
+        out = np.full((self._n, len(names)), np.nan)
+        for k, name in enumerate(names):
+            j = columns.index.get(name)
+            if j is None:
+                continue
+            col = columns.data[:self._n, j]
+            if columns.kinds[j] == "text":
+                table = np.array([_try(float, v) for v in columns.levels[j]] + [np.nan])
+                col = table[np.where(np.isnan(col), len(table) - 1, col).astype(np.int64)]
+            out[:, k] = col
+        wanted = {name: k for k, name in enumerate(names)}
+        for i, extra in self._extra.items():
+            for name, value in extra[side].items():
+                if name in wanted:
+                    out[i, wanted[name]] = _try(float, value)
+        return out
+
+    def _take(self, start: int, stop: int, step: int = 1) -> "HistoryFrame":
+        rows = range(start, stop, step)
+        extra = {}
+        for i, (params, outputs) in self._extra.items():
+            k, r = divmod(i - start, step)
+            if r == 0 and 0 <= k < len(rows):
+                extra[k] = (dict(params), dict(outputs))
+        out = HistoryFrame.__new__(HistoryFrame)
+        out._n = len(rows)
+        out._ids = self._ids[start:stop:step]
+        out._notes = self._notes[start:stop:step]
+        out._shared_notes = self._shared_notes
+        out._status = self._status[start:stop:step]
+        out._status_names = list(self._status_names)
+        out._score = self._score[start:stop:step]
+        out._parameters = self._parameters.copy_header(self._parameters.data[start:stop:step])
+        out._outputs = self._outputs.copy_header(self._outputs.data[start:stop:step])
+        out._extra = extra
+        out._view = True
+        return out
+
+    def _own(self) -> None:
+        """Copy shared buffers before the first append to a view."""
+        n = self._n
+        self._status = self._status[:n].copy()
+        self._score = self._score[:n].copy()
+        self._parameters.data = self._parameters.data[:n].copy()
+        self._outputs.data = self._outputs.data[:n].copy()
+        self._shared_notes = dict(self._shared_notes)
+        self._view = False
+
+
+# marker in a row's extra outputs for a score that is NaN rather than missing
+_NAN_SCORE = "\0nan_score"
+
+
+def _try(fn: Callable[[object], float], value: object) -> float:
+    try:
+        return float(fn(value))
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def parameter_matrix(history: Sequence[RunResult], names: Sequence[str]) -> np.ndarray:
+    """Rows x names parameter values of a frame or a plain run list (NaN where missing or not numeric)."""
+    if isinstance(history, HistoryFrame):
+        return history.parameter_matrix(names)
+    return _rows_matrix([r.parameters for r in history], names)
+
+
+def output_matrix(history: Sequence[RunResult], names: Sequence[str]) -> np.ndarray:
+    """Rows x names output values of a frame or a plain run list (NaN where missing or not numeric)."""
+    if isinstance(history, HistoryFrame):
+        return history.output_matrix(names)
+    return _rows_matrix([r.outputs for r in history], names)
+
+
+def status_mask(history: Sequence[RunResult], *statuses: str) -> np.ndarray:
+    """Boolean mask of rows whose status is one of `statuses`."""
+    if isinstance(history, HistoryFrame):
+        return history.status_mask(*statuses)
+    return np.array([r.status in statuses for r in history], dtype=bool)
+
+
+def _rows_matrix(rows: Sequence[Mapping[str, object]], names: Sequence[str]) -> np.ndarray:
+    out = np.full((len(rows), len(names)), np.nan)
+    for i, row in enumerate(rows):
+        for j, name in enumerate(names):
+            if name in row:
+                out[i, j] = _try(float, row[name])
+    return out
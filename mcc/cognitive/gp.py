@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+import numpy as np
+
+try:  # optional; `solve_triangular` falls back to NumPy
+    from scipy.linalg import solve_triangular as _scipy_solve_triangular  # type: ignore
+except ImportError:
+    _scipy_solve_triangular = None
+
+_erf = np.vectorize(math.erf, otypes=[float])
+
+# rows per block of the NumPy triangular solve used when SciPy is missing
+_SOLVE_BLOCK = 256
+
+
+def norm_pdf(z: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * z * z) / math.sqrt(2.0 * math.pi)
+
+
+def norm_cdf(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + _erf(np.asarray(z, dtype=float) / math.sqrt(2.0)))
+
+
+def expected_improvement(mean: np.ndarray, std: np.ndarray, best: float | np.ndarray) -> np.ndarray:
+    """Analytic EI for maximization; `best` may broadcast against `mean`."""
+    std = np.maximum(std, 1e-12)
+    z = (mean - best) / std
+    return (mean - best) * norm_cdf(z) + std * norm_pdf(z)
+
+
+def squared_distances(a: np.ndarray, b: np.ndarray, categorical: Optional[np.ndarray] = None) -> np.ndarray:
+    """Pairwise squared Euclidean distances between the rows of `a` and `b`.
+
+    Columns flagged in the boolean mask `categorical` hold category codes and
+    add 1 per mismatch (Hamming) instead of their squared difference.
+    """
+    if categorical is None or not categorical.any():
+        sq = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * a @ b.T
+        return np.maximum(sq, 0.0)
+    num = ~categorical
+    an, bn = a[:, num], b[:, num]
+    sq = (an * an).sum(axis=1)[:, None] + (bn * bn).sum(axis=1)[None, :] - 2.0 * an @ bn.T
+    for j in np.nonzero(categorical)[0]:
+        sq += np.abs(a[:, j, None] - b[None, :, j]) > 1e-9
+    return np.maximum(sq, 0.0)
+
+
+def solve_triangular(L: np.ndarray, b: np.ndarray, *, trans: bool = False) -> np.ndarray:
+    """Solve L x = b (or L^T x = b with `trans`) for a lower-triangular L.
+
+    Uses SciPy when it is installed; otherwise a blocked substitution that
+    inverts the small diagonal blocks and does the rest as matrix products,
+    O(n^2) per right-hand side like the SciPy routine.
+    """
+    if _scipy_solve_triangular is not None:
+        return _scipy_solve_triangular(L, b, lower=True, trans=1 if trans else 0, check_finite=False)
+
+    x = np.array(b, dtype=float)
+    vector = x.ndim == 1
+    if vector:
+        x = x[:, None]
+    n = len(L)
+    starts = list(range(0, n, _SOLVE_BLOCK))
+    if not trans:
+        for i0 in starts:
+            i1 = min(i0 + _SOLVE_BLOCK, n)
+            x[i0:i1] = np.linalg.inv(L[i0:i1, i0:i1]) @ (x[i0:i1] - L[i0:i1, :i0] @ x[:i0])
+    else:
+        for i0 in reversed(starts):
+            i1 = min(i0 + _SOLVE_BLOCK, n)
+            x[i0:i1] = np.linalg.inv(L[i0:i1, i0:i1]).T @ (x[i0:i1] - L[i1:, i0:i1].T @ x[i1:])
+    return x[:, 0] if vector else x
+
+
+class GaussianProcess:
+    """Exact GP regression with a squared-exponential kernel, NumPy only.
+
+    Inputs are expected in the unit box and targets are standardized internally.
+    Only the Cholesky factor L of K + noise*I is kept (n^2 floats):
+    appending one observation borders it in O(n^2) instead of refactoring in
+    O(n^3), and predictions use triangular solves against it. Callers bound
+    n, see `GaussianProcessPlanner.max_points`. Columns flagged in
+    `categorical` use the Hamming distance, see `squared_distances`.
+    """
+
+    def __init__(
+        self,
+        length_scale: float = 0.2,
+        signal_variance: float = 1.0,
+        noise: float = 1e-4,
+        categorical: Optional[np.ndarray] = None,
+    ):
+        self.length_scale = length_scale
+        self.categorical = categorical
+        self.signal_variance = signal_variance
+        self.noise = noise
+        self.x = np.empty((0, 0))
+        self.y = np.empty(0)
+        self._noise = np.empty(0)
+        self._L = np.empty((0, 0))
+        self._alpha: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def kernel(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        sq = squared_distances(a, b, self.categorical)
+        return self.signal_variance * np.exp(-0.5 * sq / self.length_scale**2)
+
+    def fit(self, x: np.ndarray, y: np.ndarray, noise: Optional[np.ndarray] = None) -> "GaussianProcess":
+        """Full O(n^3) factorization of the given data."""
+        self.x = np.array(x, dtype=float).reshape(len(y), -1)
+        self.y = np.array(y, dtype=float)
+        self._noise = np.full(len(y), self.noise) if noise is None else np.array(noise, dtype=float)
+        k = self.kernel(self.x, self.x) + np.diag(self._noise + 1e-10)
+        self._L = np.linalg.cholesky(k)
+        self._alpha = None
+        return self
+
+    def add(self, x: np.ndarray, y: float, noise: Optional[float] = None) -> None:
+        """Append one observation by bordering the Cholesky factor (O(n^2))."""
+        x = np.asarray(x, dtype=float).reshape(1, -1)
+        noise = self.noise if noise is None else float(noise)
+        n = len(self.y)
+        if n == 0:
+            self.fit(x, [y], [noise])
+            return
+
+        l = solve_triangular(self._L, self.kernel(self.x, x)[:, 0])
+        d2 = self.signal_variance + noise + 1e-10 - float(l @ l)
+        d = math.sqrt(max(d2, 1e-10))
+
+        L = np.zeros((n + 1, n + 1))
+        L[:n, :n] = self._L
+        L[n, :n] = l
+        L[n, n] = d
+
+        self._L = L
+        self.x = np.vstack([self.x, x])
+        self.y = np.append(self.y, float(y))
+        self._noise = np.append(self._noise, noise)
+        self._alpha = None
+
+    def set_targets(self, y: np.ndarray) -> None:
+        """Swap targets for the same inputs; the factorization is unaffected."""
+        self.y = np.array(y, dtype=float)
+        self._alpha = None
+
+    def _standardization(self) -> tuple[float, float]:
+        if len(self.y) == 0:
+            return 0.0, 1.0
+        std = float(self.y.std())
+        return float(self.y.mean()), std if std > 0 else 1.0
+
+    def predict(self, xs: np.ndarray, full_cov: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """Posterior mean and variance (or covariance if `full_cov`) in target units."""
+        xs = np.atleast_2d(np.asarray(xs, dtype=float))
+        mu_y, sd_y = self._standardization()
+        if len(self.y) == 0:
+            if full_cov:
+                return np.full(len(xs), mu_y), self.kernel(xs, xs) * sd_y**2
+            return np.full(len(xs), mu_y), np.full(len(xs), self.signal_variance * sd_y**2)
+
+        if self._alpha is None:
+            self._alpha = solve_triangular(self._L, solve_triangular(self._L, (self.y - mu_y) / sd_y), trans=True)
+
+        ks = self.kernel(self.x, xs)
+        mean = mu_y + sd_y * (ks.T @ self._alpha)
+        v = solve_triangular(self._L, ks)
+        if full_cov:
+            cov = self.kernel(xs, xs) - v.T @ v
+            return mean, cov * sd_y**2
+        var = np.maximum(self.signal_variance - (v * v).sum(axis=0), 1e-12)
+        return mean, var * sd_y**2
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import bisect
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .frame import status_mask
+from .pareto import ParetoArchive, _Staircase, non_dominated_mask, objective_matrix, objective_vector
+from .schema import ObjectiveSpec, RunResult
+
+_CHUNK_ELEMENTS = 2_000_000
+
+# Points are in the canonical maximization space used by `pareto.objective_vector`;
+# the reference point is a lower bound that every counted point must exceed.
+
+
+def hypervolume(
+    points: np.ndarray,
+    reference: np.ndarray,
+    *,
+    exact_up_to: int = 5,
+    samples: int = 100_000,
+    rng: Optional[np.random.Generator] = None,
+) -> float:
+    """Hypervolume dominated by `points` above `reference`.
+
+    Exact for up to `exact_up_to` objectives (sweeps for 2-3, WFG above),
+    Monte-Carlo estimate from `samples` uniform points beyond that.
+    """
+    pts, ref = _above_reference(points, reference)
+    if len(pts) == 0:
+        return 0.0
+    d = pts.shape[1]
+    if d == 1:
+        return float(pts.max() - ref[0])
+    if d > max(exact_up_to, 3):
+        return _hv_monte_carlo(pts - ref, samples, rng or np.random.default_rng(0))
+    shifted = pts - ref
+    return _wfg(shifted[non_dominated_mask(shifted)])
+
+
+def hypervolume_improvement(
+    candidates: np.ndarray,
+    front: np.ndarray,
+    reference: np.ndarray,
+    *,
+    samples: int = 20_000,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Hypervolume gained by adding each candidate row to `front` on its own.
+
+    Uses HVI(c) = vol(box[ref, c]) - HV(front clipped to c), vectorized over
+    all candidates for 2 and 3 objectives. Above that, one shared set of
+    uniform samples is drawn and each candidate counts the samples it newly
+    dominates.
+    """
+    cand = np.atleast_2d(np.asarray(candidates, dtype=float))
+    ref = np.asarray(reference, dtype=float)
+    front, _ = _above_reference(front, ref)
+    box = np.prod(np.maximum(cand - ref, 0.0), axis=1)
+    if len(front) == 0:
+        return box
+
+    # candidates inside the dominated region gain nothing; skip them up front
+    out = np.zeros(len(cand))
+    active = np.nonzero((box > 0) & ~_dominated(cand - ref, front - ref))[0]
+    d = cand.shape[1]
+    if d == 3 and len(front) ** 2 * d > _CHUNK_ELEMENTS:
+        # a single batched row would exceed the chunk budget; sweep each candidate instead
+        for i in active:
+            covered = _hv3d(np.maximum(np.minimum(front, cand[i]) - ref, 0.0))
+            out[i] = max(box[i] - covered, 0.0)
+        return out
+    if d <= 3:
+        chunk = max(1, _CHUNK_ELEMENTS // (len(front) ** (d - 1) * d))
+        for start in range(0, len(active), chunk):
+            rows = active[start:start + chunk]
+            clipped = np.maximum(np.minimum(front[None, :, :], cand[rows, None, :]) - ref, 0.0)
+            if d == 1:
+                covered = clipped[:, :, 0].max(axis=1)
+            else:
+                covered = _hv2d_batch(clipped) if d == 2 else _hv3d_batch(clipped)
+            out[rows] = np.maximum(box[rows] - covered, 0.0)
+        return out
+
+    rng = rng or np.random.default_rng(0)
+    upper = np.maximum(front.max(axis=0), cand.max(axis=0)) - ref
+    u = rng.uniform(size=(samples, d)) * upper
+    open_space = u[~_dominated(u, front - ref)]
+    if len(open_space) and len(active):
+        volume = float(np.prod(upper))
+        out[active] = volume * _dominated_counts(cand[active] - ref, open_space) / samples
+    return out
+
+
+class HypervolumeTrace:
+    """Hypervolume of the Pareto front against the number of evaluations, one point per `record`.
+
+    `reference` gives the reference point in raw objective units. Without
+    it the point is fixed at the first record that sees feasible runs, 10%
+    of the observed range below the worst value of each objective (as in
+    `ExpectedHypervolumePlanner`), and kept from then on so the trace stays
+    comparable. The front comes from a `ParetoArchive`, which may be shared
+    with the caller, so a record only merges the runs added since the last.
+    """
+
+    def __init__(
+        self,
+        objectives: Sequence[ObjectiveSpec],
+        reference: Dict[str, float] | None = None,
+        *,
+        archive: ParetoArchive | None = None,
+        samples: int = 100_000,
+        seed: int = 0,
+    ):
+        self.objectives = list(objectives)
+        self.archive = archive if archive is not None else ParetoArchive(self.objectives)
+        self.samples = samples
+        self.seed = seed
+        self.reference: np.ndarray | None = None
+        if reference is not None:
+            raw = {o.name: float(reference[o.name]) for o in self.objectives}
+            self.reference = np.array(list(objective_vector(raw, self.objectives).values()), dtype=float)
+        self.evaluations: List[int] = []
+        self.values: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def points(self) -> List[tuple[int, float]]:
+        return list(zip(self.evaluations, self.values))
+
+    def record(self, history: Sequence[RunResult]) -> float:
+        """Append the hypervolume of `history` (a run list or `HistoryFrame`) after len(history) evaluations."""
+        self.archive.sync(history)
+        if self.reference is None and len(self.archive):
+            observed = objective_matrix(history, self.objectives)[status_mask(history, "ok")]
+            low, high = observed.min(axis=0), observed.max(axis=0)
+            self.reference = low - 0.1 * np.maximum(high - low, 1e-9)
+        value = 0.0
+        if self.reference is not None:
+            rng = np.random.default_rng(self.seed)
+            value = hypervolume(self.archive.points, self.reference, samples=self.samples, rng=rng)
+        self.evaluations.append(len(history))
+        self.values.append(value)
+        return value
+
+
+class HypervolumePlateau:
+    """Stop rule: True once the hypervolume gained over the last `patience` records is small.
+
+    The gain is measured relative to the current hypervolume and must stay
+    at or below `tolerance`; at least `min_evaluations` evaluations are run
+    first. Call it with a `HypervolumeTrace` (see `CognitiveEngine.run_campaign`).
+    """
+
+    def __init__(self, patience: int = 3, tolerance: float = 1e-3, min_evaluations: int = 0):
+        if patience < 1:
+            raise ValueError("patience must be at least 1")
+        self.patience = patience
+        self.tolerance = tolerance
+        self.min_evaluations = min_evaluations
+
+    def __call__(self, trace: HypervolumeTrace) -> bool:
+        if len(trace) <= self.patience or trace.evaluations[-1] < self.min_evaluations:
+            return False
+        current, before = trace.values[-1], trace.values[-1 - self.patience]
+        if current <= 0.0:
+            return False
+        return (current - before) <= self.tolerance * current
+
+
+def _above_reference(points: np.ndarray, reference: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    ref = np.asarray(reference, dtype=float)
+    pts = np.asarray(points, dtype=float).reshape(-1, len(ref))
+    return pts[(pts > ref).all(axis=1)], ref
+
+
+def _hv2d_batch(shifted: np.ndarray) -> np.ndarray:
+    """2-D hypervolume per batch row of points already shifted so the reference is 0."""
+    order = np.argsort(-shifted[:, :, 0], axis=1)
+    x = np.take_along_axis(shifted[:, :, 0], order, axis=1)
+    y = np.maximum.accumulate(np.take_along_axis(shifted[:, :, 1], order, axis=1), axis=1)
+    widths = x - np.concatenate([x[:, 1:], np.zeros((len(x), 1))], axis=1)
+    return (widths * y).sum(axis=1)
+
+
+def _hv3d(shifted: np.ndarray) -> float:
+    """Sweep in decreasing third objective over the 2-D staircase of the first two, O(n log n).
+
+    The staircase area is updated as each point joins, and every slab between
+    consecutive third-objective levels adds that area times its height.
+    """
+    pts = shifted[np.argsort(-shifted[:, 2], kind="stable")].tolist()
+    stair = _Staircase()
+    area = total = 0.0
+    for k, (x, y, z) in enumerate(pts):
+        if not stair.covers(x, y):
+            area += _added_area(stair, x, y)
+            stair.insert(x, y)
+        total += area * (z - (pts[k + 1][2] if k + 1 < len(pts) else 0.0))
+    return total
+
+
+def _added_area(stair: _Staircase, x: float, y: float) -> float:
+    """Area the box [0, x] x [0, y] adds to the union of the staircase's boxes."""
+    f2, f3 = stair.f2, stair.f3
+    pos = bisect.bisect_left(f2, x)
+    end = pos + 1 if pos < len(f2) and f2[pos] == x else pos
+    start = end
+    while start > 0 and f3[start - 1] <= y:
+        start -= 1
+    left = f2[start - 1] if start > 0 else 0.0
+    # old cover of (left, x]: the steps the new box swallows, then the next step's height up to x
+    old, prev = 0.0, left
+    for j in range(start, end):
+        old += (f2[j] - prev) * f3[j]
+        prev = f2[j]
+    if prev < x and end < len(f2):
+        old += (x - prev) * f3[end]
+    return (x - left) * y - old
+
+
+def _hv3d_batch(shifted: np.ndarray) -> np.ndarray:
+    """Slice along the third objective and sum 2-D areas times slab heights.
+
+    Slice i holds the i+1 points highest in the third objective; the others are
+    moved to the origin, where they add no area, so all slices of all batch
+    rows go through one `_hv2d_batch` call.
+    """
+    b, n, _ = shifted.shape
+    order = np.argsort(-shifted[:, :, 2], axis=1)
+    pts = np.take_along_axis(shifted, order[:, :, None], axis=1)
+    levels = np.concatenate([pts[:, :, 2], np.zeros((b, 1))], axis=1)
+    heights = levels[:, :-1] - levels[:, 1:]
+    upto = np.tril(np.ones((n, n), dtype=bool))
+    slices = np.where(upto[None, :, :, None], pts[:, None, :, :2], 0.0)
+    areas = _hv2d_batch(slices.reshape(b * n, n, 2)).reshape(b, n)
+    return (heights * areas).sum(axis=1)
+
+
+def _wfg(shifted: np.ndarray) -> float:
+    """Exact hypervolume of mutually non-dominated points shifted so the reference is 0 (WFG).
+
+    Points are taken in increasing last objective. Every later point reaches
+    at least as high there, so the part of point k's box it also covers is a
+    slab of point k's height over the box of the limited point min(later, k);
+    the volume point k adds exclusively is its height times its box in the
+    other objectives minus the hypervolume of the non-dominated limited
+    points, one objective lower. Two and three objectives end the recursion.
+    """
+    n, d = shifted.shape
+    if n == 0:
+        return 0.0
+    if n == 1:
+        return float(np.prod(shifted[0]))
+    if d == 2:
+        return float(_hv2d_batch(shifted[None, :, :])[0])
+    if d == 3:
+        return _hv3d(shifted)
+    pts = shifted[np.argsort(shifted[:, -1], kind="stable")]
+    total = 0.0
+    for k in range(n):
+        head = pts[k, :-1]
+        limited = np.minimum(pts[k + 1:, :-1], head)
+        if len(limited) > 1:
+            limited = limited[non_dominated_mask(limited)]
+        total += float(pts[k, -1]) * (float(np.prod(head)) - _wfg(limited))
+    return total
+
+
+def _hv_monte_carlo(shifted: np.ndarray, samples: int, rng: np.random.Generator) -> float:
+    upper = shifted.max(axis=0)
+    u = rng.uniform(size=(samples, shifted.shape[1])) * upper
+    return float(np.prod(upper)) * int(_dominated(u, shifted).sum()) / samples
+
+
+def _dominated(samples: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Mask of samples weakly dominated by at least one of `points`."""
+    out = np.empty(len(samples), dtype=bool)
+    chunk = max(1, _CHUNK_ELEMENTS // max(1, len(points)))
+    for start in range(0, len(samples), chunk):
+        out[start:start + chunk] = _weak_dominance(points, samples[start:start + chunk]).any(axis=0)
+    return out
+
+
+def _dominated_counts(points: np.ndarray, samples: np.ndarray) -> np.ndarray:
+    """Number of samples weakly dominated by each point."""
+    out = np.zeros(len(points))
+    chunk = max(1, _CHUNK_ELEMENTS // max(1, len(samples)))
+    for start in range(0, len(points), chunk):
+        out[start:start + chunk] = _weak_dominance(points[start:start + chunk], samples).sum(axis=1)
+    return out
+
+
+def _weak_dominance(points: np.ndarray, samples: np.ndarray) -> np.ndarray:
+    """(points x samples) mask of samples <= point on every axis, built one axis at a time."""
+    mask = samples[None, :, 0] <= points[:, None, 0]
+    for j in range(1, points.shape[1]):
+        mask &= samples[None, :, j] <= points[:, None, j]
+    return mask
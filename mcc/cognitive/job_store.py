@@ -106,6 +106,20 @@ class JobStore:
             return None
         return SimulationResult(**json.loads(row[0]))
 
+    def jobs_in_queue_states(self, states: tuple[str, ...] = ("queued", "running")) -> List[SimulationJob]:
+        marks = ",".join("?" for _ in states)
+        with self._conn() as c:
+            rows = c.execute(
+                f"""
+                SELECT j.payload_json FROM queue q
+                JOIN jobs j ON j.job_id = q.job_id
+                WHERE q.state IN ({marks})
+                ORDER BY q.enqueued_at ASC, q.rowid ASC
+                """,
+                tuple(states),
+            ).fetchall()
+        return [SimulationJob(**json.loads(r[0])) for r in rows]
+
     def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
         with self._conn() as c:
             rows = c.execute(
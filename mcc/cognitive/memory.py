@@ -1,34 +1,462 @@
 from __future__ import annotations
 
+import atexit
+import bisect
+import hashlib
 import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from array import array
 from dataclasses import asdict
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterable, List, Sequence, Tuple
 
+from .frame import HistoryFrame
 from .schema import RunResult
 
+# (size, hash of the last record) of the stored history; the size is the byte
+# size of a JSONL file and the last row sequence number of a SQLite store
+Fingerprint = Tuple[int, str]
 
-class CognitiveMemoryStore:
-    def __init__(self, path: str | Path = "cognitive_memory.jsonl"):
+_TAIL_BLOCK = 64 * 1024
+
+# file suffix of each memory backend, used by `open_memory`
+MEMORY_SUFFIXES = {"jsonl": ".jsonl", "sqlite": ".sqlite"}
+
+# buffered JSONL stores holding unwritten rows, flushed when the interpreter exits
+_UNFLUSHED: "weakref.WeakSet[CognitiveMemoryStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    for store in list(_UNFLUSHED):
+        store.flush()
+
+
+class MemoryStore(ABC):
+    """Append-only history of RunResults for one domain.
+
+    Backends keep rows in append order. `load_since(cursor)` returns the rows
+    added after an opaque cursor (0 reads from the start) together with the
+    cursor to pass next time, and `fingerprint`/`extends` tell cached readers
+    whether the history only grew since they last looked.
+    """
+
+    path: Path
+
+    @abstractmethod
+    def append(self, result: RunResult) -> None:
+        raise NotImplementedError
+
+    def append_many(self, results: Iterable[RunResult]) -> int:
+        count = 0
+        for result in results:
+            self.append(result)
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        """Write out buffered rows (no-op for unbuffered backends)."""
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @abstractmethod
+    def load_all(self) -> List[RunResult]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_since(self, cursor: int = 0) -> Tuple[List[RunResult], int]:
+        raise NotImplementedError
+
+    def load_frame(self) -> HistoryFrame:
+        """The whole history as a columnar `HistoryFrame`."""
+        return HistoryFrame(self.load_all())
+
+    @abstractmethod
+    def fingerprint(self) -> Fingerprint:
+        raise NotImplementedError
+
+    @abstractmethod
+    def extends(self, fingerprint: Fingerprint) -> bool:
+        raise NotImplementedError
+
+    def query(
+        self,
+        *,
+        status: str | Sequence[str] | None = None,
+        experiment_ids: Sequence[str] | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> List[RunResult]:
+        """Rows matching every given filter, in append order.
+
+        `since`/`until` bound the time a row was recorded (Unix seconds) and
+        need a backend that stores it.
+        """
+        if since is not None or until is not None:
+            raise ValueError(f"{type(self).__name__} does not record row timestamps")
+        statuses = {status} if isinstance(status, str) else None if status is None else set(status)
+        ids = None if experiment_ids is None else set(experiment_ids)
+        out = [
+            r
+            for r in self.load_all()
+            if (statuses is None or r.status in statuses) and (ids is None or r.experiment_id in ids)
+        ]
+        return out if limit is None else out[:limit]
+
+    def import_jsonl(self, path: str | Path) -> int:
+        """Append every row of a JSONL memory file; returns the number of rows."""
+        return self.append_many(CognitiveMemoryStore(path=path).load_all())
+
+    def export_jsonl(self, path: str | Path) -> int:
+        """Write the whole history to a new JSONL memory file; returns the number of rows."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        rows = self.load_all()
+        with target.open("w", encoding="utf-8") as f:
+            f.writelines(_dumps(r) + "\n" for r in rows)
+        return len(rows)
+
+
+class CognitiveMemoryStore(MemoryStore):
+    """JSONL history, one JSON object per line; the cursor is a byte offset.
+
+    Parsed rows are cached in-process in a `HistoryFrame` together with the
+    byte offset read up to, so repeated loads only parse lines appended since (by this store or
+    any other writer). Only the frame is kept: `load_all` and `load_since`
+    build RunResults from it on demand (the parsing is never repeated), so
+    callers that only need columns should use `load_frame`. The cache is dropped and the file re-read when its
+    inode changes (rotation, atomic replace), it shrinks below the cached
+    offset, or the last cached line no longer matches (rewritten in place).
+    A partially written last line is left for the next read.
+
+    Writes go out as one `write` per `append`/`append_many` call. With
+    `buffer_rows` > 0 appended rows are held back until that many are
+    pending or `flush_interval` seconds passed since the last flush, and are
+    then written together; `fsync` makes each flush durable with one fsync.
+    With `flush_interval` set, a background timer also writes rows that no
+    later append picks up, at most `flush_interval` seconds after they were
+    buffered. Reads (and `fingerprint`/`extends`) flush first, so this store
+    always sees its own rows; call `flush`/`close` (or use it as a context
+    manager) to hand buffered rows to other readers. Rows still buffered when
+    the interpreter exits are flushed then.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = "cognitive_memory.jsonl",
+        *,
+        buffer_rows: int = 0,
+        flush_interval: float | None = None,
+        fsync: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.path = Path(path)
+        self.buffer_rows = buffer_rows
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self._flushed_at = clock()
+        self._timer: threading.Timer | None = None
+        self._reset()
+
+    def _reset(self, inode: int = -1) -> None:
+        self._rows = HistoryFrame()
+        # byte offset just past each cached row's line
+        self._ends = array("q")
+        self._inode = inode
+        self._last_digest = ""
 
     def append(self, result: RunResult) -> None:
+        self.append_many([result])
+
+    def append_many(self, results: Iterable[RunResult]) -> int:
+        lines = [_dumps(r) + "\n" for r in results]
+        with self._lock:
+            self._pending.extend(lines)
+            if (
+                len(self._pending) >= self.buffer_rows
+                or self.flush_interval is not None
+                and self.clock() - self._flushed_at >= self.flush_interval
+            ):
+                self._flush()
+            elif self._pending:
+                _UNFLUSHED.add(self)
+                if self.flush_interval is not None and self._timer is None:
+                    self._timer = threading.Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        return len(lines)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._flushed_at = self.clock()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
         self.path.parent.mkdir(parents=True, exist_ok=True)
         with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+            f.write("".join(self._pending))
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self._pending = []
+        _UNFLUSHED.discard(self)
 
     def load_all(self) -> List[RunResult]:
+        return list(self.load_frame())
+
+    def load_frame(self) -> HistoryFrame:
+        """Snapshot of the cached frame; rows appended later do not show up in it."""
+        with self._lock:
+            self._flush()
+            self._refresh()
+            return self._rows[:]
+
+    def load_since(self, cursor: int = 0) -> Tuple[List[RunResult], int]:
+        """Rows of the complete lines after byte offset `cursor`, and the offset after them.
+
+        A cursor beyond the current contents (the file was truncated or
+        replaced since it was issued) reads from the start again.
+        """
+        with self._lock:
+            self._flush()
+            self._refresh()
+            offset = self._ends[-1] if self._ends else 0
+            if cursor > offset:
+                cursor = 0
+            return list(self._rows[bisect.bisect_right(self._ends, cursor):]), offset
+
+    def _refresh(self) -> None:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            self._reset()
+            return
+        offset = self._ends[-1] if self._ends else 0
+        if st.st_ino != self._inode or st.st_size < offset or not self._last_line_matches():
+            self._reset(st.st_ino)
+            offset = 0
+        if st.st_size == offset:
+            return
+
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            data = f.read(st.st_size - offset)
+        start = 0
+        new: List[RunResult] = []
+        while True:
+            end = data.find(b"\n", start)
+            if end < 0:
+                break
+            line = data[start:end]
+            if line.strip():
+                new.append(_loads(line))
+                self._ends.append(offset + end + 1)
+                self._last_digest = hashlib.sha1(line.strip()).hexdigest()
+            start = end + 1
+        self._rows.extend(new)
+
+    def _last_line_matches(self) -> bool:
+        if not self._ends:
+            return True
+        begin = self._ends[-2] if len(self._ends) > 1 else 0
+        with self.path.open("rb") as f:
+            f.seek(begin)
+            block = f.read(self._ends[-1] - begin)
+        return hashlib.sha1(block.strip().rsplit(b"\n", 1)[-1].strip()).hexdigest() == self._last_digest
+
+    def fingerprint(self) -> Fingerprint:
+        """Cheap identity of the current contents: size plus a hash of the last record."""
+        self.flush()
         if not self.path.exists():
-            return []
-
-        out: List[RunResult] = []
-        with self.path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                row = json.loads(line)
-                if "parameters" not in row:
-                    row["parameters"] = {}
-                out.append(RunResult(**row))
-        return out
+            return (0, "")
+        size = self.path.stat().st_size
+        return (size, self._record_hash_ending_at(size))
+
+    def extends(self, fingerprint: Fingerprint) -> bool:
+        """True if the file still holds the fingerprinted contents, possibly with rows appended."""
+        size, digest = fingerprint
+        if size == 0:
+            return True
+        self.flush()
+        if not self.path.exists() or self.path.stat().st_size < size:
+            return False
+        return self._record_hash_ending_at(size) == digest
+
+    def _record_hash_ending_at(self, end: int) -> str:
+        with self.path.open("rb") as f:
+            start = max(0, end - _TAIL_BLOCK)
+            f.seek(start)
+            block = f.read(end - start).rstrip(b"\n")
+        return hashlib.sha1(block[block.rfind(b"\n") + 1:]).hexdigest()
+
+
+class SQLiteMemoryStore(MemoryStore):
+    """SQLite history in WAL mode, indexed by status, experiment id and record time.
+
+    Each row keeps the full RunResult as JSON next to the indexed columns; the
+    cursor is the row sequence number. WAL lets planners read while a worker
+    appends, and bulk appends share one transaction.
+    """
+
+    def __init__(self, path: str | Path = "cognitive_memory.sqlite", clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self.clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+        # frame of the rows read so far, its cursor and fingerprint
+        self._frame = HistoryFrame()
+        self._frame_cursor = 0
+        self._frame_fingerprint: Fingerprint = (0, "")
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        conn = sqlite3.connect(str(self.path))
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self):
+        with self._conn() as c:
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    experiment_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    score REAL,
+                    recorded_at REAL NOT NULL,
+                    payload_json TEXT NOT NULL
+                )
+                """
+            )
+            c.execute("CREATE INDEX IF NOT EXISTS runs_status ON runs(status)")
+            c.execute("CREATE INDEX IF NOT EXISTS runs_experiment_id ON runs(experiment_id)")
+            c.execute("CREATE INDEX IF NOT EXISTS runs_recorded_at ON runs(recorded_at)")
+
+    def append(self, result: RunResult) -> None:
+        self.append_many([result])
+
+    def append_many(self, results: Iterable[RunResult]) -> int:
+        now = self.clock()
+        rows = [(r.experiment_id, r.status, r.score, now, _dumps(r)) for r in results]
+        if rows:
+            with self._conn() as c:
+                c.executemany(
+                    "INSERT INTO runs(experiment_id, status, score, recorded_at, payload_json) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def load_all(self) -> List[RunResult]:
+        return self.load_since(0)[0]
+
+    def load_since(self, cursor: int = 0) -> Tuple[List[RunResult], int]:
+        with self._conn() as c:
+            rows = c.execute("SELECT seq, payload_json FROM runs WHERE seq > ? ORDER BY seq", (cursor,)).fetchall()
+        if not rows:
+            return [], cursor
+        return [_loads(payload) for _, payload in rows], rows[-1][0]
+
+    def load_frame(self) -> HistoryFrame:
+        """Rows read since the previous call join a cached frame; a snapshot of it is returned."""
+        with self._lock:
+            if not self.extends(self._frame_fingerprint):
+                self._frame, self._frame_cursor = HistoryFrame(), 0
+            new, self._frame_cursor = self.load_since(self._frame_cursor)
+            if new:
+                self._frame.extend(new)
+                self._frame_fingerprint = self.fingerprint()
+            return self._frame[:]
+
+    def query(
+        self,
+        *,
+        status: str | Sequence[str] | None = None,
+        experiment_ids: Sequence[str] | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> List[RunResult]:
+        where: List[str] = []
+        args: List[object] = []
+        if status is not None:
+            statuses = [status] if isinstance(status, str) else list(status)
+            where.append(f"status IN ({','.join('?' for _ in statuses)})")
+            args += statuses
+        if experiment_ids is not None:
+            ids = list(experiment_ids)
+            where.append(f"experiment_id IN ({','.join('?' for _ in ids)})")
+            args += ids
+        if since is not None:
+            where.append("recorded_at >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("recorded_at < ?")
+            args.append(until)
+        sql = "SELECT payload_json FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._conn() as c:
+            rows = c.execute(sql, tuple(args)).fetchall()
+        return [_loads(r[0]) for r in rows]
+
+    def fingerprint(self) -> Fingerprint:
+        """Last row sequence number plus a hash of that row."""
+        with self._conn() as c:
+            row = c.execute("SELECT seq, payload_json FROM runs ORDER BY seq DESC LIMIT 1").fetchone()
+        if not row:
+            return (0, "")
+        return (row[0], hashlib.sha1(row[1].encode("utf-8")).hexdigest())
+
+    def extends(self, fingerprint: Fingerprint) -> bool:
+        """True while the fingerprinted row is still stored unchanged (sequence numbers are never reused)."""
+        seq, digest = fingerprint
+        if seq == 0:
+            return True
+        with self._conn() as c:
+            row = c.execute("SELECT payload_json FROM runs WHERE seq = ?", (seq,)).fetchone()
+        return row is not None and hashlib.sha1(row[0].encode("utf-8")).hexdigest() == digest
+
+
+def open_memory(path: str | Path) -> MemoryStore:
+    """Memory store for `path`: SQLite for .sqlite/.sqlite3/.db files, JSONL otherwise."""
+    path = Path(path)
+    if path.suffix in (".sqlite", ".sqlite3", ".db"):
+        return SQLiteMemoryStore(path=path)
+    return CognitiveMemoryStore(path=path)
+
+
+def _dumps(result: RunResult) -> str:
+    return json.dumps(asdict(result), ensure_ascii=False)
+
+
+def _loads(line: str | bytes) -> RunResult:
+    row = json.loads(line)
+    if "parameters" not in row:
+        row["parameters"] = {}
+    return RunResult(**row)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass
+class _KDNode:
+    start: int
+    end: int
+    lo: np.ndarray
+    hi: np.ndarray
+    dim: int = -1
+    split: float = 0.0
+    left: Optional["_KDNode"] = None
+    right: Optional["_KDNode"] = None
+
+
+class _KDTree:
+    """Static KD-tree over a fixed block of points (median split on the widest axis)."""
+
+    def __init__(self, points: np.ndarray, ids: np.ndarray, leaf_size: int):
+        self.points = np.array(points, dtype=float)
+        self.ids = np.array(ids, dtype=np.int64)
+        self.leaf_size = max(1, leaf_size)
+        self.root = self._build(0, len(self.points))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _build(self, start: int, end: int) -> _KDNode:
+        block = self.points[start:end]
+        node = _KDNode(start=start, end=end, lo=block.min(axis=0), hi=block.max(axis=0))
+        if end - start <= self.leaf_size:
+            return node
+
+        dim = int(np.argmax(node.hi - node.lo))
+        if node.hi[dim] == node.lo[dim]:
+            return node
+
+        mid = (end - start) // 2
+        order = np.argpartition(block[:, dim], mid)
+        self.points[start:end] = block[order]
+        self.ids[start:end] = self.ids[start:end][order]
+
+        node.dim = dim
+        node.split = float(self.points[start + mid, dim])
+        node.left = self._build(start, start + mid)
+        node.right = self._build(start + mid, end)
+        return node
+
+
+@dataclass
+class NeighborIndex:
+    """Incrementally growing k-NN index over normalized design-space coordinates.
+
+    Points are scaled to the unit box spanned by `lower`/`upper`. Appends land
+    in a small brute-force buffer that is flushed into static KD-trees using the
+    logarithmic method (equal-sized trees are merged), so inserts stay cheap and
+    queries touch O(log n) trees. Queries are answered for a whole batch of
+    points in one traversal per tree.
+    """
+
+    lower: np.ndarray
+    upper: np.ndarray
+    leaf_size: int = 128
+    _trees: List[_KDTree] = field(default_factory=list, init=False, repr=False)
+    _buf_points: List[np.ndarray] = field(default_factory=list, init=False, repr=False)
+    _buf_ids: List[int] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self):
+        self.lower = np.asarray(self.lower, dtype=float)
+        self.upper = np.asarray(self.upper, dtype=float)
+        span = self.upper - self.lower
+        self.span = np.where(span > 0, span, 1.0)
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in self._trees) + len(self._buf_ids)
+
+    def normalize(self, points: np.ndarray) -> np.ndarray:
+        return (np.asarray(points, dtype=float) - self.lower) / self.span
+
+    def add(self, points: np.ndarray, ids: Sequence[int]) -> None:
+        points = self.normalize(np.atleast_2d(points))
+        if len(points) == 0:
+            return
+        self._buf_points.append(points)
+        self._buf_ids.extend(int(i) for i in ids)
+        if len(self._buf_ids) >= self.leaf_size:
+            self._flush_buffer()
+
+    def _flush_buffer(self) -> None:
+        points = np.vstack(self._buf_points)
+        ids = np.array(self._buf_ids, dtype=np.int64)
+        self._buf_points, self._buf_ids = [], []
+
+        # Merge with trailing trees no larger than the new block (binary-counter style).
+        while self._trees and len(self._trees[-1]) <= len(points):
+            tree = self._trees.pop()
+            points = np.vstack([tree.points, points])
+            ids = np.concatenate([tree.ids, ids])
+        self._trees.append(_KDTree(points, ids, self.leaf_size))
+
+    def query(
+        self,
+        queries: np.ndarray,
+        k: int,
+        weights: Optional[np.ndarray] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (distances, ids) of the k nearest indexed points per query row.
+
+        `weights` scales squared per-axis gaps in normalized space, e.g. pass
+        `span**2` to measure distances in raw design units. Rows are ordered by
+        (distance, id).
+        """
+        q = self.normalize(np.atleast_2d(queries))
+        w = np.ones(q.shape[1]) if weights is None else np.asarray(weights, dtype=float)
+        k = min(k, len(self))
+        best_d = np.full((len(q), k), np.inf)
+        best_i = np.full((len(q), k), -1, dtype=np.int64)
+        if k == 0:
+            return best_d, best_i
+
+        worst = np.full(len(q), np.inf)
+        everyone = np.arange(len(q))
+        if self._buf_ids:
+            self._merge(best_d, best_i, worst, everyone, q, np.vstack(self._buf_points), np.array(self._buf_ids), w)
+        for tree in reversed(self._trees):
+            self._visit(tree, tree.root, everyone, q, w, best_d, best_i, worst)
+
+        return np.sqrt(best_d), best_i
+
+    def _visit(self, tree, node, qidx, q, w, best_d, best_i, worst) -> None:
+        if qidx.size == 0:
+            return
+        qs = q[qidx]
+        gap = np.maximum(node.lo - qs, qs - node.hi)
+        np.maximum(gap, 0.0, out=gap)
+        qidx = qidx[(gap * gap) @ w <= worst[qidx]]
+        if qidx.size == 0:
+            return
+
+        if node.left is None:
+            self._merge(
+                best_d, best_i, worst, qidx, q,
+                tree.points[node.start:node.end], tree.ids[node.start:node.end], w,
+            )
+            return
+
+        go_left = q[qidx, node.dim] <= node.split
+        near_l, near_r = qidx[go_left], qidx[~go_left]
+        self._visit(tree, node.left, near_l, q, w, best_d, best_i, worst)
+        self._visit(tree, node.right, near_r, q, w, best_d, best_i, worst)
+        self._visit(tree, node.right, near_l, q, w, best_d, best_i, worst)
+        self._visit(tree, node.left, near_r, q, w, best_d, best_i, worst)
+
+    @staticmethod
+    def _merge(best_d, best_i, worst, qidx, q, points, ids, w) -> None:
+        diff = q[qidx][:, None, :] - points[None, :, :]
+        d = (diff * diff) @ w
+        all_d = np.concatenate([best_d[qidx], d], axis=1)
+        all_i = np.concatenate([best_i[qidx], np.broadcast_to(ids, d.shape)], axis=1)
+        k = best_d.shape[1]
+        rows = np.arange(len(qidx))[:, None]
+        # (distance, id) order keeps ties deterministic: earliest ids win
+        keep = np.lexsort((all_i, all_d), axis=1)[:, :k]
+        best_d[qidx] = all_d[rows, keep]
+        best_i[qidx] = all_i[rows, keep]
+        worst[qidx] = best_d[qidx].max(axis=1)
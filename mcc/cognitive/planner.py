@@ -1,24 +1,215 @@
 from __future__ import annotations
 
-import math
+import copy
+import functools
 import random
-from dataclasses import dataclass
-from typing import Dict, List, Literal, Sequence
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Literal, Sequence
 
+import numpy as np
+
+from .acquisition import ExecutorKind, RefineMethod, map_chunks, refine, top_k
+from .designs import DesignKind, design_points
+from .feasibility import FeasibilityModel, feasibility_weighted
+from .frame import HistoryFrame, parameter_matrix, status_mask
+from .gp import GaussianProcess, expected_improvement, squared_distances
+from .hypervolume import hypervolume_improvement
+from .neighbors import NeighborIndex
+from .pareto import non_dominated_mask, non_dominated_sort, objective_matrix, objective_vector
 from .schema import ConstraintSpec, ExperimentSpec, ObjectiveSpec, RunResult
+from .transfer import TransferPrior
+
+
+DimensionKind = Literal["float", "int", "categorical"]
+
+
+@dataclass
+class Dimension:
+    """A typed design parameter.
+
+    Planners search an encoded numeric box: `log` axes are searched in log
+    space, integers over [low - 0.5, high + 0.5] so every value owns an equal
+    slice, and categoricals as the index of their choice over
+    [-0.5, len(choices) - 0.5]. `decode` snaps an encoded value back to a
+    valid parameter value.
+    """
+
+    kind: DimensionKind = "float"
+    low: float = 0.0
+    high: float = 1.0
+    log: bool = False
+    choices: tuple = ()
+
+    def __post_init__(self) -> None:
+        self.choices = tuple(self.choices)
+        if self.kind == "categorical" and not self.choices:
+            raise ValueError("categorical dimension needs at least one choice")
+        if self.kind != "categorical" and self.high < self.low:
+            raise ValueError(f"dimension bounds are reversed: ({self.low}, {self.high})")
+        if self.log and (self.kind == "categorical" or self.low <= 0):
+            raise ValueError("log dimensions need numeric bounds above zero")
+
+    def encoded_bounds(self) -> tuple[float, float]:
+        if self.kind == "categorical":
+            return -0.5, len(self.choices) - 0.5
+        lo, hi = (self.low - 0.5, self.high + 0.5) if self.kind == "int" else (self.low, self.high)
+        if self.log:
+            # keep the integer half-cells positive for values starting at 1
+            lo = max(lo, self.low / 2.0)
+            return float(np.log(lo)), float(np.log(hi))
+        return float(lo), float(hi)
+
+    def encode(self, value: object) -> float:
+        """Encoded coordinate of a parameter value (NaN for unknown choices)."""
+        if self.kind == "categorical":
+            return float(self.choices.index(value)) if value in self.choices else float("nan")
+        v = float(value)  # type: ignore[arg-type]
+        return float(np.log(v)) if self.log and v > 0 else v
+
+    def encode_array(self, values: np.ndarray) -> np.ndarray:
+        """`encode` over an array of numeric values (NaN stays NaN)."""
+        v = np.asarray(values, dtype=float)
+        if self.kind == "categorical":
+            out = np.full(v.shape, np.nan)
+            for i, choice in enumerate(self.choices):
+                if isinstance(choice, (int, float, np.integer, np.floating)) and not isinstance(choice, bool):
+                    out[(v == choice) & np.isnan(out)] = i
+            return out
+        if self.log:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(v > 0, np.log(np.where(v > 0, v, 1.0)), v)
+        return v
+
+    def decode(self, x: float) -> object:
+        """Nearest valid parameter value for an encoded coordinate."""
+        if self.kind == "categorical":
+            return self.choices[int(np.clip(np.rint(x), 0, len(self.choices) - 1))]
+        v = float(np.exp(x)) if self.log else float(x)
+        v = min(max(v, self.low), self.high)
+        return int(round(v)) if self.kind == "int" else v
 
 
 @dataclass
 class DesignSpace:
-    bounds: Dict[str, tuple[float, float]]
+    """Box of design parameters.
+
+    `bounds` maps plain float parameters to (lo, hi). `dimensions` adds typed
+    parameters (see `Dimension`); their entries in `bounds` are filled in with
+    the encoded box, which is the space every planner searches. Planners map
+    history into that space with `encode`, and their proposals back out with
+    `decode`, which snaps integers and categoricals to valid values.
+    """
+
+    bounds: Dict[str, tuple[float, float]] = field(default_factory=dict)
+    dimensions: Dict[str, Dimension] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.bounds = dict(self.bounds)
+        for name, dim in self.dimensions.items():
+            self.bounds[name] = dim.encoded_bounds()
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, object]) -> "DesignSpace":
+        """Parse the API form: `[lo, hi]` for floats, or a dict such as
+        {"type": "int", "low": 1, "high": 5}, {"type": "float", "low": 1e-4,
+        "high": 1e-2, "log": true} or {"type": "categorical", "choices": [...]}.
+        """
+        bounds: Dict[str, tuple[float, float]] = {}
+        dimensions: Dict[str, Dimension] = {}
+        for name, value in spec.items():
+            if isinstance(value, dict):
+                kind = str(value.get("type", "float"))
+                if kind not in ("float", "int", "categorical"):
+                    raise ValueError(f"Unsupported dimension type for {name}: {kind}")
+                dimensions[name] = Dimension(
+                    kind=kind,  # type: ignore[arg-type]
+                    low=float(value.get("low", 0.0)),
+                    high=float(value.get("high", 1.0)),
+                    log=bool(value.get("log", False)),
+                    choices=tuple(value.get("choices", ())),
+                )
+            else:
+                lo, hi = value  # type: ignore[misc]
+                bounds[name] = (float(lo), float(hi))
+        # placeholders keep the spec order; typed entries are replaced by their encoded box
+        return cls(bounds={k: bounds.get(k, (0.0, 1.0)) for k in spec}, dimensions=dimensions)
+
+    @property
+    def typed(self) -> bool:
+        """True when some parameter needs encoding (log, int or categorical)."""
+        return any(d.kind != "float" or d.log for d in self.dimensions.values())
+
+    def encode(self, params: Dict[str, object]) -> Dict[str, float]:
+        if not self.typed:
+            return {k: float(v) for k, v in params.items()}  # type: ignore[arg-type]
+        out: Dict[str, float] = {}
+        for k, v in params.items():
+            dim = self.dimensions.get(k)
+            out[k] = dim.encode(v) if dim is not None else float(v)  # type: ignore[arg-type]
+        return out
+
+    def decode(self, params: Dict[str, float]) -> Dict[str, object]:
+        return {
+            k: self.dimensions[k].decode(v) if k in self.dimensions else float(v)
+            for k, v in params.items()
+        }
+
+    def encode_runs(self, history: Sequence[RunResult]) -> Sequence[RunResult]:
+        """History with parameters in the encoded space; returned as-is when nothing is typed.
+
+        A `HistoryFrame` is encoded column by column and stays a frame.
+        """
+        if not self.typed:
+            return history
+        if isinstance(history, HistoryFrame):
+            return history.with_parameters(
+                {
+                    name: history.encode_parameter(name, dim.encode, dim.encode_array)
+                    for name, dim in self.dimensions.items()
+                    if name in history.parameter_names
+                }
+            )
+        return [replace(r, parameters=self.encode(r.parameters)) for r in history]
+
+    def snap(self, x: np.ndarray, names: Sequence[str]) -> np.ndarray:
+        """Round encoded rows (columns in `names` order) onto valid integer and categorical values."""
+        out = np.array(x, dtype=float)
+        for j, name in enumerate(names):
+            dim = self.dimensions.get(name)
+            if dim is None or dim.kind == "float":
+                continue
+            if dim.kind == "categorical":
+                out[:, j] = np.clip(np.rint(out[:, j]), 0, len(dim.choices) - 1)
+                continue
+            v = np.clip(np.rint(np.exp(out[:, j]) if dim.log else out[:, j]), dim.low, dim.high)
+            out[:, j] = np.log(v) if dim.log else v
+        return out
+
+    def categorical_mask(self, names: Sequence[str]) -> np.ndarray | None:
+        """Boolean mask of categorical columns in `names` order, None when there are none."""
+        mask = np.array([getattr(self.dimensions.get(k), "kind", "float") == "categorical" for k in names], dtype=bool)
+        return mask if mask.any() else None
 
 
 AcquisitionKind = Literal["ucb", "ei", "thompson"]
+GPAcquisitionKind = Literal["ei", "ucb", "nei"]
+BatchStrategy = Literal["kriging_believer", "constant_liar", "local_penalization", "none"]
+
+_DISTANCE_CHUNK_ELEMENTS = 4_000_000
 
 
 class ExperimentPlanner:
     """Interface for cognitive planning.
 
+    `pending` holds parameter points that are queued or running but have no
+    result yet; planners should steer new proposals away from them.
+
+    Subclasses implement `_propose`, which works in the encoded numeric space
+    of the design (see `DesignSpace`): `propose` encodes history and pending
+    points on the way in and decodes the proposals on the way out, so typed
+    parameters reach the caller as valid values.
+
     Future implementations:
     - BayesianOptimizerPlanner (BoTorch/Ax/Optuna backed)
     - ActiveLearningPlanner
@@ -33,12 +224,49 @@ class ExperimentPlanner:
         constraints: Sequence[ConstraintSpec],
         history: Sequence[RunResult],
         n: int = 1,
+        pending: Sequence[Dict[str, float]] = (),
+    ) -> List[ExperimentSpec]:
+        specs = self._propose(
+            domain=domain,
+            design_space=design_space,
+            objectives=objectives,
+            constraints=constraints,
+            history=design_space.encode_runs(history),
+            n=n,
+            pending=[design_space.encode(p) for p in pending],
+        )
+        for spec in specs:
+            spec.parameters = design_space.decode(spec.parameters)
+        return specs
+
+    def _propose(
+        self,
+        *,
+        domain: str,
+        design_space: DesignSpace,
+        objectives: Sequence[ObjectiveSpec],
+        constraints: Sequence[ConstraintSpec],
+        history: Sequence[RunResult],
+        n: int = 1,
+        pending: Sequence[Dict[str, float]] = (),
     ) -> List[ExperimentSpec]:
         raise NotImplementedError
 
 
 class BaselineGridPlanner(ExperimentPlanner):
-    def propose(
+    """Space-filling initial design, also used by the model-based planners as warm-up.
+
+    `design` picks the sequence: scrambled Sobol (default), scrambled Halton,
+    maximin Latin hypercube blocks, or the legacy diagonal sweep. Point k of
+    the sequence goes to the k-th experiment of the domain (history plus
+    pending), so a restarted service continues the same sequence.
+    """
+
+    def __init__(self, design: DesignKind = "sobol", seed: int = 0):
+        self.design = design
+        self.seed = seed
+
+    def _propose(
         self,
         *,
         domain: str,
@@ -47,17 +275,19 @@ class BaselineGridPlanner(ExperimentPlanner):
         constraints: Sequence[ConstraintSpec],
         history: Sequence[RunResult],
         n: int = 1,
+        pending: Sequence[Dict[str, float]] = (),
     ) -> List[ExperimentSpec]:
+        # pending points already consumed the next points of the sequence
+        history_count = len(history) + len(pending)
+        names = list(design_space.bounds.keys())
+        unit = design_points(self.design, history_count, n, len(names), seed=self.seed)
+
         specs: List[ExperimentSpec] = []
-        history_count = len(history)
         for i in range(n):
-            params = {}
-            step = history_count + i + 1
-            denom = max(10, step)
-            for name, (lo, hi) in design_space.bounds.items():
-                frac = min(1.0, step / denom)
-                params[name] = lo + (hi - lo) * frac
-
+            params = {
+                name: lo + (hi - lo) * float(unit[i, j])
+                for j, (name, (lo, hi)) in enumerate(design_space.bounds.items())
+            }
             specs.append(
                 ExperimentSpec(
                     experiment_id=f"{domain}-exp-{history_count+i+1}",
@@ -65,20 +295,151 @@ class BaselineGridPlanner(ExperimentPlanner):
                     parameters=params,
                     objectives=list(objectives),
                     constraints=list(constraints),
+                    metadata={"planner": "baseline", "design": self.design},
                 )
             )
 
         return specs
 
 
+def _unit_scale(design_space: DesignSpace) -> np.ndarray:
+    """Per-axis factors mapping raw parameter offsets onto the unit box."""
+    span = np.array([hi - lo for lo, hi in design_space.bounds.values()], dtype=float)
+    return 1.0 / np.where(span > 0, span, 1.0)
+
+
+def _snap_unit(
+    design_space: DesignSpace, names: Sequence[str], lo: np.ndarray, span: np.ndarray, unit: np.ndarray
+) -> np.ndarray:
+    """Unit-box rows moved onto valid integer and categorical values."""
+    if not design_space.typed:
+        return unit
+    return (design_space.snap(lo + span * unit, names) - lo) / np.where(span > 0, span, 1.0)
+
+
+def _local_penalty(points: np.ndarray, center: np.ndarray, radius: float) -> np.ndarray:
+    """Multiplicative penalty in [0, 1) that vanishes at `center` and recovers beyond ~2 radii.
+
+    Axes where `center` is NaN (parameter unknown) are ignored.
+    """
+    sq = np.nansum((points - center) ** 2, axis=1)
+    return 1.0 - np.exp(-0.5 * sq / max(radius, 1e-12) ** 2)
+
+
+def _feasibility_filter(
+    model: FeasibilityModel,
+    history: Sequence[RunResult],
+    names: Sequence[str],
+    lo: np.ndarray,
+    span: np.ndarray,
+    constraints: Sequence[ConstraintSpec],
+    unit_points: np.ndarray,
+    n: int,
+    categorical: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """Keep-mask over candidate rows and P(feasible) of the kept rows.
+
+    Returns (all True, None) when the history holds nothing to learn from, so
+    planners without constraints or failed runs behave exactly as before.
+    """
+    model.fit(history, names, lo, span, constraints, categorical)
+    if model.trivial:
+        return np.ones(len(unit_points), dtype=bool), None
+    p = model.predict(unit_points)
+    keep = model.keep_mask(p, n)
+    return keep, p[keep]
+
+
+def _feasibility_metadata(p_feasible: np.ndarray | None, i: int) -> Dict[str, str]:
+    return {} if p_feasible is None else {"p_feasible": f"{p_feasible[i]:.3g}"}
+
+
+class _PackedHistory:
+    """"ok" runs of one growing history, packed into arrays across propose() calls.
+
+    Only rows appended since the previous sync are parsed, as long as the
+    history still starts with the rows seen before (checked by length and the
+    last experiment id); anything else triggers a rebuild. Runs are read
+    column-wise, so a `HistoryFrame` is packed without building RunResults.
+    `objective_values` holds each run's objectives in the maximization space
+    of `pareto.objective_vector`, `scores` their weighted sum. The optional
+    neighbour index is kept alongside and grows with the packed rows.
+    """
+
+    def __init__(self, names: Sequence[str] = (), generation: int = 0):
+        self.names = tuple(names)
+        self.generation = generation
+        self.rows = 0
+        self.last_id: str | None = None
+        self.x = np.empty((0, len(self.names)))
+        self.objective_values = np.empty((0, 0))
+        self.scores = np.empty(0)
+        self.objectives_key: tuple | None = None
+        self.index: NeighborIndex | None = None
+        self.index_bounds: tuple | None = None
+
+    def sync(self, history: Sequence[RunResult], names: Sequence[str], objectives: Sequence[ObjectiveSpec]) -> None:
+        names = tuple(names)
+        stale = (
+            names != self.names
+            or len(history) < self.rows
+            or (self.rows > 0 and history[self.rows - 1].experiment_id != self.last_id)
+        )
+        if stale:
+            self.__init__(names, self.generation + 1)
+
+        key = tuple((o.name, o.direction, float(o.weight)) for o in objectives)
+        if key != self.objectives_key:
+            # same runs, new objectives: rescore every packed row
+            self.objectives_key = key
+            self.objective_values = self._objective_values(history[:self.rows], objectives)
+        new = history[self.rows:]
+        if len(new):
+            ok = status_mask(new, "ok")
+            self.x = np.vstack([self.x, parameter_matrix(new, names)[ok]])
+            self.objective_values = np.vstack([self.objective_values, self._objective_values(new, objectives)])
+            self.rows = len(history)
+            self.last_id = history[-1].experiment_id
+        weights = np.array([o.weight for o in objectives], dtype=float)
+        self.scores = self.objective_values @ weights
+
+    @staticmethod
+    def _objective_values(history: Sequence[RunResult], objectives: Sequence[ObjectiveSpec]) -> np.ndarray:
+        """Maximization-signed objectives of the "ok" rows; a missing output counts as 0."""
+        return objective_matrix(history, objectives)[status_mask(history, "ok")]
+
+    def neighbor_index(self, design_space: DesignSpace) -> NeighborIndex | None:
+        """Index over the packed rows; None when some row lacks a design parameter."""
+        if np.isnan(self.x).any():
+            return None
+        bounds = tuple(design_space.bounds[k] for k in self.names)
+        if self.index is None or bounds != self.index_bounds:
+            self.index_bounds = bounds
+            self.index = NeighborIndex(lower=[lo for lo, _ in bounds], upper=[hi for _, hi in bounds])
+        start = len(self.index)
+        if start < len(self.x):
+            self.index.add(self.x[start:], range(start, len(self.x)))
+        return self.index
+
+
 class ModelBasedPlanner(ExperimentPlanner):
     """Lightweight model-based planner with BO-style acquisition.
 
-    Surrogate: nearest-neighbor estimate over prior runs.
+    Surrogate: nearest-neighbor estimate over prior runs. Histories with at
+    least `index_threshold` ok runs are searched through a KD-tree index that
+    is updated incrementally as new runs are appended.
     Acquisition choices:
       - ucb: mean + beta * std
       - ei: expected improvement over best observed score
       - thompson: Gaussian sample(mean, std)
+    Batches (n > 1) are built one point at a time, see `_select_batch`.
+
+    Large pools (`random_candidates` in the tens of thousands) are scored in
+    `score_chunk`-row chunks, spread over `workers` threads or processes. With
+    `refine_starts > 0` the best pool points seed a multi-start local search on
+    the acquisition surface (L-BFGS-B if SciPy is installed, else Nelder-Mead)
+    whose optima join the pool; Thompson sampling is never refined since its
+    surface is random.
     """
 
     def __init__(
@@ -87,13 +448,35 @@ class ModelBasedPlanner(ExperimentPlanner):
         beta: float = 0.6,
         acquisition: AcquisitionKind = "ucb",
         seed: int = 7,
+        index_threshold: int = 4096,
+        batch_strategy: BatchStrategy = "local_penalization",
+        penalty_radius: float = 0.1,
+        feasibility: FeasibilityModel | None = None,
+        workers: int = 1,
+        executor: ExecutorKind = "thread",
+        score_chunk: int = 4096,
+        refine_starts: int = 0,
+        refine_method: RefineMethod = "auto",
+        refine_iters: int = 50,
     ):
         self.random_candidates = random_candidates
         self.beta = beta
         self.acquisition = acquisition
         self.rng = random.Random(seed)
+        self.index_threshold = index_threshold
+        self.batch_strategy = batch_strategy
+        self.penalty_radius = penalty_radius
+        self.feasibility = feasibility or FeasibilityModel()
+        self.workers = workers
+        self.executor = executor
+        self.score_chunk = score_chunk
+        self.refine_starts = refine_starts
+        self.refine_method = refine_method
+        self.refine_iters = refine_iters
+        self._history = _PackedHistory()
+        self._mismatch: np.ndarray | None = None
 
-    def propose(
+    def _propose(
         self,
         *,
         domain: str,
@@ -102,99 +485,324 @@ class ModelBasedPlanner(ExperimentPlanner):
         constraints: Sequence[ConstraintSpec],
         history: Sequence[RunResult],
         n: int = 1,
+        pending: Sequence[Dict[str, float]] = (),
     ) -> List[ExperimentSpec]:
         if len(history) < 5:
-            return BaselineGridPlanner().propose(
+            return BaselineGridPlanner()._propose(
                 domain=domain,
                 design_space=design_space,
                 objectives=objectives,
                 constraints=constraints,
                 history=history,
                 n=n,
+                pending=pending,
             )
 
-        pool = [self._sample_point(design_space) for _ in range(self.random_candidates)]
-        best_observed = self._best_observed(history, objectives)
+        names = list(design_space.bounds.keys())
+        cand_x = design_space.snap(self._sample_pool(design_space, self.random_candidates), names)
+        packed = self._history
+        packed.sync(history, names, objectives)
+        best_observed = float(packed.scores.max()) if packed.scores.size else 0.0
+        lo = np.array([design_space.bounds[k][0] for k in names], dtype=float)
+        span = np.array([design_space.bounds[k][1] for k in names], dtype=float) - lo
+        categorical = design_space.categorical_mask(names)
+        # a category mismatch counts as a full-span step along its axis; the KD-tree cannot express that
+        self._mismatch = None if categorical is None else np.where(categorical, span, 0.0)
+        use_index = self._mismatch is None and len(packed.scores) >= self.index_threshold
+        index = packed.neighbor_index(design_space) if use_index else None
 
-        ranked = sorted(
-            pool,
-            key=lambda p: self._acquisition_value(p, history, objectives, best_observed),
-            reverse=True,
+        keep, p_feasible = _feasibility_filter(
+            self.feasibility,
+            history,
+            names,
+            lo,
+            span,
+            constraints,
+            (cand_x - lo) * _unit_scale(design_space),
+            n,
+            categorical,
+        )
+        cand_x = cand_x[keep]
+        nd, ns = self._pool_neighbors(cand_x, packed.x, packed.scores, index)
+        if self.refine_starts > 0 and self.acquisition != "thompson" and len(cand_x):
+            refined = design_space.snap(self._refine(cand_x, nd, ns, best_observed, packed, index, lo, lo + span), names)
+            rd, rs = self._neighbors(refined, packed.x, packed.scores, index)
+            cand_x, nd, ns = np.vstack([cand_x, refined]), np.vstack([nd, rd]), np.vstack([ns, rs])
+            if p_feasible is not None:
+                p_feasible = np.concatenate([p_feasible, self.feasibility.predict((refined - lo) * _unit_scale(design_space))])
+        pending_x = np.array([[float(p.get(k, np.nan)) for k in names] for p in pending], dtype=float)
+        pending_x = pending_x.reshape(len(pending), len(names))
+        if len(pending_x):
+            pending_mean, _ = self._neighbor_stats(*self._neighbors(pending_x, packed.x, packed.scores, index))
+        else:
+            pending_mean = np.empty(0)
+        picks = self._select_batch(
+            cand_x, nd, ns, best_observed, design_space, n, pending_x, pending_mean, p_feasible
         )
+        offset = len(history) + len(pending)
 
         out = []
-        for i, params in enumerate(ranked[:n], start=1):
+        for i, row in enumerate(picks, start=1):
             out.append(
                 ExperimentSpec(
-                    experiment_id=f"{domain}-mb-{len(history)+i}",
+                    experiment_id=f"{domain}-mb-{offset+i}",
                     domain=domain,
-                    parameters=params,
+                    parameters={k: float(v) for k, v in zip(names, cand_x[row])},
                     objectives=list(objectives),
                     constraints=list(constraints),
-                    metadata={"planner": "model_based", "acquisition": self.acquisition},
+                    metadata={
+                        "planner": "model_based",
+                        "acquisition": self.acquisition,
+                        "batch_strategy": self.batch_strategy if n > 1 else "none",
+                        **_feasibility_metadata(p_feasible, row),
+                    },
                 )
             )
         return out
 
-    def _sample_point(self, design_space: DesignSpace) -> Dict[str, float]:
-        return {
-            name: self.rng.uniform(lo, hi)
-            for name, (lo, hi) in design_space.bounds.items()
-        }
+    def _sample_pool(self, design_space: DesignSpace, count: int) -> np.ndarray:
+        """`count` uniform points as rows, drawn point by point in bounds order."""
+        bounds = list(design_space.bounds.values())
+        flat = [self.rng.uniform(lo, hi) for _ in range(count) for lo, hi in bounds]
+        return np.array(flat, dtype=float).reshape(count, len(bounds))
 
-    def _acquisition_value(
+    def _pool_neighbors(
         self,
-        params: Dict[str, float],
-        history: Sequence[RunResult],
-        objectives: Sequence[ObjectiveSpec],
+        cand_x: np.ndarray,
+        hist_x: np.ndarray,
+        hist_scores: np.ndarray,
+        index: NeighborIndex | None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """`_neighbors` over a large pool, chunked and optionally spread over workers."""
+        if len(cand_x) <= self.score_chunk:
+            return self._neighbors(cand_x, hist_x, hist_scores, index)
+        parts = map_chunks(
+            functools.partial(self._neighbors, hist_x=hist_x, hist_scores=hist_scores, index=index),
+            cand_x,
+            chunk_size=self.score_chunk,
+            workers=self.workers,
+            executor=self.executor,
+        )
+        return np.vstack([d for d, _ in parts]), np.vstack([s for _, s in parts])
+
+    def _refine(
+        self,
+        cand_x: np.ndarray,
+        nd: np.ndarray,
+        ns: np.ndarray,
+        best_observed: float,
+        packed: _PackedHistory,
+        index: NeighborIndex | None,
+        lower: np.ndarray,
+        upper: np.ndarray,
+    ) -> np.ndarray:
+        """Local optima of the acquisition, started from the best pool points."""
+        values = self._acquisition(*self._neighbor_stats(nd, ns), best_observed)
+        starts = cand_x[top_k(values, self.refine_starts)]
+        objective = _ModelBasedObjective(self, packed.x, packed.scores, index, best_observed)
+        refined, _ = refine(
+            objective,
+            starts,
+            lower,
+            upper,
+            method=self.refine_method,
+            max_iter=self.refine_iters,
+            workers=self.workers,
+            executor=self.executor,
+        )
+        return refined
+
+    def _select_batch(
+        self,
+        cand_x: np.ndarray,
+        nd: np.ndarray,
+        ns: np.ndarray,
         best_observed: float,
-    ) -> float:
-        mean, std = self._surrogate_mean_std(params, history, objectives)
+        design_space: DesignSpace,
+        n: int,
+        pending_x: np.ndarray,
+        pending_mean: np.ndarray,
+        p_feasible: np.ndarray | None = None,
+    ) -> List[int]:
+        """Pick n candidates, each conditioned on pending points and earlier picks.
 
+        kriging_believer / constant_liar add those points to the surrogate as
+        fantasy runs (scored at their predicted mean, or at the worst observed
+        score) and re-score the pool; local_penalization damps acquisition
+        around them instead. "none" keeps the plain top-n ranking, except that
+        pending points are still fantasized as constant liars. Acquisition
+        values are weighted by `p_feasible` when given.
+        """
+        strategy = self.batch_strategy
+        if strategy == "none" and len(pending_x):
+            strategy = "constant_liar"
+
+        mean, std = self._neighbor_stats(nd, ns)
+        values = self._weighted_acquisition(mean, std, best_observed, p_feasible)
+        if strategy == "none" or (n <= 1 and not len(pending_x)):
+            return [int(i) for i in np.argsort(-values, kind="stable")[:n]]
+
+        scale = _unit_scale(design_space)
+        lie = float(ns.min()) if ns.size else 0.0
+        penalty = np.ones(len(values))
+        fantasy_x: List[np.ndarray] = []
+        fantasy_y: List[float] = []
+        if strategy == "local_penalization":
+            for p in pending_x * scale:
+                penalty *= _local_penalty(cand_x * scale, p, self.penalty_radius)
+        elif len(pending_x):
+            fantasy_x.extend(pending_x)
+            fantasy_y.extend(pending_mean.tolist() if strategy == "kriging_believer" else [lie] * len(pending_x))
+            fd, fs = self._merge_fantasies(cand_x, nd, ns, np.array(fantasy_x), np.array(fantasy_y))
+            mean, std = self._neighbor_stats(fd, fs)
+            values = self._weighted_acquisition(mean, std, best_observed, p_feasible)
+
+        picked: List[int] = []
+        while len(picked) < min(n, len(values)):
+            if strategy == "local_penalization":
+                effective = (values - values.min() + 1e-12) * penalty
+            else:
+                effective = values.copy()
+            effective[picked] = -np.inf
+            i = int(np.argmax(effective))
+            picked.append(i)
+
+            if strategy == "local_penalization":
+                penalty *= _local_penalty(cand_x * scale, cand_x[i] * scale, self.penalty_radius)
+                continue
+            fantasy_x.append(cand_x[i])
+            fantasy_y.append(float(mean[i]) if strategy == "kriging_believer" else lie)
+            fd, fs = self._merge_fantasies(cand_x, nd, ns, np.array(fantasy_x), np.array(fantasy_y))
+            mean, std = self._neighbor_stats(fd, fs)
+            values = self._weighted_acquisition(mean, std, best_observed, p_feasible)
+        return picked
+
+    def _weighted_acquisition(
+        self, mean: np.ndarray, std: np.ndarray, best_observed: float, p_feasible: np.ndarray | None
+    ) -> np.ndarray:
+        values = self._acquisition(mean, std, best_observed)
+        return values if p_feasible is None else feasibility_weighted(values, p_feasible)
+
+    def _acquisition(self, mean: np.ndarray, std: np.ndarray, best_observed: float) -> np.ndarray:
         if self.acquisition == "ucb":
             return mean + self.beta * std
         if self.acquisition == "ei":
             # Positive part of improvement with small exploration bonus
-            return max(0.0, mean - best_observed) + 0.1 * std
+            return np.maximum(0.0, mean - best_observed) + 0.1 * std
         if self.acquisition == "thompson":
-            return self.rng.gauss(mean, max(std, 1e-6))
+            return np.array([self.rng.gauss(m, max(s, 1e-6)) for m, s in zip(mean.tolist(), std.tolist())])
         return mean
 
-    def _surrogate_mean_std(
+    def _surrogate_mean_std_batch(
         self,
-        params: Dict[str, float],
-        history: Sequence[RunResult],
-        objectives: Sequence[ObjectiveSpec],
-    ) -> tuple[float, float]:
-        rows = []
-        for r in history:
-            if r.status != "ok":
-                continue
-            dist = self._distance(params, r.parameters)
-            score = self._score_outputs(r.outputs, objectives)
-            rows.append((dist, score))
+        cand_x: np.ndarray,
+        hist_x: np.ndarray,
+        hist_scores: np.ndarray,
+        index: NeighborIndex | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Inverse-distance k-NN surrogate for every candidate row at once."""
+        return self._neighbor_stats(*self._neighbors(cand_x, hist_x, hist_scores, index))
 
-        if not rows:
-            return 0.0, 1.0
+    def _neighbors(
+        self,
+        cand_x: np.ndarray,
+        hist_x: np.ndarray,
+        hist_scores: np.ndarray,
+        index: NeighborIndex | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Distances and scores of the k nearest runs per candidate, nearest first."""
+        m, h = cand_x.shape[0], hist_x.shape[0]
+        k = min(7, h)
+        if k == 0:
+            return np.empty((m, 0)), np.empty((m, 0))
+        if index is not None:
+            nd, idx = index.query(cand_x, k, weights=index.span ** 2)
+            return nd, hist_scores[idx]
 
-        rows.sort(key=lambda t: t[0])
-        k = min(7, len(rows))
-        neigh = rows[:k]
+        # Bound the (chunk, history, dims) broadcast to a few million elements.
+        chunk = max(1, _DISTANCE_CHUNK_ELEMENTS // max(1, h * max(1, hist_x.shape[1])))
+        parts = [
+            self._k_nearest(self._distance_matrix(cand_x[start:start + chunk], hist_x, self._mismatch), hist_scores, k)
+            for start in range(0, m, chunk)
+        ]
+        return np.vstack([d for d, _ in parts]), np.vstack([s for _, s in parts])
 
-        weights = [1.0 / (d + 1e-6) for d, _ in neigh]
-        wsum = sum(weights)
+    @staticmethod
+    def _neighbor_stats(nd: np.ndarray, ns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        m, k = nd.shape
+        if k == 0:
+            return np.zeros(m), np.ones(m)
 
-        mean = sum((w / wsum) * s for w, (_, s) in zip(weights, neigh))
-        var = sum((w / wsum) * (s - mean) ** 2 for w, (_, s) in zip(weights, neigh))
+        weights = 1.0 / (nd + 1e-6)
+        wsum = weights.sum(axis=1, keepdims=True)
+        mean = ((weights / wsum) * ns).sum(axis=1)
+        var = ((weights / wsum) * (ns - mean[:, None]) ** 2).sum(axis=1)
 
         # add spatial uncertainty term: farther neighborhood -> more uncertain
-        mean_dist = sum(d for d, _ in neigh) / k
-        std = math.sqrt(max(0.0, var)) + 0.2 * mean_dist
-        return mean, std
+        mean_dist = nd.sum(axis=1) / k
+        return mean, np.sqrt(np.maximum(0.0, var)) + 0.2 * mean_dist
+
+    def _merge_fantasies(
+        self,
+        cand_x: np.ndarray,
+        nd: np.ndarray,
+        ns: np.ndarray,
+        fantasy_x: np.ndarray,
+        fantasy_y: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Fold fantasy runs into precomputed neighbour lists (fantasies rank after real runs on ties)."""
+        d = np.hstack([nd, self._distance_matrix(cand_x, fantasy_x, self._mismatch)])
+        s = np.hstack([ns, np.broadcast_to(fantasy_y, (len(cand_x), len(fantasy_y)))])
+        k = min(7, d.shape[1])
+        order = np.argsort(d, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(d, order, axis=1), np.take_along_axis(s, order, axis=1)
+
+    @staticmethod
+    def _distance_matrix(cand_x: np.ndarray, hist_x: np.ndarray, mismatch: np.ndarray | None = None) -> np.ndarray:
+        """Euclidean distance over the keys each history row shares with the candidates (1.0 if none).
+
+        Columns with a positive `mismatch` entry are categorical: they add that
+        distance when the codes differ and nothing when they agree.
+        """
+        if mismatch is not None:
+            cat = mismatch > 0
+            sq = ModelBasedPlanner._distance_matrix(cand_x[:, ~cat], hist_x[:, ~cat]) ** 2
+            for j in np.nonzero(cat)[0]:
+                sq += mismatch[j] ** 2 * (np.abs(cand_x[:, j, None] - hist_x[None, :, j]) > 1e-9)
+            return np.sqrt(sq)
+        if not (np.isnan(cand_x).any() or np.isnan(hist_x).any()):
+            # complete rows: expand |a-b|^2 into one matmul, centred to limit cancellation
+            center = hist_x.mean(axis=0) if len(hist_x) else 0.0
+            a, b = cand_x - center, hist_x - center
+            sq = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * a @ b.T
+            return np.sqrt(np.maximum(sq, 0.0))
+        diff = cand_x[:, None, :] - hist_x[None, :, :]
+        sq = np.where(np.isnan(diff), 0.0, diff * diff).sum(axis=2)
+        shared = ~np.isnan(hist_x).all(axis=1)
+        return np.where(shared[None, :], np.sqrt(sq), 1.0)
 
-    def _best_observed(self, history: Sequence[RunResult], objectives: Sequence[ObjectiveSpec]) -> float:
-        vals = [self._score_outputs(r.outputs, objectives) for r in history if r.status == "ok"]
-        return max(vals) if vals else 0.0
+    @staticmethod
+    def _k_nearest(dist: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Pick the k nearest rows per candidate, ordered by (distance, history index).
+
+        Ties at the k-th distance go to the earliest history rows, which matches a
+        stable full sort without paying for one.
+        """
+        m, h = dist.shape
+        if k < h:
+            kth = np.partition(dist, k - 1, axis=1)[:, k - 1:k]
+            below = dist < kth
+            tied = dist == kth
+            room = k - below.sum(axis=1, keepdims=True)
+            take = below | (tied & (np.cumsum(tied, axis=1) <= room))
+        else:
+            take = np.ones_like(dist, dtype=bool)
+
+        idx = np.nonzero(take)[1].reshape(m, k)
+        nd = np.take_along_axis(dist, idx, axis=1)
+        order = np.argsort(nd, axis=1, kind="stable")
+        idx = np.take_along_axis(idx, order, axis=1)
+        return np.take_along_axis(nd, order, axis=1), scores[idx]
 
     @staticmethod
     def _score_outputs(outputs: Dict[str, float], objectives: Sequence[ObjectiveSpec]) -> float:
@@ -204,24 +812,896 @@ class ModelBasedPlanner(ExperimentPlanner):
             total += obj.weight * (val if obj.direction == "maximize" else -val)
         return total
 
+
+class _ModelBasedObjective:
+    """Acquisition of a ModelBasedPlanner at a single point; picklable for process pools."""
+
+    def __init__(
+        self,
+        planner: ModelBasedPlanner,
+        hist_x: np.ndarray,
+        hist_scores: np.ndarray,
+        index: NeighborIndex | None,
+        best_observed: float,
+    ):
+        self.planner = planner
+        self.hist_x = hist_x
+        self.hist_scores = hist_scores
+        self.index = index
+        self.best_observed = best_observed
+
+    def __call__(self, x: np.ndarray) -> float:
+        nd, ns = self.planner._neighbors(np.atleast_2d(x), self.hist_x, self.hist_scores, self.index)
+        mean, std = self.planner._neighbor_stats(nd, ns)
+        return float(self.planner._acquisition(mean, std, self.best_observed)[0])
+
+
+class GaussianProcessPlanner(ExperimentPlanner):
+    """Gaussian-process planner with analytic acquisition, NumPy only.
+
+    Surrogate: exact GP over unit-normalized parameters (squared-exponential
+    kernel, fixed hyperparameters) fitted to the weighted objective score.
+    Acquisition choices:
+      - ei: expected improvement over the best observed score
+      - ucb: mean + beta * std
+      - nei: noisy EI, averaged over posterior samples of the incumbent
+
+    Runs appended since the previous call extend the kernel factor one row at a
+    time (O(n^2) each); a full refit only happens when the history is rewritten
+    or the design bounds change. Past `max_points` "ok" runs the GP is refitted
+    on a window of the best max_points // 2 runs plus the newest ones, which
+    bounds each propose at O(max_points^3) time and O(max_points^2) memory
+    however long the history grows. Batches use the same strategies as
+    ModelBasedPlanner, with fantasies folded into a copy of the GP.
+
+    With a `transfer` prior, runs of related domains are added to a copy of the
+    surrogate (see `TransferPrior`), and the baseline warm-up is skipped
+    whenever some source is similar enough to be used.
+    """
+
+    def __init__(
+        self,
+        acquisition: GPAcquisitionKind = "ei",
+        random_candidates: int = 512,
+        beta: float = 2.0,
+        length_scale: float = 0.2,
+        noise: float = 1e-4,
+        nei_samples: int = 32,
+        seed: int = 7,
+        batch_strategy: BatchStrategy = "local_penalization",
+        penalty_radius: float = 0.1,
+        feasibility: FeasibilityModel | None = None,
+        transfer: TransferPrior | None = None,
+        max_points: int = 1024,
+    ):
+        self.acquisition = acquisition
+        self.transfer = transfer
+        self.max_points = max(2, max_points)
+        self.batch_strategy = batch_strategy
+        self.penalty_radius = penalty_radius
+        self.feasibility = feasibility or FeasibilityModel(length_scale=length_scale, noise=noise)
+        self.random_candidates = random_candidates
+        self.beta = beta
+        self.length_scale = length_scale
+        self.noise = noise
+        self.nei_samples = nei_samples
+        self.rng = np.random.default_rng(seed)
+        self._history = _PackedHistory()
+        self._gp: GaussianProcess | None = None
+        self._gp_key: tuple | None = None
+        # packed rows the GP is trained on, in GP order
+        self._gp_rows = np.empty(0, dtype=int)
+
+    def _propose(
+        self,
+        *,
+        domain: str,
+        design_space: DesignSpace,
+        objectives: Sequence[ObjectiveSpec],
+        constraints: Sequence[ConstraintSpec],
+        history: Sequence[RunResult],
+        n: int = 1,
+        pending: Sequence[Dict[str, float]] = (),
+    ) -> List[ExperimentSpec]:
+        if len(history) < 5 and self.transfer is None:
+            return BaselineGridPlanner()._propose(
+                domain=domain,
+                design_space=design_space,
+                objectives=objectives,
+                constraints=constraints,
+                history=history,
+                n=n,
+                pending=pending,
+            )
+
+        names = list(design_space.bounds.keys())
+        lo = np.array([design_space.bounds[k][0] for k in names], dtype=float)
+        span = np.array([design_space.bounds[k][1] for k in names], dtype=float) - lo
+        categorical = design_space.categorical_mask(names)
+        packed = self._history
+        packed.sync(history, names, objectives)
+        gp = self._sync_model(packed, lo, span, categorical)
+        transfer_metadata: Dict[str, str] = {}
+        if self.transfer is not None:
+            seeded = self.transfer.seed(gp, design_space, names, objectives)
+            if seeded is gp and len(history) < 5:
+                # no related domain is usable yet; warm up as without transfer
+                return BaselineGridPlanner()._propose(
+                    domain=domain,
+                    design_space=design_space,
+                    objectives=objectives,
+                    constraints=constraints,
+                    history=history,
+                    n=n,
+                    pending=pending,
+                )
+            gp = seeded
+            transfer_metadata["transfer"] = ",".join(f"{k}={w:.3g}" for k, w in self.transfer.similarity.items())
+
+        cand_u = _snap_unit(design_space, names, lo, span, self._candidates(gp, len(names)))
+        keep, p_feasible = _feasibility_filter(
+            self.feasibility, history, names, lo, span, constraints, cand_u, n, categorical
+        )
+        cand_u = cand_u[keep]
+        pending_u = np.array([[float(p.get(k, np.nan)) for k in names] for p in pending], dtype=float)
+        pending_u = (pending_u.reshape(len(pending), len(names)) - lo) / np.where(span > 0, span, 1.0)
+        offset = len(history) + len(pending)
+
+        out = []
+        for i, row in enumerate(self._select_batch(gp, cand_u, n, pending_u, p_feasible), start=1):
+            x = lo + span * cand_u[row]
+            out.append(
+                ExperimentSpec(
+                    experiment_id=f"{domain}-gp-{offset+i}",
+                    domain=domain,
+                    parameters={k: float(v) for k, v in zip(names, x)},
+                    objectives=list(objectives),
+                    constraints=list(constraints),
+                    metadata={
+                        "planner": "gaussian_process",
+                        "acquisition": self.acquisition,
+                        "batch_strategy": self.batch_strategy if n > 1 else "none",
+                        **transfer_metadata,
+                        **_feasibility_metadata(p_feasible, row),
+                    },
+                )
+            )
+        return out
+
+    def _sync_model(
+        self, packed: _PackedHistory, lo: np.ndarray, span: np.ndarray, categorical: np.ndarray | None = None
+    ) -> GaussianProcess:
+        key = (packed.generation, tuple(lo), tuple(span), None if categorical is None else tuple(categorical))
+        safe_span = np.where(span > 0, span, 1.0)
+        unit = np.where(np.isnan(packed.x), 0.5, (packed.x - lo) / safe_span)
+        rows = self._training_rows(packed)
+
+        gp, known = self._gp, self._gp_rows
+        if gp is None or key != self._gp_key or not np.array_equal(rows[:len(known)], known):
+            gp = GaussianProcess(length_scale=self.length_scale, noise=self.noise, categorical=categorical)
+            if len(rows):
+                gp.fit(unit[rows], packed.scores[rows])
+            self._gp, self._gp_key = gp, key
+        else:
+            for i in rows[len(known):]:
+                gp.add(unit[i], packed.scores[i])
+        self._gp_rows = rows
+        gp.set_targets(packed.scores[rows])
+        return gp
+
+    def _training_rows(self, packed: _PackedHistory) -> np.ndarray:
+        """Packed rows for the GP: all of them up to `max_points`, else the best half plus the newest."""
+        n = len(packed.x)
+        if n <= self.max_points:
+            return np.arange(n)
+        keep = np.zeros(n, dtype=bool)
+        keep[np.argsort(-self._window_priority(packed), kind="stable")[: self.max_points // 2]] = True
+        keep[np.nonzero(~keep)[0][-(self.max_points - int(keep.sum())):]] = True
+        return np.nonzero(keep)[0]
+
+    def _window_priority(self, packed: _PackedHistory) -> np.ndarray:
+        """Larger means kept first once the history outgrows `max_points`."""
+        return packed.scores
+
+    def _select_batch(
+        self,
+        gp: GaussianProcess,
+        cand_u: np.ndarray,
+        n: int,
+        pending_u: np.ndarray,
+        p_feasible: np.ndarray | None = None,
+    ) -> List[int]:
+        """Pick n candidates, each conditioned on pending points and earlier picks.
+
+        Fantasy strategies add those points to a copy of the GP (at the
+        posterior mean or at the worst observed score), which shrinks the
+        variance around them before the next pick. As in ModelBasedPlanner,
+        "none" still fantasizes pending points as constant liars, and
+        acquisition values are weighted by `p_feasible` when given.
+        """
+        strategy = self.batch_strategy
+        if strategy == "none" and len(pending_u):
+            strategy = "constant_liar"
+        if strategy == "none" or (n <= 1 and not len(pending_u)):
+            values = self._weighted_acquisition(gp, cand_u, p_feasible)
+            return [int(i) for i in np.argsort(-values, kind="stable")[:n]]
+
+        lie = float(gp.y.min()) if len(gp) else 0.0
+        model = gp
+        penalty = np.ones(len(cand_u))
+        if strategy == "local_penalization":
+            for p in pending_u:
+                penalty *= _local_penalty(cand_u, p, self.penalty_radius)
+        elif len(pending_u):
+            model = copy.copy(gp)
+            for p in np.where(np.isnan(pending_u), 0.5, pending_u):
+                model.add(p, float(model.predict(p)[0][0]) if strategy == "kriging_believer" else lie)
+        values = self._weighted_acquisition(model, cand_u, p_feasible)
+
+        picked: List[int] = []
+        while len(picked) < min(n, len(values)):
+            if strategy == "local_penalization":
+                effective = (values - values.min() + 1e-12) * penalty
+            else:
+                effective = values.copy()
+            effective[picked] = -np.inf
+            i = int(np.argmax(effective))
+            picked.append(i)
+
+            if strategy == "local_penalization":
+                penalty *= _local_penalty(cand_u, cand_u[i], self.penalty_radius)
+                continue
+            model = copy.copy(model)
+            y = float(model.predict(cand_u[i])[0][0]) if strategy == "kriging_believer" else lie
+            model.add(cand_u[i], y)
+            values = self._weighted_acquisition(model, cand_u, p_feasible)
+        return picked
+
+    def _candidates(self, gp: GaussianProcess, dims: int) -> np.ndarray:
+        pool = self.rng.uniform(size=(self.random_candidates, dims))
+        if len(gp):
+            # a quarter of the pool refines around the incumbent
+            local = max(1, self.random_candidates // 4)
+            best = gp.x[int(np.argmax(gp.y))]
+            pool[:local] = np.clip(best + self.rng.normal(scale=0.1, size=(local, dims)), 0.0, 1.0)
+        return pool
+
+    def _weighted_acquisition(self, gp: GaussianProcess, cand_u: np.ndarray, p_feasible: np.ndarray | None) -> np.ndarray:
+        values = self._acquisition_values(gp, cand_u)
+        return values if p_feasible is None else feasibility_weighted(values, p_feasible)
+
+    def _acquisition_values(self, gp: GaussianProcess, cand_u: np.ndarray) -> np.ndarray:
+        mean, var = gp.predict(cand_u)
+        std = np.sqrt(var)
+
+        if self.acquisition == "ucb":
+            return mean + self.beta * std
+        if self.acquisition == "nei" and len(gp):
+            return expected_improvement(mean[:, None], std[:, None], self._incumbent_samples(gp)[None, :]).mean(axis=1)
+        best = float(gp.y.max()) if len(gp) else 0.0
+        return expected_improvement(mean, std, best)
+
+    def _incumbent_samples(self, gp: GaussianProcess) -> np.ndarray:
+        """Posterior draws of the best latent value among the top observed points."""
+        obs_mean, _ = gp.predict(gp.x)
+        top = np.argsort(obs_mean)[-min(32, len(gp)):]
+        mean, cov = gp.predict(gp.x[top], full_cov=True)
+        jitter = 1e-9 * max(1.0, float(np.abs(np.diag(cov)).max()))
+        try:
+            chol = np.linalg.cholesky(cov + jitter * np.eye(len(top)))
+        except np.linalg.LinAlgError:
+            chol = np.diag(np.sqrt(np.maximum(np.diag(cov), 0.0)))
+        draws = mean[None, :] + self.rng.standard_normal((self.nei_samples, len(top))) @ chol.T
+        return draws.max(axis=1)
+
+
+class ExpectedHypervolumePlanner(GaussianProcessPlanner):
+    """Multi-objective planner ranking candidates by expected hypervolume improvement.
+
+    One GP per objective in the maximization space of `pareto.objective_vector`;
+    all objectives are observed at the same inputs, so they share one
+    incrementally updated kernel factorization and only swap targets. EHVI is
+    a Monte-Carlo average of exact hypervolume improvement over posterior
+    draws (exact HV for 2-3 objectives, Monte-Carlo above). Batch and pending
+    points are folded into the front at their posterior mean (kriging believer).
+    `reference` gives the HV reference point in raw objective units; by default
+    it sits 10% below the worst observed value of each objective.
+    """
+
+    def __init__(
+        self,
+        random_candidates: int = 256,
+        mc_samples: int = 32,
+        length_scale: float = 0.2,
+        noise: float = 1e-4,
+        reference: Dict[str, float] | None = None,
+        seed: int = 7,
+        feasibility: FeasibilityModel | None = None,
+        max_points: int = 1024,
+    ):
+        super().__init__(
+            random_candidates=random_candidates,
+            length_scale=length_scale,
+            noise=noise,
+            seed=seed,
+            feasibility=feasibility,
+            max_points=max_points,
+        )
+        self.mc_samples = mc_samples
+        self.reference = reference
+
+    def _propose(
+        self,
+        *,
+        domain: str,
+        design_space: DesignSpace,
+        objectives: Sequence[ObjectiveSpec],
+        constraints: Sequence[ConstraintSpec],
+        history: Sequence[RunResult],
+        n: int = 1,
+        pending: Sequence[Dict[str, float]] = (),
+    ) -> List[ExperimentSpec]:
+        if len(history) < 5 or not objectives:
+            return BaselineGridPlanner()._propose(
+                domain=domain,
+                design_space=design_space,
+                objectives=objectives,
+                constraints=constraints,
+                history=history,
+                n=n,
+                pending=pending,
+            )
+
+        names = list(design_space.bounds.keys())
+        lo = np.array([design_space.bounds[k][0] for k in names], dtype=float)
+        span = np.array([design_space.bounds[k][1] for k in names], dtype=float) - lo
+        safe_span = np.where(span > 0, span, 1.0)
+        categorical = design_space.categorical_mask(names)
+        packed = self._history
+        packed.sync(history, names, objectives)
+        gp = self._sync_model(packed, lo, span, categorical)
+        if not len(gp):
+            return BaselineGridPlanner()._propose(
+                domain=domain,
+                design_space=design_space,
+                objectives=objectives,
+                constraints=constraints,
+                history=history,
+                n=n,
+                pending=pending,
+            )
+
+        observed = packed.objective_values
+        on_front = non_dominated_mask(observed)
+        front = observed[on_front]
+        reference = self._reference_point(observed, objectives)
+
+        # a quarter of the pool refines around random members of the current front
+        cand_u = self.rng.uniform(size=(self.random_candidates, len(names)))
+        local = max(1, self.random_candidates // 4)
+        window_front = np.nonzero(on_front[self._gp_rows])[0]
+        anchors = gp.x[self.rng.choice(window_front if len(window_front) else np.arange(len(gp)), size=local)]
+        cand_u[:local] = np.clip(anchors + self.rng.normal(scale=0.1, size=anchors.shape), 0.0, 1.0)
+        cand_u = _snap_unit(design_space, names, lo, span, cand_u)
+        keep, p_feasible = _feasibility_filter(
+            self.feasibility, history, names, lo, span, constraints, cand_u, n, categorical
+        )
+        cand_u = cand_u[keep]
+
+        models = []
+        for j in range(observed.shape[1]):
+            model = copy.copy(gp)
+            model.set_targets(observed[self._gp_rows, j])
+            models.append(model)
+        mean, std = self._posterior(models, cand_u)
+
+        pending_u = np.array([[float(p.get(k, np.nan)) for k in names] for p in pending], dtype=float)
+        pending_u = (pending_u.reshape(len(pending), len(names)) - lo) / safe_span
+        if len(pending_u):
+            fantasies, _ = self._posterior(models, np.where(np.isnan(pending_u), 0.5, pending_u))
+            front = np.vstack([front, fantasies])
+
+        picked: List[int] = []
+        while len(picked) < min(n, len(cand_u)):
+            values = self._ehvi(mean, std, front, reference)
+            if p_feasible is not None:
+                values = values * p_feasible
+            values[picked] = -np.inf
+            i = int(np.argmax(values))
+            picked.append(i)
+            front = np.vstack([front, mean[i]])
+
+        offset = len(history) + len(pending)
+        out = []
+        for j, i in enumerate(picked, start=1):
+            x = lo + span * cand_u[i]
+            out.append(
+                ExperimentSpec(
+                    experiment_id=f"{domain}-ehvi-{offset+j}",
+                    domain=domain,
+                    parameters={k: float(v) for k, v in zip(names, x)},
+                    objectives=list(objectives),
+                    constraints=list(constraints),
+                    metadata={"planner": "ehvi", "acquisition": "ehvi", **_feasibility_metadata(p_feasible, i)},
+                )
+            )
+        return out
+
     @staticmethod
-    def _distance(a: Dict[str, float], b: Dict[str, float]) -> float:
-        keys = set(a.keys()).intersection(b.keys())
-        if not keys:
-            return 1.0
-        return math.sqrt(sum((float(a[k]) - float(b[k])) ** 2 for k in keys))
+    def _posterior(models: List[GaussianProcess], cand_u: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        stats = [m.predict(cand_u) for m in models]
+        mean = np.stack([m for m, _ in stats], axis=1)
+        std = np.sqrt(np.stack([v for _, v in stats], axis=1))
+        return mean, std
+
+    def _window_priority(self, packed: _PackedHistory) -> np.ndarray:
+        # keep whole Pareto layers, best first
+        return -non_dominated_sort(packed.objective_values).astype(float)
+
+    def _reference_point(self, observed: np.ndarray, objectives: Sequence[ObjectiveSpec]) -> np.ndarray:
+        if self.reference is not None:
+            raw = {o.name: float(self.reference[o.name]) for o in objectives}
+            return np.array(list(objective_vector(raw, objectives).values()), dtype=float)
+        low, high = observed.min(axis=0), observed.max(axis=0)
+        return low - 0.1 * np.maximum(high - low, 1e-9)
+
+    def _ehvi(self, mean: np.ndarray, std: np.ndarray, front: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        m, d = mean.shape
+        draws = mean[None] + std[None] * self.rng.standard_normal((self.mc_samples, m, d))
+        hvi = hypervolume_improvement(draws.reshape(-1, d), front, reference, rng=self.rng)
+        return hvi.reshape(self.mc_samples, m).mean(axis=0)
+
+
+@dataclass
+class _TrustRegion:
+    center: np.ndarray
+    length: float
+    best: float = -np.inf
+    successes: int = 0
+    failures: int = 0
+    batch_size: int = 1
+
+
+@dataclass
+class _TrustRegionState:
+    history: _PackedHistory
+    regions: List[_TrustRegion]
+    owner: Dict[str, int]
+    rows: int = 0
+    last_id: str | None = None
+
+
+class TrustRegionPlanner(ExperimentPlanner):
+    """TuRBO-style planner searching local boxes around incumbents.
+
+    Each of `n_regions` trust regions is a box of side `length` (unit-box
+    coordinates) centred on its best run. A region that improves its best in
+    `success_tolerance` consecutive batches doubles in size (up to
+    `length_max`); one that fails `failure_tolerance` times in a row halves
+    (default: ceil(max(4, dims) / batch size) batches). Below `length_min` a
+    region restarts at a random centre. Runs proposed by a region count towards
+    its streaks; other runs only move the nearest region's centre if better.
+
+    Per-domain state persists across propose() calls. Candidates perturb only a
+    random subset of about 20 coordinates of the centre, so the pool size and
+    its cost stay flat as dimensionality grows. They are scored by EI under a GP
+    fitted to the `local_points` runs nearest to each centre, weighted by the
+    feasibility model's P(feasible) after pruning likely-infeasible points.
+    """
+
+    def __init__(
+        self,
+        n_regions: int = 1,
+        random_candidates: int = 512,
+        length_init: float = 0.8,
+        length_min: float = 0.5**7,
+        length_max: float = 1.6,
+        success_tolerance: int = 3,
+        failure_tolerance: int | None = None,
+        local_points: int = 256,
+        noise: float = 1e-4,
+        penalty_radius: float = 0.1,
+        seed: int = 7,
+        feasibility: FeasibilityModel | None = None,
+    ):
+        self.n_regions = n_regions
+        self.random_candidates = random_candidates
+        self.length_init = length_init
+        self.length_min = length_min
+        self.length_max = length_max
+        self.success_tolerance = success_tolerance
+        self.failure_tolerance = failure_tolerance
+        self.local_points = local_points
+        self.noise = noise
+        self.penalty_radius = penalty_radius
+        self.rng = np.random.default_rng(seed)
+        self.feasibility = feasibility or FeasibilityModel(noise=noise)
+        self._states: Dict[str, _TrustRegionState] = {}
+
+    def _propose(
+        self,
+        *,
+        domain: str,
+        design_space: DesignSpace,
+        objectives: Sequence[ObjectiveSpec],
+        constraints: Sequence[ConstraintSpec],
+        history: Sequence[RunResult],
+        n: int = 1,
+        pending: Sequence[Dict[str, float]] = (),
+    ) -> List[ExperimentSpec]:
+        names = list(design_space.bounds.keys())
+        lo = np.array([design_space.bounds[k][0] for k in names], dtype=float)
+        span = np.array([design_space.bounds[k][1] for k in names], dtype=float) - lo
+        safe_span = np.where(span > 0, span, 1.0)
+        categorical = design_space.categorical_mask(names)
+
+        state = self._states.get(domain)
+        if state is None:
+            state = _TrustRegionState(history=_PackedHistory(), regions=[], owner={})
+            self._states[domain] = state
+        generation = state.history.generation
+        state.history.sync(history, names, objectives)
+        packed = state.history
+        if packed.generation != generation:
+            state.regions, state.owner, state.rows, state.last_id = [], {}, 0, None
+
+        if len(history) < 5 or not len(packed.scores):
+            return BaselineGridPlanner()._propose(
+                domain=domain,
+                design_space=design_space,
+                objectives=objectives,
+                constraints=constraints,
+                history=history,
+                n=n,
+                pending=pending,
+            )
+
+        unit = np.where(np.isnan(packed.x), 0.5, (packed.x - lo) / safe_span)
+        if not state.regions:
+            self._init_regions(state, unit, packed.scores, len(names))
+        self._update_regions(state, history, objectives, lo, safe_span, len(names))
+
+        pending_u = np.array([[float(p.get(k, np.nan)) for k in names] for p in pending], dtype=float)
+        pending_u = (pending_u.reshape(len(pending), len(names)) - lo) / safe_span
+        best = float(packed.scores.max())
+
+        self.feasibility.fit(history, names, lo, span, constraints, categorical)
+        pools, values, feasible = [], [], []
+        for region in state.regions:
+            cand = _snap_unit(design_space, names, lo, span, self._candidates(region, len(names)))
+            p_feasible = None if self.feasibility.trivial else self.feasibility.predict(cand)
+            if p_feasible is not None:
+                keep = self.feasibility.keep_mask(p_feasible, n)
+                cand, p_feasible = cand[keep], p_feasible[keep]
+            gp = self._local_model(region, unit, packed.scores, categorical)
+            mean, var = gp.predict(cand)
+            ei = expected_improvement(mean, np.sqrt(var), best)
+            if p_feasible is not None:
+                ei *= p_feasible
+            for p in pending_u:
+                ei *= _local_penalty(cand, p, self.penalty_radius * region.length)
+            pools.append(cand)
+            values.append(ei)
+            feasible.append(p_feasible)
+
+        total = sum(len(v) for v in values)
+        if not total:
+            # feasibility pruning emptied every pool; fall back to the plain sweep
+            return BaselineGridPlanner()._propose(
+                domain=domain,
+                design_space=design_space,
+                objectives=objectives,
+                constraints=constraints,
+                history=history,
+                n=n,
+                pending=pending,
+            )
+        chosen = [np.zeros(len(v), dtype=bool) for v in values]
+        picks: List[tuple[int, int]] = []
+        while len(picks) < min(n, total):
+            masked = [np.where(c, -np.inf, v) for c, v in zip(chosen, values)]
+            r = int(np.argmax([m.max() if len(m) else -np.inf for m in masked]))
+            i = int(np.argmax(masked[r]))
+            picks.append((r, i))
+            chosen[r][i] = True
+            x = pools[r][i]
+            for j, region in enumerate(state.regions):
+                values[j] = values[j] * _local_penalty(pools[j], x, self.penalty_radius * region.length)
+
+        for j, region in enumerate(state.regions):
+            region.batch_size = max(1, sum(1 for r, _ in picks if r == j))
+
+        offset = len(history) + len(pending)
+        out = []
+        for k, (r, i) in enumerate(picks, start=1):
+            experiment_id = f"{domain}-tr-{offset+k}"
+            state.owner[experiment_id] = r
+            x = lo + span * pools[r][i]
+            out.append(
+                ExperimentSpec(
+                    experiment_id=experiment_id,
+                    domain=domain,
+                    parameters={name: float(v) for name, v in zip(names, x)},
+                    objectives=list(objectives),
+                    constraints=list(constraints),
+                    metadata={
+                        "planner": "trust_region",
+                        "acquisition": "ei",
+                        "region": str(r),
+                        "region_length": f"{state.regions[r].length:.4g}",
+                        **_feasibility_metadata(feasible[r], i),
+                    },
+                )
+            )
+        return out
+
+    def _init_regions(self, state: _TrustRegionState, unit: np.ndarray, scores: np.ndarray, dims: int) -> None:
+        best = int(np.argmax(scores))
+        state.regions = [_TrustRegion(center=unit[best].copy(), length=self.length_init, best=float(scores[best]))]
+        for _ in range(1, self.n_regions):
+            state.regions.append(_TrustRegion(center=self.rng.uniform(size=dims), length=self.length_init))
+
+    def _update_regions(
+        self,
+        state: _TrustRegionState,
+        history: Sequence[RunResult],
+        objectives: Sequence[ObjectiveSpec],
+        lo: np.ndarray,
+        safe_span: np.ndarray,
+        dims: int,
+    ) -> None:
+        """Fold runs appended since the last call into the region streaks."""
+        batches: Dict[int, List[tuple[float, np.ndarray]]] = {}
+        for r in history[state.rows:]:
+            owner = state.owner.pop(r.experiment_id, None)
+            if r.status != "ok":
+                if owner is not None:
+                    batches.setdefault(owner, [])
+                continue
+            x = np.array([float(r.parameters.get(k, np.nan)) for k in state.history.names], dtype=float)
+            x = np.where(np.isnan(x), 0.5, (x - lo) / safe_span)
+            score = ModelBasedPlanner._score_outputs(r.outputs, objectives)
+            if owner is None or owner >= len(state.regions):
+                centers = np.array([region.center for region in state.regions])
+                region = state.regions[int(np.argmin(((centers - x) ** 2).sum(axis=1)))]
+                if score > region.best:
+                    region.best, region.center = score, x
+                continue
+            batches.setdefault(owner, []).append((score, x))
+        if len(history) > state.rows:
+            state.rows = len(history)
+            state.last_id = history[-1].experiment_id
+
+        for idx, results in batches.items():
+            region = state.regions[idx]
+            top = max(results, key=lambda item: item[0], default=None)
+            if top is not None and top[0] > region.best + 1e-3 * abs(region.best):
+                region.successes, region.failures = region.successes + 1, 0
+            else:
+                region.successes, region.failures = 0, region.failures + 1
+            if top is not None and top[0] > region.best:
+                region.best, region.center = top[0], top[1]
+
+            tolerance = self.failure_tolerance or int(np.ceil(max(4, dims) / region.batch_size))
+            if region.successes >= self.success_tolerance:
+                region.length, region.successes = min(2.0 * region.length, self.length_max), 0
+            elif region.failures >= tolerance:
+                region.length, region.failures = region.length / 2.0, 0
+            if region.length < self.length_min:
+                state.regions[idx] = _TrustRegion(center=self.rng.uniform(size=dims), length=self.length_init)
+
+    def _candidates(self, region: _TrustRegion, dims: int) -> np.ndarray:
+        lower = np.clip(region.center - region.length / 2.0, 0.0, 1.0)
+        upper = np.clip(region.center + region.length / 2.0, 0.0, 1.0)
+        m = self.random_candidates
+        # perturb ~20 coordinates per candidate (at least one) and keep the rest at the centre
+        mask = self.rng.uniform(size=(m, dims)) < min(1.0, 20.0 / dims)
+        mask[np.arange(m), self.rng.integers(0, dims, size=m)] = True
+        pool = lower + (upper - lower) * self.rng.uniform(size=(m, dims))
+        return np.where(mask, pool, region.center)
+
+    def _local_model(
+        self, region: _TrustRegion, unit: np.ndarray, scores: np.ndarray, categorical: np.ndarray | None = None
+    ) -> GaussianProcess:
+        d2 = squared_distances(unit, region.center[None, :], categorical)[:, 0]
+        rows = np.argsort(d2, kind="stable")[: self.local_points]
+        x = unit[rows]
+        # median heuristic: the kernel length follows the local spread of the data
+        dist = np.sqrt(squared_distances(x, x, categorical))[np.triu_indices(len(x), k=1)]
+        length_scale = float(np.median(dist)) if dist.size and np.median(dist) > 0 else max(region.length, 0.1)
+        gp = GaussianProcess(length_scale=length_scale, noise=self.noise, categorical=categorical)
+        return gp.fit(x, scores[rows])
+
+
+class MultiFidelityPlanner(ExperimentPlanner):
+    """Screen with a cheap simulator, promote the promising points to the expensive one.
+
+    History rows are treated as high-fidelity runs. Each call evaluates a pool of
+    `screen_candidates` points with `low_fidelity` (e.g. a
+    DomainSimulationBridge.simulate), models high ~= rho * low + delta(x) with a
+    GP on the residual delta, and promotes the n points with the best expected
+    improvement. `costs` holds per-fidelity costs and is reported in each
+    spec's metadata. `self.spent` charges screening as it happens and a promoted
+    point once its run shows up in the history, so abandoned promotions cost nothing.
+    """
+
+    def __init__(
+        self,
+        low_fidelity: Callable[[Dict[str, float]], Dict[str, float]],
+        costs: Dict[str, float] | None = None,
+        screen_candidates: int = 256,
+        length_scale: float = 0.2,
+        penalty_radius: float = 0.1,
+        seed: int = 7,
+        feasibility: FeasibilityModel | None = None,
+    ):
+        self.low_fidelity = low_fidelity
+        self.costs = {"low": 1.0, "high": 100.0, **(costs or {})}
+        self.screen_candidates = screen_candidates
+        self.length_scale = length_scale
+        self.penalty_radius = penalty_radius
+        self.rng = np.random.default_rng(seed)
+        self.feasibility = feasibility or FeasibilityModel(length_scale=length_scale)
+        self.spent: Dict[str, float] = {"low": 0.0, "high": 0.0}
+        self._low_outputs: Dict[str, Dict[str, float]] = {}
+        # promoted experiment id -> high-fidelity cost, charged when its run comes back
+        self._promoted: Dict[str, float] = {}
+
+    def _propose(
+        self,
+        *,
+        domain: str,
+        design_space: DesignSpace,
+        objectives: Sequence[ObjectiveSpec],
+        constraints: Sequence[ConstraintSpec],
+        history: Sequence[RunResult],
+        n: int = 1,
+        pending: Sequence[Dict[str, float]] = (),
+    ) -> List[ExperimentSpec]:
+        if self._promoted:
+            for r in history:
+                cost = self._promoted.pop(r.experiment_id, None)
+                if cost is not None:
+                    self.spent["high"] += cost
+
+        names = list(design_space.bounds.keys())
+        lo = np.array([design_space.bounds[k][0] for k in names], dtype=float)
+        span = np.array([design_space.bounds[k][1] for k in names], dtype=float) - lo
+        safe_span = np.where(span > 0, span, 1.0)
+
+        # prune predicted-infeasible points before paying for their screening
+        categorical = design_space.categorical_mask(names)
+        pool_u = _snap_unit(design_space, names, lo, span, self.rng.uniform(size=(self.screen_candidates, len(names))))
+        keep, p_feasible = _feasibility_filter(
+            self.feasibility, history, names, lo, span, constraints, pool_u, n, categorical
+        )
+        pool_u = pool_u[keep]
+
+        # screen: one low-fidelity evaluation per pool point, at valid parameter values
+        low = np.array(
+            [self._low_score(design_space.decode(dict(zip(names, lo + span * u))), objectives) for u in pool_u]
+        )
+        keep = np.isfinite(low)
+        pool_u, low = pool_u[keep], low[keep]
+        if p_feasible is not None:
+            p_feasible = p_feasible[keep]
+        if not len(low):
+            # cheap model could not score anything; fall back to the plain sweep
+            return BaselineGridPlanner()._propose(
+                domain=domain,
+                design_space=design_space,
+                objectives=objectives,
+                constraints=constraints,
+                history=history,
+                n=n,
+                pending=pending,
+            )
+
+        # fidelity model fitted on high-fidelity runs and their low-fidelity twins
+        ok = [r for r in history if r.status == "ok" and all(k in r.parameters for k in names)]
+        high_x = np.array([[float(r.parameters[k]) for k in names] for r in ok], dtype=float).reshape(len(ok), len(names))
+        high_y = np.array([ModelBasedPlanner._score_outputs(r.outputs, objectives) for r in ok], dtype=float)
+        twin = np.array(
+            [self._low_score(design_space.decode(r.parameters), objectives, key=r.experiment_id) for r in ok],
+            dtype=float,
+        )
+        usable = np.isfinite(twin)
+        high_x, high_y, twin = high_x[usable], high_y[usable], twin[usable]
+
+        rho = 1.0
+        if len(twin) >= 3 and float(twin @ twin) > 0:
+            rho = float(twin @ high_y) / float(twin @ twin)
+        gp = GaussianProcess(length_scale=self.length_scale, categorical=categorical)
+        if len(high_y):
+            gp.fit((high_x - lo) / safe_span, high_y - rho * twin)
+        delta_mean, delta_var = gp.predict(pool_u)
+        mean = rho * low + (delta_mean if len(high_y) else 0.0)
+        std = np.sqrt(delta_var) if len(high_y) else np.ones(len(low))
+        best = float(high_y.max()) if len(high_y) else float(mean.max())
+        values = expected_improvement(mean, std, best)
+        if p_feasible is not None:
+            values = values * p_feasible
+
+        # batch via local penalization, seeded with in-flight points
+        penalty = np.ones(len(values))
+        for p in pending:
+            center = (np.array([float(p.get(k, np.nan)) for k in names]) - lo) / safe_span
+            penalty *= _local_penalty(pool_u, center, self.penalty_radius)
+        picked: List[int] = []
+        while len(picked) < min(n, len(values)):
+            effective = (values - values.min() + 1e-12) * penalty
+            effective[picked] = -np.inf
+            i = int(np.argmax(effective))
+            picked.append(i)
+            penalty *= _local_penalty(pool_u, pool_u[i], self.penalty_radius)
+
+        offset = len(history) + len(pending)
+        out = []
+        for j, i in enumerate(picked, start=1):
+            x = lo + span * pool_u[i]
+            out.append(
+                ExperimentSpec(
+                    experiment_id=f"{domain}-mf-{offset+j}",
+                    domain=domain,
+                    parameters={k: float(v) for k, v in zip(names, x)},
+                    objectives=list(objectives),
+                    constraints=list(constraints),
+                    metadata={
+                        "planner": "multi_fidelity",
+                        "fidelity": "high",
+                        "low_fidelity_score": f"{low[i]:.6g}",
+                        "predicted_score": f"{mean[i]:.6g}",
+                        "cost": f"{self.costs['high']:g}",
+                        **_feasibility_metadata(p_feasible, i),
+                    },
+                )
+            )
+            self._promoted[out[-1].experiment_id] = self.costs["high"]
+        return out
+
+    def _low_score(self, params: Dict[str, float], objectives: Sequence[ObjectiveSpec], key: str | None = None) -> float:
+        outputs = self._low_outputs.get(key) if key is not None else None
+        if outputs is None:
+            self.spent["low"] += self.costs["low"]
+            try:
+                raw = self.low_fidelity(dict(params))
+                outputs = dict(getattr(raw, "outputs", raw))
+            except Exception:
+                outputs = {}
+            if key is not None:
+                self._low_outputs[key] = outputs
+        if not outputs or any(o.name not in outputs for o in objectives):
+            return float("nan")
+        return ModelBasedPlanner._score_outputs(outputs, objectives)
+
+
+@dataclass
+class _OptunaStudyState:
+    study: object
+    told: set
+    pending: Dict[str, int]
+    rows: int = 0
+    last_id: str | None = None
 
 
 class OptunaTPEPlanner(ExperimentPlanner):
     """Optional Optuna-backed planner.
 
+    Keeps one long-lived study per domain. Each propose() call only tells the
+    study about runs it has not seen yet and asks it for all `n` candidates;
+    asked trials stay running (TPE constant liar) until their run comes back.
+    With `storage_dir` set, studies live in `{domain}_optuna.db` SQLite files
+    there and survive restarts.
+
     If Optuna isn't installed, transparently falls back to ModelBasedPlanner.
     """
 
-    def __init__(self, seed: int = 7, startup_trials: int = 8):
+    def __init__(self, seed: int = 7, startup_trials: int = 8, storage_dir: str | Path | None = None):
         self.seed = seed
         self.startup_trials = startup_trials
+        self.storage_dir = Path(storage_dir) if storage_dir is not None else None
         self._fallback = ModelBasedPlanner(seed=seed, acquisition="ei")
+        self._studies: Dict[str, _OptunaStudyState] = {}
 
     def propose(
         self,
@@ -232,10 +1712,10 @@ class OptunaTPEPlanner(ExperimentPlanner):
         constraints: Sequence[ConstraintSpec],
         history: Sequence[RunResult],
         n: int = 1,
+        pending: Sequence[Dict[str, float]] = (),
     ) -> List[ExperimentSpec]:
         try:
             import optuna  # type: ignore
-            sampler = optuna.samplers.TPESampler(seed=self.seed, n_startup_trials=self.startup_trials)
         except Exception:
             specs = self._fallback.propose(
                 domain=domain,
@@ -244,33 +1724,36 @@ class OptunaTPEPlanner(ExperimentPlanner):
                 constraints=constraints,
                 history=history,
                 n=n,
+                pending=pending,
             )
             for s in specs:
                 s.metadata["planner"] = "optuna_tpe_fallback"
             return specs
 
+        state = self._study_state(optuna, domain)
+        self._tell_new_runs(optuna, state, design_space, history)
+
+        # TPE has no fantasy mechanism for external pending points; its own
+        # asked-but-unfinished trials are covered by the constant liar.
         specs: List[ExperimentSpec] = []
-        history_count = len(history)
+        history_count = len(history) + len(pending)
         for i in range(n):
-            study = optuna.create_study(direction="maximize", sampler=sampler)
+            experiment_id = f"{domain}-optuna-{history_count+i+1}"
+            stale = state.pending.pop(experiment_id, None)
+            if stale is not None:
+                # an earlier suggestion under this id never produced a run
+                state.study.tell(stale, state=optuna.trial.TrialState.FAIL)
 
-            # replay history into study as completed trials (approximation)
-            for r in history:
-                if r.status != "ok" or r.score is None:
-                    continue
-                trial = study.ask()
-                for k, v in r.parameters.items():
-                    trial.suggest_float(k, *design_space.bounds[k])
-                study.tell(trial, float(r.score))
-
-            trial = study.ask()
+            trial = state.study.ask()
             params = {
-                name: trial.suggest_float(name, lo, hi)
-                for name, (lo, hi) in design_space.bounds.items()
+                name: self._suggest(optuna, trial, name, dist)
+                for name, dist in self._distributions(optuna, design_space).items()
             }
+            trial.set_user_attr("experiment_id", experiment_id)
+            state.pending[experiment_id] = trial.number
             specs.append(
                 ExperimentSpec(
-                    experiment_id=f"{domain}-optuna-{history_count+i+1}",
+                    experiment_id=experiment_id,
                     domain=domain,
                     parameters=params,
                     objectives=list(objectives),
@@ -280,3 +1763,118 @@ class OptunaTPEPlanner(ExperimentPlanner):
             )
 
         return specs
+
+    def _study_state(self, optuna, domain: str) -> _OptunaStudyState:
+        state = self._studies.get(domain)
+        if state is not None:
+            return state
+
+        storage = None
+        if self.storage_dir is not None:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            storage = f"sqlite:///{(self.storage_dir / f'{domain}_optuna.db').as_posix()}"
+        study = optuna.create_study(
+            study_name=domain,
+            storage=storage,
+            load_if_exists=True,
+            direction="maximize",
+            sampler=optuna.samplers.TPESampler(
+                seed=self.seed,
+                n_startup_trials=self.startup_trials,
+                constant_liar=True,
+            ),
+        )
+
+        told, pending = set(), {}
+        for t in study.get_trials(deepcopy=False):
+            eid = t.user_attrs.get("experiment_id")
+            if eid is None:
+                continue
+            if t.state == optuna.trial.TrialState.RUNNING:
+                pending[eid] = t.number
+            else:
+                told.add(eid)
+
+        state = _OptunaStudyState(study=study, told=told, pending=pending)
+        self._studies[domain] = state
+        return state
+
+    @staticmethod
+    def _distributions(optuna, design_space: DesignSpace) -> Dict[str, object]:
+        """Native Optuna distribution per parameter, so TPE models ints, logs and categories directly."""
+        out: Dict[str, object] = {}
+        for name, (lo, hi) in design_space.bounds.items():
+            dim = design_space.dimensions.get(name)
+            if dim is None:
+                out[name] = optuna.distributions.FloatDistribution(lo, hi)
+            elif dim.kind == "categorical":
+                out[name] = optuna.distributions.CategoricalDistribution(list(dim.choices))
+            elif dim.kind == "int":
+                out[name] = optuna.distributions.IntDistribution(int(dim.low), int(dim.high), log=dim.log)
+            else:
+                out[name] = optuna.distributions.FloatDistribution(dim.low, dim.high, log=dim.log)
+        return out
+
+    @staticmethod
+    def _suggest(optuna, trial, name: str, dist) -> object:
+        if isinstance(dist, optuna.distributions.CategoricalDistribution):
+            return trial.suggest_categorical(name, dist.choices)
+        if isinstance(dist, optuna.distributions.IntDistribution):
+            return trial.suggest_int(name, dist.low, dist.high, log=dist.log)
+        return trial.suggest_float(name, dist.low, dist.high, log=dist.log)
+
+    @staticmethod
+    def _tell_new_runs(optuna, state: _OptunaStudyState, design_space: DesignSpace, history: Sequence[RunResult]) -> None:
+        # resume after the last seen row while the history is append-only, else rescan
+        start = state.rows
+        if start > len(history) or (start > 0 and history[start - 1].experiment_id != state.last_id):
+            start = 0
+
+        distributions = OptunaTPEPlanner._distributions(optuna, design_space)
+        for r in history[start:]:
+            if r.experiment_id in state.told:
+                continue
+            number = state.pending.pop(r.experiment_id, None)
+            ok = r.status == "ok" and r.score is not None
+            if number is not None:
+                if ok:
+                    state.study.tell(number, float(r.score))
+                else:
+                    state.study.tell(number, state=optuna.trial.TrialState.FAIL)
+                state.told.add(r.experiment_id)
+                continue
+            if not ok:
+                continue
+
+            try:
+                params = {
+                    k: OptunaTPEPlanner._replay_value(optuna, distributions[k], v)
+                    for k, v in r.parameters.items()
+                    if k in distributions
+                }
+                trial = optuna.trial.create_trial(
+                    params=params,
+                    distributions={k: distributions[k] for k in params},
+                    value=float(r.score),
+                    user_attrs={"experiment_id": r.experiment_id},
+                )
+            except (TypeError, ValueError):
+                # run lies outside the current bounds or has an unknown choice
+                continue
+            state.study.add_trial(trial)
+            state.told.add(r.experiment_id)
+
+        if history:
+            state.rows = len(history)
+            state.last_id = history[-1].experiment_id
+
+    @staticmethod
+    def _replay_value(optuna, dist, value: object) -> object:
+        if isinstance(dist, optuna.distributions.CategoricalDistribution):
+            return value
+        if isinstance(dist, optuna.distributions.IntDistribution):
+            v = float(value)  # type: ignore[arg-type]
+            if v != round(v):
+                raise ValueError(f"{value!r} is not an integer")
+            return int(round(v))
+        return float(value)  # type: ignore[arg-type]
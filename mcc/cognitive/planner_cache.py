@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+from .memory import Fingerprint
+from .planner import ExperimentPlanner
+
+
+@dataclass
+class _CacheEntry:
+    planner: ExperimentPlanner
+    fingerprint: Fingerprint
+    stored_at: float
+    pinned: bool = False
+
+
+class PlannerCache:
+    """LRU + TTL cache of fitted planners, keyed by (domain, planner config).
+
+    Each entry remembers the memory fingerprint it was last used with. A lookup
+    only hits while the history is that same file plus appended rows; the
+    planners then sync their packed history and surrogate incrementally. A
+    rewritten or truncated history, an entry left unused for `ttl_seconds`,
+    or more than `max_entries` live planners all drop entries. Pinned entries
+    (planners whose state cannot be rebuilt from the history) ignore the TTL
+    and have their own LRU budget of `max_pinned`, so one stateful planner per
+    domain survives idle periods without the cache growing without bound.
+
+    `get` checks the planner out and `put` returns it, so concurrent requests
+    for one key never share a planner: the second one misses and builds its own.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        ttl_seconds: float = 900.0,
+        max_pinned: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_pinned = max_pinned
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, extends: Callable[[Fingerprint], bool]) -> Optional[ExperimentPlanner]:
+        """Check out the cached planner for `key` if fresh and `extends(its fingerprint)` holds."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and (
+                (not entry.pinned and self.clock() - entry.stored_at > self.ttl_seconds)
+                or not extends(entry.fingerprint)
+            ):
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.planner
+
+    def put(self, key: Hashable, planner: ExperimentPlanner, fingerprint: Fingerprint, pinned: bool = False) -> None:
+        """Return a planner after use; `pinned` exempts it from the TTL and counts it against `max_pinned`."""
+        with self._lock:
+            self._entries[key] = _CacheEntry(planner=planner, fingerprint=fingerprint, stored_at=self.clock(), pinned=pinned)
+            self._entries.move_to_end(key)
+            for kind, limit in ((False, self.max_entries), (True, self.max_pinned)):
+                keys = [k for k, e in self._entries.items() if e.pinned is kind]
+                for k in keys[: max(0, len(keys) - limit)]:
+                    del self._entries[k]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
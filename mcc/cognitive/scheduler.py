@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Literal, Optional, Sequence
+
+from .adapters import RunningSimulation
+from .schema import GoalDirection
+
+TrialState = Literal["waiting", "running", "completed", "stopped", "failed"]
+
+
+@dataclass
+class _Trial:
+    job_id: str
+    bracket: int
+    running: Optional[RunningSimulation] = None
+    state: TrialState = "waiting"
+    rung: int = 0
+    resource: float = 0.0
+    value: Optional[float] = None
+    recorded: Dict[int, float] = field(default_factory=dict)
+    result: Dict[str, object] = field(default_factory=dict)
+
+
+class SuccessiveHalvingScheduler:
+    """Asynchronous successive halving (ASHA) over streaming solver jobs, with Hyperband brackets.
+
+    Up to `max_parallel` jobs run at once through
+    `CognitiveSimulationService.launch_job`. Every `poll_interval` seconds the
+    scheduler reads their streamed metrics: `resource` names the metric that
+    measures progress (e.g. "time_last" or "iteration_last"; None means
+    wall-clock seconds) and `metric` the one being ranked, in `direction`.
+
+    Bracket b has rungs at min_resource * eta**(b + k) below `max_resource`.
+    When a job passes a rung, its current metric value is recorded there and
+    the job continues only while it ranks within the top max(1, n // eta) of
+    the n values recorded at that rung so far; jobs are never stopped before
+    `min_peers` (default: eta) values exist at the rung. Because the first
+    jobs to reach a rung have nobody to lose against, a running job is also
+    stopped once later arrivals push its value at its latest rung out of the
+    top fraction. Stopped jobs free
+    their slot for the next waiting job, so solver time flows to the
+    candidates that keep ranking near the top. With `brackets` > 1, jobs are
+    dealt round-robin to brackets whose first rung starts later (Hyperband),
+    hedging against metrics that only become informative late in a run.
+
+    Backends without a launch command are run to completion with `run_job`.
+    """
+
+    def __init__(
+        self,
+        service,
+        *,
+        metric: str,
+        direction: GoalDirection = "minimize",
+        resource: Optional[str] = None,
+        min_resource: float = 1.0,
+        max_resource: float = float("inf"),
+        eta: int = 3,
+        brackets: int = 1,
+        max_parallel: int = 4,
+        min_peers: Optional[int] = None,
+        poll_interval: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        self.service = service
+        self.metric = metric
+        self.direction = direction
+        self.resource = resource
+        self.min_resource = min_resource
+        self.max_resource = max_resource
+        self.eta = eta
+        self.brackets = max(1, brackets)
+        self.max_parallel = max(1, max_parallel)
+        self.min_peers = eta if min_peers is None else min_peers
+        self.poll_interval = poll_interval
+        self.sleep = sleep
+        # recorded metric values per (bracket, rung), in the maximization sense
+        self.rungs: Dict[tuple[int, int], List[float]] = {}
+
+    def rung_levels(self, bracket: int) -> List[float]:
+        levels: List[float] = []
+        level = self.min_resource * self.eta**bracket
+        while level < self.max_resource and len(levels) < 64:
+            levels.append(level)
+            level *= self.eta
+        return levels
+
+    def run(self, job_ids: Sequence[str]) -> Dict[str, Dict[str, object]]:
+        """Run the jobs to completion or early stop; per-job state, resource used and last metric value."""
+        trials = [_Trial(job_id=j, bracket=i % self.brackets) for i, j in enumerate(job_ids)]
+        try:
+            while True:
+                self._start_waiting(trials)
+                running = [t for t in trials if t.state == "running"]
+                if not running:
+                    break
+                for trial in running:
+                    self._step(trial)
+                if any(t.state == "running" for t in trials):
+                    self.sleep(self.poll_interval)
+        finally:
+            # solvers run in their own session, so nothing else reaps them if the loop dies
+            for trial in trials:
+                if trial.state == "running" and trial.running is not None:
+                    trial.running.kill()
+
+        return {
+            t.job_id: {
+                "state": t.state,
+                "bracket": t.bracket,
+                "rung": t.rung,
+                "resource": t.resource,
+                "value": t.value,
+                "result": t.result,
+            }
+            for t in trials
+        }
+
+    def _start_waiting(self, trials: List[_Trial]) -> None:
+        slots = self.max_parallel - sum(1 for t in trials if t.state == "running")
+        for trial in trials:
+            if slots <= 0:
+                return
+            if trial.state != "waiting":
+                continue
+            trial.running = self.service.launch_job(trial.job_id)
+            if trial.running is None:
+                trial.result = self.service.run_job(trial.job_id)
+                trial.state = "completed" if trial.result.get("status") == "completed" else "failed"
+                continue
+            trial.state = "running"
+            slots -= 1
+
+    def _step(self, trial: _Trial) -> None:
+        running = trial.running
+        assert running is not None
+        exited = running.poll() is not None
+        metrics = running.poll_metrics()
+        trial.resource = float(metrics.get(self.resource, 0.0)) if self.resource else running.elapsed
+        if self.metric in metrics:
+            trial.value = float(metrics[self.metric])
+
+        if exited:
+            trial.result = self.service.finish_launched_job(trial.job_id, running)
+            trial.state = "completed" if trial.result.get("status") == "completed" else "failed"
+            return
+
+        levels = self.rung_levels(trial.bracket)
+        if trial.recorded:
+            rung = max(trial.recorded)
+            if not self._in_top(trial.bracket, rung, trial.recorded[rung]):
+                self._stop(trial, levels[rung], overtaken=True)
+                return
+        while trial.rung < len(levels) and trial.resource >= levels[trial.rung]:
+            if trial.value is not None:
+                value = trial.value if self.direction == "maximize" else -trial.value
+                trial.recorded[trial.rung] = value
+                self.rungs.setdefault((trial.bracket, trial.rung), []).append(value)
+                if not self._in_top(trial.bracket, trial.rung, value):
+                    self._stop(trial, levels[trial.rung])
+                    return
+            # without a value yet the job is simply judged at its next rung
+            trial.rung += 1
+
+    def _in_top(self, bracket: int, rung: int, value: float) -> bool:
+        recorded = self.rungs.get((bracket, rung), [])
+        if len(recorded) < self.min_peers:
+            return True
+        keep = max(1, len(recorded) // self.eta)
+        return sum(1 for v in recorded if v > value) < keep
+
+    def _stop(self, trial: _Trial, level: float, overtaken: bool = False) -> None:
+        where = f"{self.resource or 'seconds'}={level:g}"
+        reason = f"{self.metric}={trial.value:.6g} {'overtaken ' if overtaken else ''}at {where}"
+        assert trial.running is not None
+        trial.result = self.service.finish_launched_job(trial.job_id, trial.running, stop_reason=reason)
+        trial.state = "stopped"
@@ -1,32 +1,70 @@
 from __future__ import annotations
 
+import json
 import os
 import shutil
+import threading
 import uuid
 from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+from ..core.energy_balance_domain import EnergyBalanceDomain
+from ..core.mass_balance_domain import MassBalanceDomain
+from ..core.reaction_stoichiometry_domain import ReactionStoichiometryDomain
 from .adapters import (
     CodeSaturneAdapter,
     LAMMPSAdapter,
     OpenFOAMAdapter,
     QuantumEspressoAdapter,
+    RunningSimulation,
     SU2Adapter,
     SimulationAdapter,
     SimulationJob,
     SimulationResult,
 )
+from .domain_bridge import DomainSimulationBridge
 from .engine import CognitiveEngine
 from .job_store import JobStore
-from .memory import CognitiveMemoryStore
-from .planner import BaselineGridPlanner, DesignSpace, ModelBasedPlanner, OptunaTPEPlanner
-from .schema import ConstraintSpec, ObjectiveSpec
+from .memory import MEMORY_SUFFIXES, MemoryStore, open_memory
+from .planner import (
+    BaselineGridPlanner,
+    DesignSpace,
+    ExpectedHypervolumePlanner,
+    GaussianProcessPlanner,
+    ModelBasedPlanner,
+    MultiFidelityPlanner,
+    OptunaTPEPlanner,
+    TrustRegionPlanner,
+)
+from .planner_cache import PlannerCache
+from .schema import ConstraintSpec, ObjectiveSpec, RunResult
+from .transfer import TransferPrior
+
+# cheap analytical domains usable as the low-fidelity screen for promotions
+LOW_FIDELITY_DOMAINS = {
+    "mass_balance": MassBalanceDomain,
+    "energy_balance": EnergyBalanceDomain,
+    "reaction_stoichiometry": ReactionStoichiometryDomain,
+}
+
+# planners holding state the memory cannot rebuild; their cache entries are pinned
+STATEFUL_PLANNERS = frozenset({"trust_region"})
 
 
 class CognitiveSimulationService:
-    def __init__(self, base_workdir: str):
+    def __init__(
+        self,
+        base_workdir: str,
+        planner_cache_size: int = 32,
+        planner_cache_ttl: float = 900.0,
+        planner_cache_pinned: int = 64,
+        memory_backend: str = "jsonl",
+    ):
+        if memory_backend not in MEMORY_SUFFIXES:
+            raise ValueError(f"Unsupported memory backend: {memory_backend}")
         self.base_workdir = Path(base_workdir)
+        self.memory_backend = memory_backend
         self.base_workdir.mkdir(parents=True, exist_ok=True)
 
         self._jobs: Dict[str, SimulationJob] = {}
@@ -40,6 +78,17 @@ class CognitiveSimulationService:
             "codesaturne": CodeSaturneAdapter(),
             "quantum_espresso": QuantumEspressoAdapter(),
         }
+        # fitted planners survive between suggestions while the domain memory only grows
+        self._planners = PlannerCache(
+            max_entries=planner_cache_size, ttl_seconds=planner_cache_ttl, max_pinned=planner_cache_pinned
+        )
+        # one store per domain, so JSONL memories keep their parsed-row cache between calls
+        self._memories: Dict[str, MemoryStore] = {}
+        # promotion planners live as long as the service: they hold the low-fidelity
+        # twins of promoted runs and the high-fidelity spend still to be charged
+        self._promoters: Dict[Tuple[str, str, str], MultiFidelityPlanner] = {}
+        # guards the memory and promoter dicts; planners are checked out per request
+        self._lock = threading.Lock()
 
     def create_job(self, backend: str, inputs: Dict[str, object]) -> Dict[str, object]:
         if backend not in self._adapters:
@@ -63,6 +112,54 @@ class CognitiveSimulationService:
         result = adapter.run(job)
         self._results[job_id] = result
         self._store.upsert_result(result)
+        if result.status == "completed":
+            self._record_experiment(job, result)
+        return asdict(result)
+
+    def launch_job(self, job_id: str) -> RunningSimulation | None:
+        """Start a job in the background with its log streamed to disk.
+
+        Returns None when the backend cannot be launched this way; use
+        `run_job` for those. Pair with `finish_launched_job`.
+        """
+        job = self._jobs.get(job_id) or self._store.get_job(job_id)
+        if not job:
+            raise KeyError(f"Job not found: {job_id}")
+
+        self._jobs[job_id] = job
+        running = self._adapters[job.backend].launch(job)
+        if running is not None and self._store.queue_state(job_id):
+            self._store.start_job(job_id)
+        return running
+
+    def finish_launched_job(
+        self, job_id: str, running: RunningSimulation, stop_reason: str | None = None
+    ) -> Dict[str, object]:
+        """Record the outcome of a launched job; with `stop_reason` the solver is killed first.
+
+        Stopped jobs keep their last streamed metrics, are marked "cancelled"
+        in the queue and land in the domain memory as failed runs noted
+        `early_stopped=...`.
+        """
+        job = running.job
+        if stop_reason is not None:
+            running.kill()
+            running.poll_metrics()
+            result = SimulationResult(
+                job_id=job_id,
+                status="failed",
+                metrics=dict(running.metrics),
+                error=f"stopped early: {stop_reason}",
+                logs=[running.log_tail()],
+            )
+        else:
+            result = self._adapters[job.backend].collect(running)
+        self._results[job_id] = result
+        self._store.upsert_result(result)
+        if self._store.queue_state(job_id):
+            state = "completed" if result.status == "completed" else "cancelled" if stop_reason else "dead"
+            self._store.finish_job(job_id, state, error=result.error)
+        self._record_experiment(job, result, notes=[f"early_stopped={stop_reason}"] if stop_reason else [])
         return asdict(result)
 
     def get_job(self, job_id: str) -> Dict[str, object]:
@@ -104,6 +201,7 @@ class CognitiveSimulationService:
                 return {"status": "requeued", "job_id": job_id, "result": result}
 
             self._store.finish_job(job_id, "dead", error=err)
+            self._record_experiment(self._jobs[job_id], self._results[job_id])
             return {"status": "dead", "job_id": job_id, "result": result}
         except Exception as e:
             err = str(e)
@@ -155,13 +253,29 @@ class CognitiveSimulationService:
         *,
         domain: str,
         planner: str,
-        design_space: Dict[str, List[float]],
+        design_space: Dict[str, object],
         objectives: List[Dict[str, object]],
         constraints: List[Dict[str, object]] | None = None,
         n: int = 1,
+        transfer_from: List[str] | None = None,
     ) -> List[Dict[str, object]]:
-        planner_obj = self._build_planner(planner)
-        memory_path = self.base_workdir / f"{domain}_service_memory.jsonl"
+        """Plan and run the next `n` experiments of a domain.
+
+        `transfer_from` names related domains whose memories warm-start the
+        surrogate (gaussian_process planner only).
+        """
+        related = tuple(d for d in (transfer_from or ()) if d != domain)
+        if related and planner != "gaussian_process":
+            raise ValueError(f"Transfer warm start is not supported by planner: {planner}")
+        memory = self._memory(domain)
+        key = (domain, planner, related) if related else (domain, planner)
+        planner_obj = self._planners.get(key, memory.extends)
+        if planner_obj is None:
+            planner_obj = self._build_planner(planner)
+            if related:
+                planner_obj.transfer = TransferPrior.from_memory(
+                    self.base_workdir, related, backend=self.memory_backend
+                )
 
         # Placeholder simulator for API path; domain-specific engine can be plugged later
         def sim(params: Dict[str, float]) -> Dict[str, float]:
@@ -175,22 +289,149 @@ class CognitiveSimulationService:
         engine = CognitiveEngine(
             domain=domain,
             planner=planner_obj,
-            memory=CognitiveMemoryStore(path=memory_path),
+            memory=memory,
             simulator=sim,
         )
 
         obj_specs = [ObjectiveSpec(**o) for o in objectives]
         c_specs = [ConstraintSpec(**c) for c in (constraints or [])]
-        ds = DesignSpace(bounds={k: (float(v[0]), float(v[1])) for k, v in design_space.items()})
+        ds = DesignSpace.from_spec(design_space)
 
         runs = engine.run_iteration(
             design_space=ds,
             objectives=obj_specs,
             constraints=c_specs,
             n=n,
+            pending=self.pending_points(domain, list(ds.bounds.keys())),
         )
+        self._planners.put(key, planner_obj, memory.fingerprint(), pinned=planner in STATEFUL_PLANNERS)
         return [asdict(r) for r in runs]
 
+    def promote_experiments(
+        self,
+        *,
+        domain: str,
+        backend: str,
+        low_fidelity_domain: str,
+        design_space: Dict[str, object],
+        objectives: List[Dict[str, object]],
+        constraints: List[Dict[str, object]] | None = None,
+        fixed_parameters: Dict[str, float] | None = None,
+        costs: Dict[str, float] | None = None,
+        n: int = 1,
+    ) -> Dict[str, object]:
+        """Screen with a cheap mcc.core domain, then queue the best points on a solver backend.
+
+        Queued jobs carry the experiment id, parameters, objectives and
+        constraints, so their metrics land in the domain memory once they finish.
+        One planner per domain, screen and setup is kept, so "spent" is cumulative:
+        screening as it happens, promoted runs once they are back in memory.
+        """
+        if backend not in self._adapters:
+            raise ValueError(f"Unsupported backend: {backend}")
+        if low_fidelity_domain not in LOW_FIDELITY_DOMAINS:
+            raise ValueError(f"Unsupported low-fidelity domain: {low_fidelity_domain}")
+
+        fixed = dict(fixed_parameters or {})
+        key = (domain, low_fidelity_domain, json.dumps([fixed, costs or {}], sort_keys=True))
+        with self._lock:
+            planner = self._promoters.pop(key, None)
+        if planner is None:
+            bridge = DomainSimulationBridge(LOW_FIDELITY_DOMAINS[low_fidelity_domain]())
+            planner = MultiFidelityPlanner(low_fidelity=lambda p: bridge.simulate({**fixed, **p}), costs=costs)
+
+        ds = DesignSpace.from_spec(design_space)
+        specs = planner.propose(
+            domain=domain,
+            design_space=ds,
+            objectives=[ObjectiveSpec(**o) for o in objectives],
+            constraints=[ConstraintSpec(**c) for c in (constraints or [])],
+            history=self._memory(domain).load_frame(),
+            n=n,
+            pending=self.pending_points(domain, list(ds.bounds.keys())),
+        )
+
+        with self._lock:
+            self._promoters[key] = planner
+        promoted = []
+        for spec in specs:
+            job = self.create_job(
+                backend,
+                {
+                    "domain": domain,
+                    "experiment_id": spec.experiment_id,
+                    "parameters": {**fixed, **spec.parameters},
+                    "objectives": objectives,
+                    "constraints": constraints or [],
+                },
+            )
+            self.enqueue_job(job["job_id"])
+            promoted.append(
+                {
+                    "job_id": job["job_id"],
+                    "experiment_id": spec.experiment_id,
+                    "parameters": spec.parameters,
+                    "metadata": spec.metadata,
+                }
+            )
+        return {"promoted": promoted, "spent": dict(planner.spent)}
+
+    def _record_experiment(self, job: SimulationJob, result: SimulationResult, notes: List[str] | None = None) -> None:
+        """Append the outcome of a planner-created job to its domain memory."""
+        domain = job.inputs.get("domain")
+        experiment_id = job.inputs.get("experiment_id")
+        if not domain or not experiment_id:
+            return
+
+        objectives = [ObjectiveSpec(**o) for o in job.inputs.get("objectives", [])]
+        constraints = [ConstraintSpec(**c) for c in job.inputs.get("constraints", [])]
+        status, score = "failed", None
+        if result.status == "completed":
+            status = CognitiveEngine._check_constraints(result.metrics, constraints)
+            if status == "ok":
+                score = CognitiveEngine._score(result.metrics, objectives)
+
+        self._memory(str(domain)).append(
+            RunResult(
+                experiment_id=str(experiment_id),
+                status=status,
+                parameters={k: _parameter_value(v) for k, v in dict(job.inputs.get("parameters", {})).items()},
+                outputs=dict(result.metrics),
+                score=score,
+                notes=[f"backend={job.backend}", f"job_id={job.job_id}", *(notes or [])],
+            )
+        )
+
+    def _memory_path(self, domain: str) -> Path:
+        return self.base_workdir / f"{domain}_service_memory{MEMORY_SUFFIXES[self.memory_backend]}"
+
+    def _memory(self, domain: str) -> MemoryStore:
+        with self._lock:
+            if domain not in self._memories:
+                self._memories[domain] = open_memory(self._memory_path(domain))
+            return self._memories[domain]
+
+    def pending_points(self, domain: str, names: List[str]) -> List[Dict[str, object]]:
+        """Parameter points of queued/running jobs that cover the given design names.
+
+        Job inputs may carry the point under "parameters" or at top level; only
+        jobs tagged with this "domain" (inputs or metadata) count, so untagged
+        jobs never steer another domain's proposals.
+        """
+        points: List[Dict[str, object]] = []
+        for job in self._store.jobs_in_queue_states(("queued", "running")):
+            tagged = job.metadata.get("domain") or job.inputs.get("domain")
+            if tagged != domain:
+                continue
+            params = job.inputs.get("parameters", job.inputs)
+            if not isinstance(params, dict):
+                continue
+            try:
+                points.append({k: _parameter_value(params[k]) for k in names})
+            except (KeyError, TypeError, ValueError):
+                continue
+        return points
+
     def backend_health(self) -> Dict[str, object]:
         return {
             "openfoam": {
@@ -215,12 +456,30 @@ class CognitiveSimulationService:
             },
         }
 
-    @staticmethod
-    def _build_planner(name: str):
+    def _build_planner(self, name: str):
         if name == "baseline":
             return BaselineGridPlanner()
         if name == "model_based":
-            return ModelBasedPlanner(acquisition="ei")
+            # planner defaults; a wider pool, local polish and workers are opt-in through
+            # MCC_PLANNER_RANDOM_CANDIDATES, MCC_PLANNER_REFINE_STARTS and MCC_PLANNER_WORKERS
+            tuning = {
+                key: int(os.environ[f"MCC_PLANNER_{key.upper()}"])
+                for key in ("random_candidates", "refine_starts", "workers")
+                if os.environ.get(f"MCC_PLANNER_{key.upper()}")
+            }
+            return ModelBasedPlanner(acquisition="ei", **tuning)
+        if name == "gaussian_process":
+            return GaussianProcessPlanner(acquisition="ei")
+        if name == "ehvi":
+            return ExpectedHypervolumePlanner()
+        if name == "trust_region":
+            return TrustRegionPlanner()
         if name == "optuna_tpe":
-            return OptunaTPEPlanner()
+            # studies persist in SQLite, so a rebuilt planner resumes them
+            return OptunaTPEPlanner(storage_dir=self.base_workdir)
         raise ValueError(f"Unsupported planner: {name}")
+
+
+def _parameter_value(value: object) -> object:
+    """Numbers as floats; strings pass through as categorical choices."""
+    return value if isinstance(value, str) else float(value)  # type: ignore[arg-type]
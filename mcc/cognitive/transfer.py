@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+from .gp import GaussianProcess
+from .memory import MEMORY_SUFFIXES, open_memory
+from .schema import ObjectiveSpec, RunResult
+
+if TYPE_CHECKING:
+    from .planner import DesignSpace
+
+
+class TransferPrior:
+    """Warm start a GP surrogate with runs from related domains.
+
+    Source runs are mapped onto the target design by parameter name: shared
+    parameters are copied, target parameters a source never varied sit at the
+    centre of the box, and source-only parameters are dropped. Only "ok" runs
+    that report every target objective are used.
+
+    Each source gets a similarity weight w in [0, 1]. A GP fitted to the
+    source alone predicts the target's observed runs; the Spearman rank
+    correlation of those predictions with the observed scores (negative counts
+    as 0) is blended with `prior_similarity` as min(1, n / `shrinkage`)
+    moves from prior to evidence over the first target runs, and is scaled by
+    the fraction of target parameters the source shares. Sources below
+    `min_similarity` are left out. The rest join the target GP with their
+    scores standardized onto the target's scale and observation noise
+    inflated by (1 - w) / w, so a dissimilar task only nudges the surrogate
+    and target runs dominate wherever they exist.
+
+    Each source contributes its newest `max_points` runs; its packed rows and
+    fitted GP are cached until the design, objectives or kernel change. The
+    seeded GP keeps only the last `max_target_points` target rows, so its
+    refit stays bounded however long the target campaign runs.
+    """
+
+    def __init__(
+        self,
+        sources: Mapping[str, Sequence[RunResult]],
+        prior_similarity: float = 0.5,
+        min_similarity: float = 0.05,
+        shrinkage: int = 10,
+        max_points: int = 256,
+        max_target_points: int = 256,
+    ):
+        self.sources = {name: list(runs) for name, runs in sources.items()}
+        self.prior_similarity = prior_similarity
+        self.min_similarity = min_similarity
+        self.shrinkage = shrinkage
+        self.max_points = max_points
+        self.max_target_points = max_target_points
+        self.similarity: Dict[str, float] = {}
+        self._packed: Dict[str, tuple] = {}
+        self._models: Dict[str, tuple] = {}
+
+    @classmethod
+    def from_memory(
+        cls, base_workdir: str | Path, domains: Iterable[str], backend: str = "jsonl", **kwargs
+    ) -> "TransferPrior":
+        """Load the `{domain}_service_memory` store of each related domain under `base_workdir`."""
+        base = Path(base_workdir)
+        suffix = MEMORY_SUFFIXES[backend]
+        sources = {d: open_memory(base / f"{d}_service_memory{suffix}").load_all() for d in domains}
+        return cls(sources, **kwargs)
+
+    def seed(
+        self,
+        gp: GaussianProcess,
+        design_space: "DesignSpace",
+        names: Sequence[str],
+        objectives: Sequence[ObjectiveSpec],
+    ) -> GaussianProcess:
+        """A copy of the target `gp` (unit-box inputs) with weighted source runs added.
+
+        Returns `gp` itself when no source passes the similarity floor.
+        """
+        lo = np.array([design_space.bounds[k][0] for k in names], dtype=float)
+        span = np.array([design_space.bounds[k][1] for k in names], dtype=float) - lo
+        target_x, target_y = gp.x.reshape(len(gp), len(names)), gp.y
+        if len(target_y) >= 2 and target_y.std() > 0:
+            center, scale = float(target_y.mean()), float(target_y.std())
+        else:
+            center, scale = (float(target_y.mean()) if len(target_y) else 0.0), 1.0
+
+        xs: List[np.ndarray] = []
+        ys: List[np.ndarray] = []
+        noise: List[np.ndarray] = []
+        self.similarity = {}
+        for name in self.sources:
+            x, z, coverage = self._source_rows(name, design_space, names, lo, span, objectives)
+            if not len(z):
+                continue
+            source_gp = self._source_model(name, x, z, gp)
+            w = self._similarity(source_gp, target_x, target_y) * coverage
+            self.similarity[name] = w
+            if w < self.min_similarity:
+                continue
+            xs.append(x)
+            ys.append(center + scale * z)
+            noise.append(np.full(len(z), gp.noise + (1.0 - w) / w))
+
+        if not xs:
+            return gp
+        keep = slice(max(0, len(target_y) - self.max_target_points), None)
+        seeded = GaussianProcess(
+            length_scale=gp.length_scale,
+            signal_variance=gp.signal_variance,
+            noise=gp.noise,
+            categorical=gp.categorical,
+        )
+        return seeded.fit(
+            np.vstack(xs + [target_x[keep]]),
+            np.concatenate(ys + [target_y[keep]]),
+            np.concatenate(noise + [gp._noise[keep]]),
+        )
+
+    def _source_model(self, name: str, x: np.ndarray, z: np.ndarray, gp: GaussianProcess) -> GaussianProcess:
+        """GP fitted to one source's packed rows, reused while rows and kernel are unchanged."""
+        key = (gp.length_scale, gp.noise, None if gp.categorical is None else tuple(gp.categorical))
+        cached = self._models.get(name)
+        if cached is not None and cached[0] == key and cached[1] is x:
+            return cached[2]
+        source_gp = GaussianProcess(length_scale=gp.length_scale, noise=gp.noise, categorical=gp.categorical)
+        source_gp.fit(x, z)
+        self._models[name] = (key, x, source_gp)
+        return source_gp
+
+    def _similarity(self, source_gp: GaussianProcess, target_x: np.ndarray, target_y: np.ndarray) -> float:
+        n = len(target_y)
+        if n < 3:
+            return self.prior_similarity
+        predicted, _ = source_gp.predict(target_x)
+        rho = max(0.0, _rank_correlation(predicted, target_y))
+        evidence = min(1.0, n / max(1, self.shrinkage))
+        return (1.0 - evidence) * self.prior_similarity + evidence * rho
+
+    def _source_rows(
+        self,
+        name: str,
+        design_space: "DesignSpace",
+        names: Sequence[str],
+        lo: np.ndarray,
+        span: np.ndarray,
+        objectives: Sequence[ObjectiveSpec],
+    ) -> tuple[np.ndarray, np.ndarray, float]:
+        """Unit-box inputs and standardized scores of the newest usable source runs."""
+        key = (tuple(names), tuple(lo), tuple(span), tuple((o.name, o.direction, float(o.weight)) for o in objectives))
+        cached = self._packed.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        runs = [
+            r
+            for r in design_space.encode_runs(self.sources[name])
+            if r.status == "ok" and all(o.name in r.outputs for o in objectives)
+        ][-self.max_points:]
+        shared = [k for k in names if any(k in r.parameters for r in runs)]
+        safe_span = np.where(span > 0, span, 1.0)
+        x = np.array([[float(r.parameters.get(k, np.nan)) for k in names] for r in runs], dtype=float)
+        x = x.reshape(len(runs), len(names))
+        # runs outside the target box keep their (extrapolated) unit coordinates
+        x = np.where(np.isnan(x), 0.5, (x - lo) / safe_span)
+        sign = {o.name: (1.0 if o.direction == "maximize" else -1.0) * o.weight for o in objectives}
+        scores = np.array([sum(w * float(r.outputs[k]) for k, w in sign.items()) for r in runs], dtype=float)
+        if len(scores) >= 2 and scores.std() > 0:
+            scores = (scores - scores.mean()) / scores.std()
+        else:
+            scores = scores - scores.mean() if len(scores) else scores
+        result = (x, scores, len(shared) / max(1, len(names)))
+        self._packed[name] = (key, result)
+        return result
+
+
+def _rank_correlation(a: np.ndarray, b: np.ndarray) -> float:
+    """Spearman correlation (ties broken by order); 0 when either side is constant."""
+    ra = np.argsort(np.argsort(a, kind="stable"), kind="stable").astype(float)
+    rb = np.argsort(np.argsort(b, kind="stable"), kind="stable").astype(float)
+    if np.ptp(a) == 0 or np.ptp(b) == 0:
+        return 0.0
+    ra -= ra.mean()
+    rb -= rb.mean()
+    return float(ra @ rb / np.sqrt((ra @ ra) * (rb @ rb)))
@@ -8,8 +8,8 @@ from pathlib import Path
 from .service import CognitiveSimulationService
 
 
-def run_worker(base_workdir: str, interval_seconds: float = 2.0, once: bool = False):
-    svc = CognitiveSimulationService(base_workdir=base_workdir)
+def run_worker(base_workdir: str, interval_seconds: float = 2.0, once: bool = False, memory_backend: str = "jsonl"):
+    svc = CognitiveSimulationService(base_workdir=base_workdir, memory_backend=memory_backend)
 
     if once:
         out = svc.run_next_queued()
@@ -29,9 +29,19 @@ def main():
     parser.add_argument("--workdir", default=os.environ.get("P1_WORKDIR", str(Path(__file__).resolve().parents[2] / "sim_jobs")))
     parser.add_argument("--interval", type=float, default=2.0)
     parser.add_argument("--once", action="store_true")
+    parser.add_argument(
+        "--memory-backend",
+        choices=["jsonl", "sqlite"],
+        default=os.environ.get("P1_MEMORY_BACKEND", "jsonl"),
+    )
     args = parser.parse_args()
 
-    run_worker(base_workdir=args.workdir, interval_seconds=args.interval, once=args.once)
+    run_worker(
+        base_workdir=args.workdir,
+        interval_seconds=args.interval,
+        once=args.once,
+        memory_backend=args.memory_backend,
+    )
 
 
 if __name__ == "__main__":
@@ -1,5 +1,9 @@
 import math
 
+import numpy as np
+
+from ..cognitive.pareto import crowding_distance, non_dominated_mask, non_dominated_sort
+
 class ParetoOptimizer:
     def __init__(self, samples=50):
         self.samples = samples
@@ -29,14 +33,26 @@ class ParetoOptimizer:
         strictly_better = any(a[k] > b[k] for k in a)
         return better_or_equal and strictly_better
 
+    @staticmethod
+    def score_matrix(scored):
+        """Score dicts of `scored` as rows over the first entry's keys (all maximized)."""
+        if not scored:
+            return np.empty((0, 0))
+        keys = list(scored[0][1])
+        return np.array([[s[k] for k in keys] for _, s in scored], dtype=float).reshape(len(scored), len(keys))
+
     def pareto_front(self, scored):
-        front = []
-        for i, (ci, si) in enumerate(scored):
-            dominated = False
-            for j, (cj, sj) in enumerate(scored):
-                if i != j and self.dominates(sj, si):
-                    dominated = True
-                    break
-            if not dominated:
-                front.append((ci, si))
-        return front
+        keep = non_dominated_mask(self.score_matrix(scored))
+        return [entry for entry, k in zip(scored, keep) if k]
+
+    def pareto_fronts(self, scored):
+        """All non-dominated fronts of `scored`, best first, each ordered by decreasing crowding distance."""
+        points = self.score_matrix(scored)
+        ranks = non_dominated_sort(points)
+        crowding = crowding_distance(points, ranks)
+        fronts = []
+        for k in range(int(ranks.max()) + 1 if len(scored) else 0):
+            members = np.nonzero(ranks == k)[0]
+            members = members[np.argsort(-crowding[members], kind="stable")]
+            fronts.append([scored[i] for i in members])
+        return fronts
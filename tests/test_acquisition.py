@@ -0,0 +1,27 @@
+import numpy as np
+
+from mcc.cognitive.acquisition import map_chunks, nelder_mead, refine, top_k
+
+
+def test_chunked_scoring_keeps_order_across_workers():
+    points = np.arange(10_000, dtype=float).reshape(-1, 1)
+    serial = map_chunks(lambda c: c[:, 0] * 2, points, chunk_size=777)
+    threaded = map_chunks(lambda c: c[:, 0] * 2, points, chunk_size=777, workers=4)
+    assert np.array_equal(np.concatenate(serial), np.concatenate(threaded))
+    assert list(top_k(np.array([1.0, 5.0, 3.0, 5.0]), 3)) == [1, 3, 2]
+
+
+def test_local_refinement_climbs_to_box_constrained_optimum():
+    target = np.array([0.3, 0.9, 1.4])
+
+    def objective(x):
+        return -float(((x - target) ** 2).sum())
+
+    lower, upper = np.zeros(3), np.ones(3)
+    x, value = nelder_mead(objective, np.full(3, 0.5), lower, upper, max_iter=400)
+    assert np.allclose(x, [0.3, 0.9, 1.0], atol=1e-2)
+
+    starts = np.random.default_rng(0).uniform(size=(4, 3))
+    points, values = refine(objective, starts, lower, upper, method="nelder_mead", max_iter=400, workers=2)
+    assert points.shape == (4, 3)
+    assert (values >= [objective(s) for s in starts]).all()
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from mcc.cognitive import (
+    AsyncCognitiveEngine,
+    CognitiveMemoryStore,
+    DesignSpace,
+    GaussianProcessPlanner,
+    HypervolumePlateau,
+    ObjectiveSpec,
+)
+
+OBJECTIVES = [ObjectiveSpec(name="yield", direction="maximize")]
+SPACE = DesignSpace(bounds={"x": (0.0, 4.0)})
+
+
+class _RecordingPlanner(GaussianProcessPlanner):
+    def __init__(self):
+        super().__init__(random_candidates=64)
+        self.calls = []
+
+    def propose(self, **kwargs):
+        self.calls.append((len(kwargs["history"]), len(kwargs["pending"]), kwargs["n"]))
+        return super().propose(**kwargs)
+
+
+def test_steady_state_loop_keeps_workers_busy():
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def simulator(params):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        # uneven run times: a straggler must not hold the other slots idle
+        time.sleep(0.4 if params["x"] < 0.3 else 0.02)
+        with lock:
+            active[0] -= 1
+        if params["x"] > 3.9:
+            raise RuntimeError("solver diverged")
+        return {"yield": -((params["x"] - 2.5) ** 2)}
+
+    with tempfile.TemporaryDirectory() as td:
+        planner = _RecordingPlanner()
+        engine = AsyncCognitiveEngine(
+            domain="toy",
+            planner=planner,
+            memory=CognitiveMemoryStore(path=os.path.join(td, "mem.jsonl")),
+            simulator=simulator,
+            in_flight=3,
+            timeout=1.0,
+        )
+        results = engine.run(design_space=SPACE, objectives=OBJECTIVES, constraints=[], budget=12)
+
+        assert len(results) == 12 and engine.memory.load_all() == results
+        assert len({r.experiment_id for r in results}) == 12
+        assert peak[0] == 3
+        # empty slots are filled as a batch, otherwise one replacement at a time planned around the running ones
+        assert planner.calls[0] == (0, 0, 3)
+        for _, pending, n in planner.calls:
+            assert pending + n <= 3 and (pending == 0 or n == 1)
+        assert sum(n for _, _, n in planner.calls) == 12
+        assert any(pending == 2 for _, pending, _ in planner.calls)
+        assert all(r.status == "failed" for r in results if r.parameters["x"] > 3.9)
+        assert len(engine.hypervolume_trace(OBJECTIVES)) == 12
+
+
+def test_async_simulator_stops_on_plateau():
+    async def simulator(params):
+        await asyncio.sleep(0.01)
+        return {"yield": min(params["x"], 1.0)}
+
+    with tempfile.TemporaryDirectory() as td:
+        engine = AsyncCognitiveEngine(
+            domain="toy",
+            planner=GaussianProcessPlanner(random_candidates=64),
+            memory=CognitiveMemoryStore(path=os.path.join(td, "mem.jsonl")),
+            simulator=simulator,
+            in_flight=4,
+            hypervolume_reference={"yield": 0.0},
+        )
+        results = engine.run(
+            design_space=SPACE,
+            objectives=OBJECTIVES,
+            constraints=[],
+            budget=200,
+            stop=HypervolumePlateau(patience=8),
+        )
+        trace = engine.hypervolume_trace(OBJECTIVES)
+        assert len(results) < 200 and trace.values[-1] == 1.0
+        assert trace.evaluations == list(range(1, len(results) + 1))
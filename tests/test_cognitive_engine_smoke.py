@@ -1,5 +1,10 @@
+import asyncio
 import os
 import tempfile
+import threading
+import time
+
+import pytest
 
 from mcc.cognitive import (
     BaselineGridPlanner,
@@ -7,9 +12,14 @@ from mcc.cognitive import (
     CognitiveMemoryStore,
     ConstraintSpec,
     DesignSpace,
+    ExperimentPlanner,
+    ExperimentSpec,
     ObjectiveSpec,
 )
 
+# hung simulator threads block on this until the test releases them; hung pool workers are terminated
+_RELEASE = threading.Event()
+
 
 def toy_simulator(params):
     x = params["x"]
@@ -36,3 +46,127 @@ def test_cognitive_engine_smoke():
 
         assert len(results) == 2
         assert all(r.status in {"ok", "infeasible", "failed"} for r in results)
+
+
+def _slow_simulator(params):
+    x = params["x"]
+    if x > 3.5:
+        raise RuntimeError("solver diverged")
+    if x < 0.5:
+        _RELEASE.wait(30.0)
+    else:
+        time.sleep(0.02 * (4 - x))
+    return toy_simulator(params)
+
+
+def _hung_simulator(params):
+    if params["x"] < 0.5:
+        if "MCC_TEST_PID_DIR" in os.environ:
+            with open(os.path.join(os.environ["MCC_TEST_PID_DIR"], f"{os.getpid()}.pid"), "w"):
+                pass
+        time.sleep(600.0)
+    return toy_simulator(params)
+
+
+async def _async_simulator(params):
+    await asyncio.sleep(30.0 if params["x"] < 0.5 else 0.01)
+    return toy_simulator(params)
+
+
+class _FixedPlanner(ExperimentPlanner):
+    def __init__(self, xs):
+        self.xs = xs
+
+    def _propose(self, *, domain, design_space, objectives, constraints, history, n=1, pending=()):
+        return [
+            ExperimentSpec(experiment_id=f"{domain}-{i}", domain=domain, parameters={"x": x}, objectives=list(objectives))
+            for i, x in enumerate(self.xs[:n])
+        ]
+
+
+def test_parallel_evaluation_keeps_order_and_captures_failures():
+    space = DesignSpace(bounds={"x": (0.0, 4.0)})
+    objectives = [ObjectiveSpec(name="yield", direction="maximize")]
+    _RELEASE.clear()
+    with tempfile.TemporaryDirectory() as td:
+        runs = {}
+        try:
+            for name, simulator, executor in [
+                ("thread", _slow_simulator, "thread"),
+                ("process", _slow_simulator, "process"),
+                ("async", _async_simulator, "thread"),
+            ]:
+                engine = CognitiveEngine(
+                    domain="toy",
+                    planner=BaselineGridPlanner(),
+                    memory=CognitiveMemoryStore(path=os.path.join(td, f"{name}.jsonl")),
+                    simulator=simulator,
+                    workers=4,
+                    executor=executor,
+                    timeout=1.0,
+                )
+                started = time.monotonic()
+                runs[name] = engine.run_iteration(design_space=space, objectives=objectives, constraints=[], n=8)
+                # hung runs are abandoned, not waited for
+                assert time.monotonic() - started < 15.0
+                assert engine.memory.load_all() == runs[name]
+        finally:
+            _RELEASE.set()
+
+        specs = BaselineGridPlanner().propose(
+            domain="toy", design_space=space, objectives=objectives, constraints=[], history=[], n=8
+        )
+        for name, results in runs.items():
+            assert [r.parameters for r in results] == [s.parameters for s in specs]
+            for r in results:
+                if r.parameters["x"] < 0.5:
+                    assert r.status == "failed" and any(n.startswith("error=TimeoutError") for n in r.notes)
+                elif r.parameters["x"] > 3.5 and name != "async":
+                    assert r.status == "failed" and "error=RuntimeError: solver diverged" in r.notes
+                else:
+                    assert r.status == "ok" and r.outputs == toy_simulator(r.parameters)
+
+
+def test_process_pool_runs_queued_behind_abandoned_ones_are_not_timed_out():
+    objectives = [ObjectiveSpec(name="yield", direction="maximize")]
+    xs = [0.1, 0.2, 1.0, 1.5, 2.0, 2.5]
+    with tempfile.TemporaryDirectory() as td:
+        engine = CognitiveEngine(
+            domain="toy",
+            planner=_FixedPlanner(xs),
+            memory=CognitiveMemoryStore(path=os.path.join(td, "mem.jsonl")),
+            simulator=_hung_simulator,
+            workers=2,
+            executor="process",
+            timeout=1.0,
+        )
+        results = engine.run_iteration(
+            design_space=DesignSpace(bounds={"x": (0.0, 4.0)}), objectives=objectives, constraints=[], n=len(xs)
+        )
+        # both workers of the first pool hang; the fast runs must not inherit their timeout
+        assert [r.status for r in results] == ["failed", "failed", "ok", "ok", "ok", "ok"]
+        assert all(any(n.startswith("error=TimeoutError") for n in r.notes) for r in results[:2])
+
+
+def test_abandoned_process_workers_are_terminated(monkeypatch):
+    objectives = [ObjectiveSpec(name="yield", direction="maximize")]
+    with tempfile.TemporaryDirectory() as td:
+        monkeypatch.setenv("MCC_TEST_PID_DIR", td)
+        engine = CognitiveEngine(
+            domain="toy",
+            planner=_FixedPlanner([0.1, 1.0, 2.0, 3.0]),
+            memory=CognitiveMemoryStore(path=os.path.join(td, "mem.jsonl")),
+            simulator=_hung_simulator,
+            workers=2,
+            executor="process",
+            timeout=1.0,
+        )
+        results = engine.run_iteration(
+            design_space=DesignSpace(bounds={"x": (0.0, 4.0)}), objectives=objectives, constraints=[], n=4
+        )
+        assert [r.status for r in results] == ["failed", "ok", "ok", "ok"]
+        pids = [int(name.split(".")[0]) for name in os.listdir(td) if name.endswith(".pid")]
+        assert len(pids) == 1
+        # the worker stuck in its 600 s sleep is gone, so nothing holds up interpreter exit
+        with pytest.raises(ProcessLookupError):
+            os.kill(pids[0], 0)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from mcc.cognitive import BaselineGridPlanner, DesignSpace, ObjectiveSpec, RunResult
+from mcc.cognitive.designs import halton, maximin_lhs, sobol
+
+
+def test_designs_are_resumable_by_index():
+    for design in (sobol, halton, maximin_lhs):
+        whole = design(0, 40, 6)
+        resumed = np.vstack([design(0, 13, 6), design(13, 27, 6)])
+        assert np.array_equal(whole, resumed)
+        assert ((whole > 0) & (whole < 1)).all()
+
+    # every coordinate of the first 2^k Sobol points hits each of the 2^k strata once
+    x = sobol(0, 64, 12)
+    assert all(len(set((x[:, j] * 64).astype(int))) == 64 for j in range(12))
+
+
+def test_baseline_continues_sequence_after_restart():
+    space = DesignSpace(bounds={"a": (0.0, 2.0), "b": (-1.0, 1.0), "c": (10.0, 20.0)})
+    objectives = [ObjectiveSpec(name="y", direction="maximize")]
+    first = BaselineGridPlanner().propose(
+        domain="d", design_space=space, objectives=objectives, constraints=[], history=[], n=6
+    )
+    history = [RunResult(experiment_id=s.experiment_id, status="ok", parameters=s.parameters, outputs={}) for s in first[:4]]
+    resumed = BaselineGridPlanner().propose(
+        domain="d", design_space=space, objectives=objectives, constraints=[], history=history, n=2
+    )
+    assert [s.parameters for s in resumed] == [s.parameters for s in first[4:]]
+    assert len({tuple(s.parameters.values()) for s in first}) == 6
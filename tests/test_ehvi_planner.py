@@ -0,0 +1,36 @@
+import os
+import tempfile
+
+from mcc.cognitive import (
+    CognitiveEngine,
+    CognitiveMemoryStore,
+    DesignSpace,
+    ExpectedHypervolumePlanner,
+    ObjectiveSpec,
+)
+
+
+def test_ehvi_planner_runs_in_engine_loop():
+    def sim(params):
+        return {"strength": params["x"] + 0.1 * params["y"], "cost": params["x"] ** 2 + (params["y"] - 1.0) ** 2}
+
+    objectives = [
+        ObjectiveSpec(name="strength", direction="maximize"),
+        ObjectiveSpec(name="cost", direction="minimize"),
+    ]
+    with tempfile.TemporaryDirectory() as td:
+        engine = CognitiveEngine(
+            domain="toy",
+            planner=ExpectedHypervolumePlanner(seed=3),
+            memory=CognitiveMemoryStore(path=os.path.join(td, "mem.jsonl")),
+            simulator=sim,
+        )
+        for _ in range(5):
+            results = engine.run_iteration(
+                design_space=DesignSpace(bounds={"x": (0.0, 2.0), "y": (0.0, 2.0)}),
+                objectives=objectives,
+                constraints=[],
+                n=2,
+            )
+        assert all("planner=ehvi" in r.notes for r in results)
+        assert len({r.experiment_id for r in results}) == 2
@@ -0,0 +1,63 @@
+import numpy as np
+
+from mcc.cognitive import ConstraintSpec, DesignSpace, ModelBasedPlanner, ObjectiveSpec, RunResult
+from mcc.cognitive.feasibility import FeasibilityModel
+
+
+def _history():
+    rng = np.random.default_rng(0)
+    rows = []
+    for i, (x, y) in enumerate(rng.uniform(size=(40, 2))):
+        outputs = {"yield": 100.0 - 60.0 * x, "energy": x + y}
+        status = "ok" if outputs["yield"] >= 70.0 else "infeasible"
+        rows.append(RunResult(experiment_id=f"r-{i}", status=status, parameters={"x": x, "y": y}, outputs=outputs))
+    return rows
+
+
+def test_feasibility_model_learns_constraint_boundary():
+    floor = [ConstraintSpec(name="floor", kind="gte", field="yield", value=70.0)]
+    lo, span = np.zeros(2), np.ones(2)
+    for constraints in (floor, []):
+        # without constraint specs the model falls back to the status classifier
+        model = FeasibilityModel().fit(_history(), ["x", "y"], lo, span, constraints)
+        p = model.predict(np.array([[0.1, 0.5], [0.9, 0.5]]))
+        assert p[0] > 0.7 and p[1] < 0.3
+
+
+def test_planner_prunes_predicted_infeasible_candidates():
+    planner = ModelBasedPlanner(acquisition="ei", random_candidates=256)
+    specs = planner.propose(
+        domain="rxn",
+        design_space=DesignSpace(bounds={"x": (0.0, 1.0), "y": (0.0, 1.0)}),
+        objectives=[ObjectiveSpec(name="energy", direction="maximize")],
+        constraints=[ConstraintSpec(name="floor", kind="gte", field="yield", value=70.0)],
+        history=_history(),
+        n=4,
+    )
+    assert all(s.parameters["x"] < 0.6 for s in specs)
+    assert all(float(s.metadata["p_feasible"]) >= planner.feasibility.threshold for s in specs)
+
+
+def test_feasibility_model_extends_its_fit_within_a_capped_window():
+    floor = [ConstraintSpec(name="floor", kind="gte", field="yield", value=70.0)]
+    lo, span = np.zeros(2), np.ones(2)
+    probe = np.array([[0.1, 0.5], [0.5, 0.5], [0.9, 0.5]])
+    history = _history()
+
+    model = FeasibilityModel(max_points=16).fit(history[:10], ["x", "y"], lo, span, floor)
+    gp = model._regressions[0][1]
+    model.fit(history[:14], ["x", "y"], lo, span, floor)
+    # only grown: the same GP gained the new rows instead of being refitted
+    assert model._regressions[0][1] is gp and len(gp) == 14
+    fresh = FeasibilityModel(max_points=16).fit(history[:14], ["x", "y"], lo, span, floor)
+    np.testing.assert_allclose(model.predict(probe), fresh.predict(probe), atol=1e-6)
+
+    for stop in range(15, len(history) + 1):
+        model.fit(history[:stop], ["x", "y"], lo, span, floor)
+        assert 8 < len(model._regressions[0][1]) <= 16
+    fresh = FeasibilityModel(max_points=16).fit(history, ["x", "y"], lo, span, floor)
+    np.testing.assert_allclose(model.predict(probe), fresh.predict(probe), atol=1e-6)
+
+    # the status classifier is windowed the same way
+    model = FeasibilityModel(max_points=16).fit(history, ["x", "y"], lo, span, [])
+    assert 8 < len(model._status_y) <= 16
@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+import numpy as np
+
+from mcc.cognitive import (
+    CognitiveEngine,
+    CognitiveMemoryStore,
+    DesignSpace,
+    GaussianProcessPlanner,
+    ObjectiveSpec,
+    RunResult,
+)
+from mcc.cognitive.gp import GaussianProcess, solve_triangular
+
+
+def test_incremental_factor_matches_full_fit():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(size=(30, 3))
+    y = np.sin(4 * x[:, 0]) + x[:, 1] ** 2
+
+    full = GaussianProcess().fit(x, y)
+    inc = GaussianProcess().fit(x[:10], y[:10])
+    for i in range(10, 30):
+        inc.add(x[i], y[i])
+
+    xs = rng.uniform(size=(50, 3))
+    m_full, v_full = full.predict(xs)
+    m_inc, v_inc = inc.predict(xs)
+    assert np.allclose(m_full, m_inc, atol=1e-6)
+    assert np.allclose(v_full, v_inc, atol=1e-6)
+
+
+def test_gp_planner_runs_in_engine_loop():
+    def sim(params):
+        return {"yield": 100 - (params["x"] - 2.5) ** 2 - (params["y"] - 1.0) ** 2}
+
+    with tempfile.TemporaryDirectory() as td:
+        for acquisition in ("ei", "ucb", "nei"):
+            planner = GaussianProcessPlanner(acquisition=acquisition, seed=3)
+            engine = CognitiveEngine(
+                domain="toy",
+                planner=planner,
+                memory=CognitiveMemoryStore(path=os.path.join(td, f"{acquisition}.jsonl")),
+                simulator=sim,
+            )
+            for _ in range(6):
+                results = engine.run_iteration(
+                    design_space=DesignSpace(bounds={"x": (0.0, 4.0), "y": (-2.0, 2.0)}),
+                    objectives=[ObjectiveSpec(name="yield", direction="maximize")],
+                    constraints=[],
+                    n=2,
+                )
+            assert all("planner=gaussian_process" in r.notes for r in results)
+            assert len(planner._gp) == 10
+
+
+def test_triangular_solve_and_training_window():
+    rng = np.random.default_rng(1)
+    a = rng.normal(size=(300, 300))
+    lower = np.linalg.cholesky(a @ a.T + 300 * np.eye(300))
+    b = rng.normal(size=(300, 4))
+    assert np.allclose(lower @ solve_triangular(lower, b), b)
+    assert np.allclose(lower.T @ solve_triangular(lower, b[:, 0], trans=True), b[:, 0])
+
+    runs = [
+        RunResult(
+            experiment_id=f"w-{i}",
+            status="ok",
+            parameters={"x": float(x)},
+            outputs={"yield": float(-((x - 0.3) ** 2))},
+        )
+        for i, x in enumerate(rng.uniform(size=200))
+    ]
+    space = DesignSpace(bounds={"x": (0.0, 1.0)})
+    objectives = [ObjectiveSpec(name="yield", direction="maximize")]
+    planner = GaussianProcessPlanner(max_points=64, random_candidates=64)
+    for end in (50, 60, 200):
+        planner.propose(domain="toy", design_space=space, objectives=objectives, constraints=[], history=runs[:end], n=2)
+        assert len(planner._gp) == min(end, 64)
+    # the window keeps the best half and fills up with the newest runs
+    best = np.argsort([-r.outputs["yield"] for r in runs], kind="stable")[:32]
+    assert set(best) <= set(planner._gp_rows) and set(range(168, 200)) <= set(planner._gp_rows)
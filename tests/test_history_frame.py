@@ -0,0 +1,92 @@
+import numpy as np
+
+from mcc.cognitive import (
+    ConstraintSpec,
+    DesignSpace,
+    Dimension,
+    ExpectedHypervolumePlanner,
+    GaussianProcessPlanner,
+    HistoryFrame,
+    ModelBasedPlanner,
+    ObjectiveSpec,
+    RunResult,
+    pareto_front,
+)
+
+OBJECTIVES = [ObjectiveSpec(name="yield", direction="maximize"), ObjectiveSpec(name="energy", direction="minimize")]
+
+
+def _history(n, seed=0):
+    rng = np.random.default_rng(seed)
+    runs = []
+    for i in range(n):
+        x, level = float(rng.uniform()), int(rng.integers(1, 4))
+        model = ["laminar", "kEpsilon"][i % 2]
+        status = "failed" if i % 9 == 4 else "infeasible" if i % 9 == 7 else "ok"
+        outputs = {} if status == "failed" else {"yield": 3 * x - level, "energy": float(x * x + level)}
+        runs.append(
+            RunResult(
+                experiment_id=f"toy-{i}",
+                status=status,
+                parameters={"x": x, "level": level, "model": model},
+                outputs=outputs,
+                score=None if status != "ok" else outputs["yield"],
+                notes=["planner=baseline"],
+            )
+        )
+    return runs
+
+
+def test_frame_rows_read_back_as_runs():
+    runs = _history(30)
+    runs[3].outputs["converged"] = True
+    runs[5].parameters["model"] = 2
+    frame = HistoryFrame(runs)
+
+    assert len(frame) == 30 and list(frame) == runs
+    assert frame[-1] == runs[-1] and list(frame[10:20:3]) == runs[10:20:3]
+    assert isinstance(frame[0].parameters["level"], int)
+    assert frame.parameter_names == ("x", "level", "model")
+    assert np.array_equal(frame.status_mask("ok"), [r.status == "ok" for r in runs])
+    x = frame.parameter_matrix(["x", "missing"])
+    assert np.array_equal(x[:, 0], [r.parameters["x"] for r in runs]) and np.isnan(x[:, 1]).all()
+
+    # slices are snapshots; appending to either side leaves the other alone
+    head = frame[:10]
+    frame.append(runs[0])
+    head.extend(runs[20:])
+    assert len(frame) == 31 and len(head) == 20 and list(head) == runs[:10] + runs[20:]
+
+
+def test_planners_and_pareto_front_accept_frames():
+    runs = _history(40)
+    frame = HistoryFrame(runs)
+    assert pareto_front(frame, OBJECTIVES) == pareto_front(runs, OBJECTIVES)
+
+    space = DesignSpace(
+        bounds={"x": (0.0, 1.0)},
+        dimensions={
+            "level": Dimension(kind="int", low=1, high=3),
+            "model": Dimension(kind="categorical", choices=("laminar", "kEpsilon")),
+        },
+    )
+    constraints = [ConstraintSpec(name="cap", kind="lte", field="energy", value=3.0)]
+    planners = [
+        lambda: ModelBasedPlanner(acquisition="ei"),
+        lambda: GaussianProcessPlanner(),
+        lambda: ExpectedHypervolumePlanner(random_candidates=64, mc_samples=8),
+    ]
+    for make in planners:
+        specs = [
+            make().propose(
+                domain="toy",
+                design_space=space,
+                objectives=OBJECTIVES,
+                constraints=constraints,
+                history=history,
+                n=2,
+            )
+            for history in (runs, frame)
+        ]
+        assert [s.parameters for s in specs[0]] == [s.parameters for s in specs[1]]
+        assert [s.experiment_id for s in specs[0]] == [s.experiment_id for s in specs[1]]
@@ -0,0 +1,91 @@
+import os
+import tempfile
+
+import numpy as np
+
+from mcc.cognitive import (
+    BaselineGridPlanner,
+    CognitiveEngine,
+    CognitiveMemoryStore,
+    DesignSpace,
+    HypervolumePlateau,
+    ObjectiveSpec,
+)
+from mcc.cognitive.hypervolume import _hv3d_batch, hypervolume, hypervolume_improvement
+
+
+def test_exact_hypervolume_matches_monte_carlo():
+    rng = np.random.default_rng(1)
+    for d in (2, 3):
+        pts = rng.uniform(size=(12, d))
+        ref = np.zeros(d)
+        exact = hypervolume(pts, ref)
+        u = rng.uniform(size=(200_000, d))
+        estimate = (u[:, None, :] <= pts[None, :, :]).all(axis=2).any(axis=1).mean()
+        assert abs(exact - estimate) < 0.01
+
+        cand = rng.uniform(size=(5, d))
+        hvi = hypervolume_improvement(cand, pts, ref)
+        direct = [hypervolume(np.vstack([pts, c]), ref) - exact for c in cand]
+        assert np.allclose(hvi, direct)
+
+
+def test_3d_sweep_matches_the_batched_form_and_scales_to_large_fronts():
+    rng = np.random.default_rng(4)
+    for n in (1, 7, 60):
+        # rounding forces ties in every objective
+        pts = np.round(rng.uniform(size=(n, 3)), 1)
+        assert np.isclose(hypervolume(pts, np.zeros(3)), _hv3d_batch(pts[None])[0])
+
+    # a quarter sphere of 5000 points; the batched form would need a 5000 x 5000 x 2 tensor
+    pts = np.abs(rng.normal(size=(5000, 3)))
+    pts /= np.linalg.norm(pts, axis=1, keepdims=True)
+    assert 0.49 < hypervolume(pts, np.zeros(3)) < np.pi / 6
+    cand = np.array([[0.9, 0.9, 0.9], [0.1, 0.1, 0.1]])
+    hvi = hypervolume_improvement(cand, pts, np.zeros(3))
+    assert hvi[0] > 0 and hvi[1] == 0.0
+    assert np.isclose(hvi[0], hypervolume(np.vstack([pts, cand[0]]), np.zeros(3)) - hypervolume(pts, np.zeros(3)))
+
+
+def test_wfg_hypervolume_is_exact_for_many_objectives():
+    rng = np.random.default_rng(2)
+    for d in (4, 5):
+        pts = rng.uniform(size=(15, d))
+        ref = np.full(d, 0.1)
+        exact = hypervolume(pts, ref)
+        # a fine Monte-Carlo estimate, the built-in estimator and boxes sharing one corner cube
+        u = ref + rng.uniform(size=(400_000, d)) * (1 - ref)
+        estimate = (u[:, None, :] <= pts[None, :, :]).all(axis=2).any(axis=1).mean() * 0.9**d
+        assert abs(exact - estimate) < 0.005
+        estimated = hypervolume(pts, ref, exact_up_to=3, samples=200_000, rng=rng)
+        assert abs(exact - estimated) < 0.005
+        corners = np.eye(d) * 0.5 + 0.5
+        assert np.isclose(hypervolume(corners, np.zeros(d)), d * 0.5 ** (d - 1) - (d - 1) * 0.5**d)
+
+
+def test_engine_records_hypervolume_and_stops_on_plateau():
+    objectives = [
+        ObjectiveSpec(name="strength", direction="maximize"),
+        ObjectiveSpec(name="cost", direction="minimize"),
+    ]
+    with tempfile.TemporaryDirectory() as td:
+        engine = CognitiveEngine(
+            domain="toy",
+            planner=BaselineGridPlanner(),
+            memory=CognitiveMemoryStore(path=os.path.join(td, "mem.jsonl")),
+            simulator=lambda p: {"strength": min(p["x"], 1.0), "cost": 1.0},
+            hypervolume_reference={"strength": 0.0, "cost": 2.0},
+        )
+        results = engine.run_campaign(
+            max_iterations=20,
+            stop=HypervolumePlateau(patience=2),
+            design_space=DesignSpace(bounds={"x": (0.0, 2.0)}),
+            objectives=objectives,
+            constraints=[],
+            n=3,
+        )
+        trace = engine.hypervolume_trace(objectives)
+        assert len(results) == 3 * len(trace) < 60
+        assert trace.evaluations == [3 * (i + 1) for i in range(len(trace))]
+        assert np.all(np.diff(trace.values) >= 0)
+        assert np.isclose(trace.values[-1], max(r.outputs["strength"] for r in results))
@@ -0,0 +1,189 @@
+import os
+import tempfile
+import time
+
+from mcc.cognitive import (
+    BaselineGridPlanner,
+    CognitiveEngine,
+    CognitiveMemoryStore,
+    DesignSpace,
+    ObjectiveSpec,
+    RunResult,
+    SQLiteMemoryStore,
+)
+from mcc.cognitive import memory
+from mcc.cognitive.service import CognitiveSimulationService
+
+
+def _run(i, status="ok"):
+    return RunResult(
+        experiment_id=f"exp-{i}",
+        status=status,
+        parameters={"x": float(i)},
+        outputs={"yield": float(i)},
+        score=float(i) if status == "ok" else None,
+        notes=[f"n={i}"],
+    )
+
+
+def test_sqlite_store_queries_and_cursor():
+    with tempfile.TemporaryDirectory() as td:
+        clock = iter([100.0, 200.0, 300.0, 400.0])
+        store = SQLiteMemoryStore(path=os.path.join(td, "mem.sqlite"), clock=lambda: next(clock))
+        assert store.append_many([_run(0), _run(1, "failed"), _run(2)]) == 3
+        store.append(_run(3, "infeasible"))
+        store.append(_run(4))
+
+        assert [r.experiment_id for r in store.load_all()] == [f"exp-{i}" for i in range(5)]
+        assert store.load_all()[2] == _run(2)
+        assert [r.experiment_id for r in store.query(status="ok")] == ["exp-0", "exp-2", "exp-4"]
+        assert [r.experiment_id for r in store.query(status=["failed", "infeasible"])] == ["exp-1", "exp-3"]
+        assert [r.experiment_id for r in store.query(experiment_ids=["exp-4", "exp-0"])] == ["exp-0", "exp-4"]
+        assert [r.experiment_id for r in store.query(since=150.0, until=300.0)] == ["exp-3"]
+        assert len(store.query(status="ok", limit=2)) == 2
+
+        first, cursor = store.load_since(0)
+        assert len(first) == 5
+        fingerprint = store.fingerprint()
+        store.append(_run(5))
+        new, cursor = store.load_since(cursor)
+        assert [r.experiment_id for r in new] == ["exp-5"]
+        assert store.load_since(cursor) == ([], cursor)
+        assert store.extends(fingerprint)
+
+
+def test_jsonl_round_trip_through_sqlite():
+    with tempfile.TemporaryDirectory() as td:
+        jsonl = CognitiveMemoryStore(path=os.path.join(td, "old.jsonl"))
+        for i in range(4):
+            jsonl.append(_run(i, "failed" if i == 1 else "ok"))
+        rows, cursor = jsonl.load_since(0)
+        jsonl.append(_run(4))
+        assert [r.experiment_id for r in jsonl.load_since(cursor)[0]] == ["exp-4"]
+
+        store = SQLiteMemoryStore(path=os.path.join(td, "new.sqlite"))
+        assert store.import_jsonl(jsonl.path) == 5
+        assert store.load_all() == jsonl.load_all()
+        assert [r.experiment_id for r in jsonl.query(status="failed")] == ["exp-1"]
+
+        exported = os.path.join(td, "export.jsonl")
+        assert store.export_jsonl(exported) == 5
+        assert CognitiveMemoryStore(path=exported).load_all() == jsonl.load_all()
+
+
+def test_engine_and_service_run_on_sqlite_memory():
+    with tempfile.TemporaryDirectory() as td:
+        engine = CognitiveEngine(
+            domain="toy",
+            planner=BaselineGridPlanner(),
+            memory=SQLiteMemoryStore(path=os.path.join(td, "toy.sqlite")),
+            simulator=lambda p: {"yield": -((p["x"] - 1.0) ** 2)},
+        )
+        for _ in range(3):
+            engine.run_iteration(
+                design_space=DesignSpace(bounds={"x": (0.0, 2.0)}),
+                objectives=[ObjectiveSpec(name="yield", direction="maximize")],
+                constraints=[],
+                n=2,
+            )
+        assert len(engine.memory.load_all()) == 6
+
+        service = CognitiveSimulationService(td, memory_backend="sqlite")
+        for _ in range(2):
+            service.suggest_experiments(
+                domain="toy",
+                planner="gaussian_process",
+                design_space={"x": [0.0, 5.0], "y": [0.0, 4.0]},
+                objectives=[{"name": "yield", "direction": "maximize"}],
+                n=2,
+            )
+        assert service._memory_path("toy").name == "toy_service_memory.sqlite"
+        assert len(service._memory("toy").load_all()) == 4
+        assert (service._planners.hits, service._planners.misses) == (1, 1)
+
+
+def test_jsonl_store_only_parses_appended_lines(monkeypatch):
+    parsed = []
+    loads = memory._loads
+    monkeypatch.setattr(memory, "_loads", lambda line: parsed.append(line) or loads(line))
+    with tempfile.TemporaryDirectory() as td:
+        path = os.path.join(td, "mem.jsonl")
+        store = CognitiveMemoryStore(path=path)
+        writer = CognitiveMemoryStore(path=path)
+        for i in range(3):
+            writer.append(_run(i))
+        first = store.load_all()
+        assert len(first) == 3
+
+        # rows appended by another writer are picked up, cached rows are reused
+        writer.append(_run(3))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"experiment_id": "partial"')
+        parsed.clear()
+        second = store.load_all()
+        assert second[:3] == first and len(second) == 4 and len(parsed) == 1
+        _, cursor = store.load_since(0)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(', "status": "ok", "parameters": {}, "outputs": {}}\n')
+        assert [r.experiment_id for r in store.load_since(cursor)[0]] == ["partial"]
+
+        # an in-place rewrite of the tail and a rotated file both force a re-read
+        lines = open(path, encoding="utf-8").read().splitlines(keepends=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(lines[:3] + [lines[4]])
+        assert [r.experiment_id for r in store.load_all()] == ["exp-0", "exp-1", "exp-2", "partial"]
+        rotated = os.path.join(td, "next.jsonl")
+        CognitiveMemoryStore(path=rotated).append(_run(9))
+        os.replace(rotated, path)
+        assert [r.experiment_id for r in store.load_all()] == ["exp-9"]
+        assert store.load_since(cursor)[0][0].experiment_id == "exp-9"
+
+
+def test_buffered_jsonl_writes_flush_by_size_and_interval():
+    with tempfile.TemporaryDirectory() as td:
+        path = os.path.join(td, "mem.jsonl")
+        now = [0.0]
+        store = CognitiveMemoryStore(path=path, buffer_rows=3, flush_interval=10.0, fsync=True, clock=lambda: now[0])
+        reader = CognitiveMemoryStore(path=path)
+
+        store.append(_run(0))
+        store.append(_run(1))
+        assert reader.load_all() == []
+        # the writer always sees its own buffered rows
+        assert len(store.load_all()) == 2 and len(reader.load_all()) == 2
+
+        assert store.append_many([_run(2), _run(3)]) == 2
+        assert len(reader.load_all()) == 2
+        store.append(_run(4))
+        assert len(reader.load_all()) == 5
+
+        store.append(_run(5))
+        now[0] = 11.0
+        store.append(_run(6))
+        assert len(reader.load_all()) == 7
+
+        with store:
+            store.append(_run(7))
+        assert [r.experiment_id for r in reader.load_all()] == [f"exp-{i}" for i in range(8)]
+
+
+def test_buffered_rows_flush_in_the_background_and_at_exit():
+    with tempfile.TemporaryDirectory() as td:
+        path = os.path.join(td, "mem.jsonl")
+        reader = CognitiveMemoryStore(path=path)
+
+        store = CognitiveMemoryStore(path=path, buffer_rows=100, flush_interval=0.05)
+        store.append(_run(0))
+        assert store in memory._UNFLUSHED
+        deadline = time.monotonic() + 5.0
+        while not reader.load_all() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # written by the timer although nothing was appended or read since
+        assert [r.experiment_id for r in reader.load_all()] == ["exp-0"]
+        assert store not in memory._UNFLUSHED
+
+        lazy = CognitiveMemoryStore(path=path, buffer_rows=100)
+        lazy.append(_run(1))
+        assert len(reader.load_all()) == 1
+        memory._flush_at_exit()
+        assert [r.experiment_id for r in reader.load_all()] == ["exp-0", "exp-1"]
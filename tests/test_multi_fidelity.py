@@ -0,0 +1,118 @@
+import json
+import tempfile
+from pathlib import Path
+
+from mcc.cognitive import DesignSpace, MultiFidelityPlanner, ObjectiveSpec, RunResult
+from mcc.cognitive.service import CognitiveSimulationService
+
+
+def test_multi_fidelity_promotes_best_screened_points_and_charges_on_completion():
+    screened = []
+
+    def cheap(params):
+        value = 10.0 - (params["x"] - 0.3) ** 2
+        screened.append(value)
+        return {"f": value}
+
+    planner = MultiFidelityPlanner(low_fidelity=cheap, costs={"high": 50.0}, screen_candidates=64, seed=3)
+    kwargs = dict(
+        domain="mf",
+        design_space=DesignSpace(bounds={"x": (0.0, 1.0)}),
+        objectives=[ObjectiveSpec(name="f", direction="maximize")],
+        constraints=[],
+        n=2,
+    )
+    specs = planner.propose(history=[], **kwargs)
+    assert [s.metadata["fidelity"] for s in specs] == ["high", "high"]
+    # without high-fidelity runs the expected improvement ranks by the cheap score
+    assert specs[0].metadata["low_fidelity_score"] == f"{max(screened):.6g}"
+    assert planner.spent == {"low": 64.0, "high": 0.0}
+
+    history = [
+        RunResult(experiment_id=s.experiment_id, status="ok", parameters=s.parameters, outputs={"f": 1.0}, score=1.0)
+        for s in specs
+    ]
+    screened.clear()
+    planner.propose(history=history, **kwargs)
+    # one twin per returned run, then the fresh pool; promotions are charged only now
+    assert len(screened) == 64 + 2
+    assert planner.spent == {"low": 130.0, "high": 100.0}
+
+    screened.clear()
+    planner.propose(history=history, **kwargs)
+    # twins are cached and returned runs are never charged twice
+    assert len(screened) == 64
+    assert planner.spent["high"] == 100.0
+
+
+def test_promote_experiments_queues_jobs_and_records_their_runs():
+    with tempfile.TemporaryDirectory() as td:
+        service = CognitiveSimulationService(td)
+        kwargs = dict(
+            domain="reactor",
+            backend="codesaturne",
+            low_fidelity_domain="mass_balance",
+            design_space={"inlet_flow": [1.0, 10.0]},
+            objectives=[{"name": "accumulation", "direction": "maximize"}],
+            fixed_parameters={"outlet_flow": 1.0},
+            n=2,
+        )
+        first = service.promote_experiments(**kwargs)
+        assert len(first["promoted"]) == 2
+        assert first["spent"]["high"] == 0.0
+        assert service.pending_points("reactor", ["inlet_flow"]) == [
+            {"inlet_flow": p["parameters"]["inlet_flow"]} for p in first["promoted"]
+        ]
+
+        # the "solver" finishes both runs; their metrics land in the domain memory
+        for promoted in first["promoted"]:
+            job = service._store.get_job(promoted["job_id"])
+            accumulation = promoted["parameters"]["inlet_flow"] - 1.0
+            (Path(job.workdir) / "metrics.json").write_text(json.dumps({"metrics": {"accumulation": accumulation}}))
+            assert service.run_next_queued()["status"] == "processed"
+        runs = service._memory("reactor").load_all()
+        assert [r.experiment_id for r in runs] == [p["experiment_id"] for p in first["promoted"]]
+        assert all(r.status == "ok" and r.parameters["outlet_flow"] == 1.0 for r in runs)
+        assert all(f"job_id={p['job_id']}" in r.notes for r, p in zip(runs, first["promoted"]))
+
+        second = service.promote_experiments(**kwargs)
+        assert len(service._promoters) == 1
+        assert second["spent"]["high"] == 2 * 100.0
+        assert not {p["experiment_id"] for p in second["promoted"]} & {r.experiment_id for r in runs}
+
+
+def test_promoting_past_a_pending_experiment_updates_memory_and_payload():
+    with tempfile.TemporaryDirectory() as td:
+        service = CognitiveSimulationService(td)
+        kwargs = dict(
+            domain="reactor",
+            backend="codesaturne",
+            low_fidelity_domain="mass_balance",
+            design_space={"inlet_flow": [1.0, 10.0]},
+            objectives=[{"name": "accumulation", "direction": "maximize"}],
+            fixed_parameters={"outlet_flow": 1.0},
+            n=1,
+        )
+        (pending,) = service.promote_experiments(**kwargs)["promoted"]
+        second = service.promote_experiments(**kwargs)
+        (promoted,) = second["promoted"]
+        # the still-queued experiment is penalized, not proposed again, and nothing is charged yet
+        assert promoted["experiment_id"] != pending["experiment_id"]
+        assert promoted["parameters"] != pending["parameters"]
+        assert second["spent"] == {"low": 2 * 256.0, "high": 0.0}
+        assert service._memory("reactor").load_all() == []
+
+        job = service._store.get_job(pending["job_id"])
+        (Path(job.workdir) / "metrics.json").write_text(json.dumps({"metrics": {"accumulation": 2.5}}))
+        assert service.run_next_queued()["status"] == "processed"
+        (run,) = service._memory("reactor").load_all()
+        assert run.experiment_id == pending["experiment_id"]
+        assert run.parameters == {**pending["parameters"], "outlet_flow": 1.0}
+        assert run.outputs["accumulation"] == 2.5
+
+        third = service.promote_experiments(**kwargs)
+        # the returned run is charged once and the remaining queued job stays pending
+        assert third["spent"]["high"] == 100.0
+        assert service.pending_points("reactor", ["inlet_flow"]) == [
+            {"inlet_flow": p["parameters"]["inlet_flow"]} for p in (promoted, third["promoted"][0])
+        ]
@@ -0,0 +1,57 @@
+import tempfile
+
+import pytest
+
+from mcc.cognitive import DesignSpace, ObjectiveSpec, OptunaTPEPlanner, RunResult
+
+optuna = pytest.importorskip("optuna")
+
+SPACE = DesignSpace(bounds={"x": (0.0, 4.0)})
+OBJECTIVES = [ObjectiveSpec(name="yield", direction="maximize")]
+
+
+def _propose(planner, history, n):
+    return planner.propose(
+        domain="toy", design_space=SPACE, objectives=OBJECTIVES, constraints=[], history=history, n=n
+    )
+
+
+def _run(spec):
+    value = -((spec.parameters["x"] - 1.0) ** 2)
+    return RunResult(
+        experiment_id=spec.experiment_id,
+        status="ok",
+        parameters=dict(spec.parameters),
+        outputs={"yield": value},
+        score=value,
+    )
+
+
+def test_persistent_study_resumes_running_trials_without_duplicates():
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    with tempfile.TemporaryDirectory() as td:
+        first = _propose(OptunaTPEPlanner(storage_dir=td), [], 2)
+        assert [s.experiment_id for s in first] == ["toy-optuna-1", "toy-optuna-2"]
+        assert all(s.metadata["planner"] == "optuna_tpe" for s in first)
+        history = [_run(s) for s in first]
+
+        # a new planner on the same storage tells the asked trials instead of adding copies
+        restarted = OptunaTPEPlanner(storage_dir=td)
+        second = _propose(restarted, history, 1)
+        study = restarted._studies["toy"].study
+        trials = study.get_trials(deepcopy=False)
+        assert [t.number for t in trials] == [0, 1, 2]
+        assert [t.state for t in trials[:2]] == [optuna.trial.TrialState.COMPLETE] * 2
+        assert [t.value for t in trials[:2]] == [r.score for r in history]
+        assert trials[2].state == optuna.trial.TrialState.RUNNING
+        assert trials[2].user_attrs["experiment_id"] == second[0].experiment_id == "toy-optuna-3"
+
+        history.append(_run(second[0]))
+        again = OptunaTPEPlanner(storage_dir=td)
+        _propose(again, history, 1)
+        trials = again._studies["toy"].study.get_trials(deepcopy=False)
+        ids = [t.user_attrs["experiment_id"] for t in trials]
+        assert len(trials) == 4 and len(set(ids)) == 4
+        assert trials[2].state == optuna.trial.TrialState.COMPLETE and trials[2].value == history[2].score
+        # the sampler keeps asked-but-unfinished trials in mind
+        assert again._studies["toy"].study.sampler._constant_liar
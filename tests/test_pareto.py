@@ -0,0 +1,136 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from mcc.cognitive import (
+    BaselineGridPlanner,
+    CognitiveEngine,
+    CognitiveMemoryStore,
+    DesignSpace,
+    HistoryFrame,
+    ObjectiveSpec,
+    ParetoArchive,
+    RunResult,
+    crowding_distance,
+    epsilon_front_mask,
+    non_dominated_sort,
+    pareto_front,
+    pareto_layers,
+)
+from mcc.cognitive.pareto import non_dominated_mask
+from mcc.core.pareto_optimizer import ParetoOptimizer
+
+OBJECTIVES = [ObjectiveSpec(name="yield", direction="maximize"), ObjectiveSpec(name="energy", direction="minimize")]
+
+
+def _brute_force(points):
+    return np.array([not ((points >= p).all(axis=1) & (points > p).any(axis=1)).any() for p in points])
+
+
+def test_non_dominated_mask_matches_pairwise_check():
+    rng = np.random.default_rng(0)
+    for d in (1, 2, 3, 4, 6):
+        for trial in range(20):
+            n = int(rng.integers(1, 150))
+            # integer grids produce ties and duplicate rows
+            points = rng.integers(0, 4, size=(n, d)).astype(float) if trial % 2 else rng.normal(size=(n, d))
+            assert np.array_equal(non_dominated_mask(points), _brute_force(points)), (d, trial)
+
+
+def _runs(n, seed):
+    rng = np.random.default_rng(seed)
+    return [
+        RunResult(
+            experiment_id=f"r{seed}-{i}",
+            status="infeasible" if i % 5 == 0 else "ok",
+            parameters={"x": float(x)},
+            outputs={"yield": float(x), "energy": float(x**2 + rng.uniform())},
+        )
+        for i, x in enumerate(rng.uniform(size=n))
+    ]
+
+
+def test_archive_updates_match_a_full_recompute():
+    history = _runs(60, 1)
+    archive = ParetoArchive(OBJECTIVES)
+    for start in range(0, 60, 7):
+        archive.update(history[start:start + 7])
+        assert archive.front == pareto_front(history[:start + 7], OBJECTIVES)
+
+    frame = HistoryFrame(history)
+    synced = ParetoArchive(OBJECTIVES).sync(frame[:30]).sync(frame)
+    assert synced.front == pareto_front(history, OBJECTIVES)
+    # a rewritten history is rebuilt from scratch
+    other = _runs(20, 2)
+    assert synced.sync(other).front == pareto_front(other, OBJECTIVES)
+
+
+def test_engine_front_follows_the_memory():
+    with tempfile.TemporaryDirectory() as td:
+        engine = CognitiveEngine(
+            domain="toy",
+            planner=BaselineGridPlanner(),
+            memory=CognitiveMemoryStore(path=os.path.join(td, "mem.jsonl")),
+            simulator=lambda p: {"yield": p["x"], "energy": (p["x"] - 1.0) ** 2 + p["y"]},
+        )
+        space = DesignSpace(bounds={"x": (0.0, 2.0), "y": (0.0, 1.0)})
+        for _ in range(4):
+            engine.run_iteration(design_space=space, objectives=OBJECTIVES, constraints=[], n=4)
+            assert engine.current_pareto_front(OBJECTIVES) == pareto_front(engine.memory.load_all(), OBJECTIVES)
+
+
+def _brute_force_ranks(points):
+    ranks = np.full(len(points), -1)
+    left = np.arange(len(points))
+    rank = 0
+    while len(left):
+        front = _brute_force(points[left])
+        ranks[left[front]] = rank
+        left = left[~front]
+        rank += 1
+    return ranks
+
+
+def test_non_dominated_sort_matches_repeated_peeling():
+    rng = np.random.default_rng(3)
+    for d in (1, 2, 3, 4, 6):
+        for trial in range(12):
+            n = int(rng.integers(1, 250))
+            points = rng.integers(0, 4, size=(n, d)).astype(float) if trial % 2 else rng.normal(size=(n, d))
+            assert np.array_equal(non_dominated_sort(points), _brute_force_ranks(points)), (d, trial)
+
+    points = rng.normal(size=(100_000, 2))
+    start = time.perf_counter()
+    non_dominated_sort(points)
+    assert time.perf_counter() - start < 1.0
+
+
+def test_crowding_and_epsilon_front():
+    points = np.array([[0.0, 4.0], [1.0, 3.0], [3.0, 1.0], [4.0, 0.0], [0.0, 0.0], [1.0, 1.0]])
+    ranks = non_dominated_sort(points)
+    assert ranks.tolist() == [0, 0, 0, 0, 2, 1]
+    distance = crowding_distance(points, ranks)
+    assert np.isinf(distance[[0, 3, 4, 5]]).all()
+    assert np.allclose(distance[1:3], [(3 - 0) / 4 + (4 - 1) / 4, (4 - 1) / 4 + (3 - 0) / 4])
+
+    # boxes of side 2.5: (1,3) and (3,1) are nearer the best corners of the boxes they share
+    assert epsilon_front_mask(points, 2.5).tolist() == [False, True, True, False, False, False]
+    history = _runs(80, 4)
+    thinned = pareto_front(history, OBJECTIVES, epsilon=[0.1, 0.1])
+    assert set(r.experiment_id for r in thinned) <= set(r.experiment_id for r in pareto_front(history, OBJECTIVES))
+    layers = pareto_layers(history, OBJECTIVES)
+    assert layers[0] == pareto_front(history, OBJECTIVES)
+    assert sum(len(layer) for layer in layers) == sum(r.status == "ok" for r in history)
+
+
+def test_pareto_optimizer_shares_the_kernels():
+    rng = np.random.default_rng(5)
+    scored = [({"id": i}, {"a": float(a), "b": float(b)}) for i, (a, b) in enumerate(rng.integers(0, 5, size=(60, 2)))]
+    optimizer = ParetoOptimizer()
+    expected = [(c, s) for c, s in scored if not any(optimizer.dominates(t, s) for _, t in scored)]
+    assert optimizer.pareto_front(scored) == expected
+    fronts = optimizer.pareto_fronts(scored)
+    assert sorted(c["id"] for c, _ in fronts[0]) == [c["id"] for c, _ in expected]
+    assert sum(len(f) for f in fronts) == len(scored)
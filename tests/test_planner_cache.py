@@ -0,0 +1,104 @@
+import tempfile
+
+from mcc.cognitive import BaselineGridPlanner, ModelBasedPlanner, TrustRegionPlanner
+from mcc.cognitive.planner_cache import PlannerCache
+from mcc.cognitive.service import CognitiveSimulationService
+
+
+def test_suggest_reuses_planner_while_memory_only_grows():
+    with tempfile.TemporaryDirectory() as td:
+        service = CognitiveSimulationService(td)
+        kwargs = dict(
+            domain="toy",
+            planner="gaussian_process",
+            design_space={"x": [0.0, 5.0], "y": [0.0, 4.0]},
+            objectives=[{"name": "yield", "direction": "maximize"}],
+            n=3,
+        )
+        for _ in range(4):
+            service.suggest_experiments(**kwargs)
+        cache = service._planners
+        assert (cache.hits, cache.misses) == (3, 1)
+        planner = cache.get(("toy", "gaussian_process"), lambda fp: True)
+        assert len(planner._gp) == 9
+        cache.put(("toy", "gaussian_process"), planner, service._memory("toy").fingerprint())
+
+        # rewriting the history invalidates the cached surrogate
+        memory = service._memory_path("toy")
+        lines = memory.read_text().splitlines(keepends=True)
+        memory.write_text("".join(lines[:-1]))
+        service.suggest_experiments(**kwargs)
+        assert cache.misses == 2
+
+
+def test_service_model_based_planner_keeps_defaults_unless_configured(monkeypatch):
+    with tempfile.TemporaryDirectory() as td:
+        service = CognitiveSimulationService(td)
+        plain = service._build_planner("model_based")
+        default = ModelBasedPlanner()
+        assert (plain.random_candidates, plain.refine_starts, plain.workers) == (
+            default.random_candidates,
+            default.refine_starts,
+            default.workers,
+        )
+        monkeypatch.setenv("MCC_PLANNER_RANDOM_CANDIDATES", "4096")
+        monkeypatch.setenv("MCC_PLANNER_REFINE_STARTS", "4")
+        tuned = service._build_planner("model_based")
+        assert (tuned.random_candidates, tuned.refine_starts, tuned.workers) == (4096, 4, default.workers)
+
+
+def test_pinned_planners_outlive_ttl_and_lru_eviction():
+    now = [0.0]
+    cache = PlannerCache(max_entries=1, ttl_seconds=10.0, clock=lambda: now[0])
+    stateful, plain = TrustRegionPlanner(), BaselineGridPlanner()
+    cache.put("tr", stateful, None, pinned=True)
+    cache.put("a", plain, None)
+    cache.put("b", BaselineGridPlanner(), None)
+    assert len(cache) == 2  # "a" evicted, the pinned entry kept
+
+    now[0] = 100.0
+    assert cache.get("b", lambda fp: True) is None
+    assert cache.get("tr", lambda fp: True) is stateful
+    # checked out: a concurrent request misses and builds its own planner
+    assert cache.get("tr", lambda fp: True) is None
+    cache.put("tr", stateful, None, pinned=True)
+    # a rewritten history still drops it
+    assert cache.get("tr", lambda fp: False) is None
+
+
+def test_pinned_planners_have_their_own_lru_cap():
+    cache = PlannerCache(max_entries=1, max_pinned=2)
+    planners = [TrustRegionPlanner() for _ in range(3)]
+    for key, planner in zip("abc", planners):
+        cache.put(key, planner, None, pinned=True)
+    cache.put("plain", BaselineGridPlanner(), None)
+    assert len(cache) == 3
+    # the least recently returned pinned planner is the one dropped
+    assert cache.get("a", lambda fp: True) is None
+    assert cache.get("c", lambda fp: True) is planners[2]
+
+
+def test_pending_points_only_count_jobs_tagged_with_the_domain():
+    with tempfile.TemporaryDirectory() as td:
+        service = CognitiveSimulationService(td)
+        jobs = [
+            service.create_job("codesaturne", {"domain": "a", "parameters": {"x": 1.0}}),
+            service.create_job("codesaturne", {"domain": "b", "parameters": {"x": 2.0}}),
+            service.create_job("codesaturne", {"x": 3.0}),
+            service.create_job("codesaturne", {"domain": "a", "x": 4.0}),
+            service.create_job("codesaturne", {"domain": "b", "x": 5.0}),
+        ]
+        for job in jobs:
+            service.enqueue_job(job["job_id"])
+        for job in jobs[:2]:
+            service._store.start_job(job["job_id"])
+
+        states = service._store.jobs_in_queue_states(("queued", "running"))
+        assert [job.job_id for job in states] == [job["job_id"] for job in jobs]
+        assert [job.job_id for job in service._store.jobs_in_queue_states(("running",))] == [
+            job["job_id"] for job in jobs[:2]
+        ]
+
+        assert service.pending_points("a", ["x"]) == [{"x": 1.0}, {"x": 4.0}]
+        assert service.pending_points("b", ["x"]) == [{"x": 2.0}, {"x": 5.0}]
+        assert service.pending_points("c", ["x"]) == []
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from mcc.cognitive.adapters.parsers import parse_su2_metrics
+from mcc.cognitive.scheduler import SuccessiveHalvingScheduler
+from mcc.cognitive.service import CognitiveSimulationService
+
+ALLRUN = """#!/bin/bash
+for i in $(seq 1 {steps}); do
+  echo "Time = $i"
+  echo "smoothSolver:  Solving for Ux, Initial residual = 1, Final residual = {residual}"
+  sleep 0.02
+done
+"""
+
+
+def test_successive_halving_stops_the_worst_jobs_early():
+    with tempfile.TemporaryDirectory() as td:
+        service = CognitiveSimulationService(base_workdir=td)
+        residuals = [1e-1, 1e-4, 1e-2, 1e-3, 5e-2, 1e-5]
+        job_ids = []
+        for r in residuals:
+            job = service.create_job("openfoam", {"residual": r})
+            Path(job["workdir"], "Allrun").write_text(ALLRUN.format(steps=30, residual=r), encoding="utf-8")
+            job_ids.append(job["job_id"])
+
+        scheduler = SuccessiveHalvingScheduler(
+            service,
+            metric="residual_final_last",
+            direction="minimize",
+            resource="time_last",
+            min_resource=4,
+            max_resource=30,
+            eta=2,
+            max_parallel=6,
+            min_peers=2,
+            poll_interval=0.01,
+        )
+        summary = scheduler.run(job_ids)
+
+        by_residual = dict(zip(residuals, (summary[j] for j in job_ids)))
+        assert by_residual[1e-5]["state"] == "completed"
+        assert by_residual[1e-1]["state"] == "stopped"
+        assert by_residual[1e-1]["resource"] < 30
+        assert sum(s["state"] == "stopped" for s in summary.values()) >= 3
+
+        # completed runs were auto-extracted from the streamed log
+        best = job_ids[residuals.index(1e-5)]
+        metrics = json.loads(Path(service.get_job(best)["job"]["workdir"], "metrics.json").read_text())["metrics"]
+        assert metrics["time_last"] == 30.0
+        assert service.get_job(job_ids[0])["result"]["error"].startswith("stopped early")
+
+
+
+def test_interrupted_scheduler_kills_running_solvers():
+    with tempfile.TemporaryDirectory() as td:
+        service = CognitiveSimulationService(base_workdir=td)
+        launched = []
+        launch_job = service.launch_job
+
+        def launch_and_record(job_id):
+            running = launch_job(job_id)
+            launched.append(running)
+            return running
+
+        service.launch_job = launch_and_record
+        job_ids = []
+        for r in (1e-1, 1e-2):
+            job = service.create_job("openfoam", {"residual": r})
+            Path(job["workdir"], "Allrun").write_text(ALLRUN.format(steps=500, residual=r), encoding="utf-8")
+            job_ids.append(job["job_id"])
+
+        def interrupted(seconds):
+            raise KeyboardInterrupt
+
+        scheduler = SuccessiveHalvingScheduler(service, metric="residual_final_last", sleep=interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            scheduler.run(job_ids)
+        assert len(launched) == 2
+        assert all(running.process.poll() is not None for running in launched)
+
+
+def test_su2_run_uses_the_launch_command(monkeypatch):
+    with tempfile.TemporaryDirectory() as td:
+        solver = Path(td, "fake_su2")
+        solver.write_text(
+            "#!/bin/sh\n"
+            "test -f \"$1\" || exit 3\n"
+            "echo '{\"metrics\": {\"Cl_last\": 0.25}}' > metrics.json\n",
+            encoding="utf-8",
+        )
+        os.chmod(solver, 0o755)
+        monkeypatch.setenv("SU2_CMD", str(solver))
+
+        service = CognitiveSimulationService(base_workdir=td)
+        job = service.create_job("su2", {})
+        result = service.run_job(job["job_id"])
+        assert result["status"] == "completed" and result["metrics"] == {"Cl_last": 0.25}
+
+
+def test_su2_table_parser():
+    text = (
+        "|  Inner_Iter|    rms[Rho]|   rms[RhoU]|          CL|          CD|\n"
+        "|          10|   -3.123456|   -2.654321|    0.251234|    0.012345|\n"
+        "|          11|   -3.200000|   -2.700000|    0.260000|    0.012300|\n"
+    )
+    assert parse_su2_metrics(text) == {
+        "iteration_last": 11.0,
+        "Cl_last": 0.26,
+        "Cd_last": 0.0123,
+        "residual_log10_rms_last": -2.7,
+    }
@@ -0,0 +1,97 @@
+import numpy as np
+
+from mcc.cognitive import (
+    DesignSpace,
+    GaussianProcessPlanner,
+    ObjectiveSpec,
+    RunResult,
+    TransferPrior,
+)
+from mcc.cognitive.gp import GaussianProcess
+
+SPACE = DesignSpace(bounds={"x": (0.0, 1.0), "y": (0.0, 1.0)})
+OBJECTIVES = [ObjectiveSpec(name="yield", direction="maximize")]
+
+
+def _task(shift, sign=1.0):
+    def f(p):
+        return sign * (10.0 - 20.0 * ((p["x"] - 0.7 - shift) ** 2 + (p["y"] - 0.3) ** 2))
+
+    return f
+
+
+def _runs(f, points, prefix):
+    return [
+        RunResult(
+            experiment_id=f"{prefix}-{i}",
+            status="ok",
+            parameters={"x": float(x), "y": float(y)},
+            outputs={"yield": f({"x": x, "y": y})},
+            score=f({"x": x, "y": y}),
+        )
+        for i, (x, y) in enumerate(points)
+    ]
+
+
+def _campaign(planner, f, steps):
+    history = []
+    for _ in range(steps):
+        spec = planner.propose(
+            domain="reactor_b", design_space=SPACE, objectives=OBJECTIVES, constraints=[], history=history
+        )[0]
+        history += _runs(f, [(spec.parameters["x"], spec.parameters["y"])], f"b{len(history)}")
+        history[-1].experiment_id = spec.experiment_id
+    return history, spec
+
+
+def test_similar_source_warm_starts_the_campaign():
+    rng = np.random.default_rng(0)
+    source = {"reactor_a": _runs(_task(0.05), rng.uniform(size=(40, 2)), "a")}
+    target = _task(0.0)
+
+    warm, spec = _campaign(GaussianProcessPlanner(transfer=TransferPrior(source), seed=1), target, 8)
+    cold, _ = _campaign(GaussianProcessPlanner(seed=1), target, 8)
+
+    assert "transfer" in spec.metadata
+    assert max(r.score for r in warm[:4]) > 9.0
+    assert max(r.score for r in warm[:4]) > max(r.score for r in cold[:4])
+
+
+def test_similarity_is_learned_from_target_runs():
+    rng = np.random.default_rng(1)
+    sources = {
+        "same": _runs(_task(0.0), rng.uniform(size=(40, 2)), "s"),
+        "opposite": _runs(_task(0.0, sign=-1.0), rng.uniform(size=(40, 2)), "o"),
+        "unrelated": [
+            RunResult(experiment_id="u", status="ok", parameters={"z": 1.0}, outputs={"other": 1.0})
+        ],
+    }
+    prior = TransferPrior(sources, shrinkage=5)
+    planner = GaussianProcessPlanner(transfer=prior)
+    history = _runs(_task(0.0), rng.uniform(size=(10, 2)), "t")
+    planner.propose(domain="t", design_space=SPACE, objectives=OBJECTIVES, constraints=[], history=history)
+
+    assert prior.similarity["same"] > 0.9
+    assert prior.similarity["opposite"] == 0.0
+    assert "unrelated" not in prior.similarity
+
+
+def test_source_models_are_cached_and_target_rows_windowed():
+    rng = np.random.default_rng(2)
+    prior = TransferPrior({"a": _runs(_task(0.0), rng.uniform(size=(30, 2)), "a")}, max_target_points=8)
+    target = _runs(_task(0.0), rng.uniform(size=(20, 2)), "t")
+    gp = GaussianProcess(length_scale=0.2).fit(
+        np.array([[r.parameters["x"], r.parameters["y"]] for r in target]),
+        np.array([r.score for r in target]),
+    )
+
+    seeded = prior.seed(gp, SPACE, ["x", "y"], OBJECTIVES)
+    source_gp = prior._models["a"][2]
+    assert len(seeded) == 30 + 8
+    np.testing.assert_allclose(seeded.x[-8:], gp.x[-8:])
+
+    prior.seed(gp, SPACE, ["x", "y"], OBJECTIVES)
+    assert prior._models["a"][2] is source_gp
+    # a different kernel needs its own source fit
+    prior.seed(GaussianProcess(length_scale=0.5).fit(gp.x, gp.y), SPACE, ["x", "y"], OBJECTIVES)
+    assert prior._models["a"][2] is not source_gp
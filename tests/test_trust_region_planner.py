@@ -0,0 +1,96 @@
+import os
+import tempfile
+
+import numpy as np
+
+from mcc.cognitive import (
+    CognitiveEngine,
+    CognitiveMemoryStore,
+    DesignSpace,
+    ObjectiveSpec,
+    RunResult,
+    TrustRegionPlanner,
+)
+
+
+def test_trust_region_planner_keeps_state_between_calls():
+    dims = 30
+    target = np.linspace(0.2, 0.7, dims)
+
+    def sim(params):
+        x = np.array([params[f"x{i}"] for i in range(dims)])
+        return {"f": -float(((x - target) ** 2).sum())}
+
+    with tempfile.TemporaryDirectory() as td:
+        planner = TrustRegionPlanner(n_regions=2, seed=1)
+        engine = CognitiveEngine(
+            domain="shape",
+            planner=planner,
+            memory=CognitiveMemoryStore(path=os.path.join(td, "mem.jsonl")),
+            simulator=sim,
+        )
+        space = DesignSpace(bounds={f"x{i}": (0.0, 1.0) for i in range(dims)})
+        for _ in range(12):
+            results = engine.run_iteration(
+                design_space=space,
+                objectives=[ObjectiveSpec(name="f", direction="maximize")],
+                constraints=[],
+                n=4,
+            )
+        assert all("planner=trust_region" in r.notes for r in results)
+        regions = planner._states["shape"].regions
+        assert len(regions) == 2
+
+
+def test_trust_region_grows_on_successes_and_shrinks_on_failures():
+    planner = TrustRegionPlanner(seed=1, success_tolerance=2, failure_tolerance=3)
+    kwargs = dict(
+        domain="box",
+        design_space=DesignSpace(bounds={"x": (0.0, 1.0), "y": (0.0, 1.0)}),
+        objectives=[ObjectiveSpec(name="f", direction="maximize")],
+        constraints=[],
+        n=1,
+    )
+    history = [
+        RunResult(experiment_id=f"init-{i}", status="ok", parameters={"x": x, "y": x}, outputs={"f": x}, score=x)
+        for i, x in enumerate(np.linspace(0.1, 0.5, 6))
+    ]
+
+    def step(value):
+        spec = planner.propose(history=history, **kwargs)[0]
+        history.append(
+            RunResult(
+                experiment_id=spec.experiment_id,
+                status="ok",
+                parameters=spec.parameters,
+                outputs={"f": value},
+                score=value,
+            )
+        )
+        # the new run is folded into the region streaks on the next call
+        planner.propose(history=history, **kwargs)
+        return planner._states["box"].regions[0]
+
+    lengths = [step(1.0 + k).length for k in range(4)]
+    assert lengths == [0.8, 1.6, 1.6, 1.6]
+    lengths = [step(0.0).length for _ in range(6)]
+    assert lengths == [1.6, 1.6, 0.8, 0.8, 0.8, 0.4]
+
+
+def test_trust_region_batch_is_capped_by_the_pool_and_never_repeats_a_candidate():
+    planner = TrustRegionPlanner(n_regions=2, random_candidates=3, seed=2)
+    history = [
+        RunResult(experiment_id=f"init-{i}", status="ok", parameters={"x": x}, outputs={"f": x}, score=x)
+        for i, x in enumerate(np.linspace(0.1, 0.9, 6))
+    ]
+    specs = planner.propose(
+        domain="tiny",
+        design_space=DesignSpace(bounds={"x": (0.0, 1.0)}),
+        objectives=[ObjectiveSpec(name="f", direction="maximize")],
+        constraints=[],
+        history=history,
+        n=10,
+    )
+    # two regions of three candidates each: six distinct picks, not ten with repeats
+    picks = {(s.metadata["region"], s.parameters["x"]) for s in specs}
+    assert len(specs) == len(picks) == 6
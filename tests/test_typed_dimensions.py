@@ -0,0 +1,117 @@
+import os
+import tempfile
+
+import numpy as np
+
+from mcc.cognitive import (
+    BaselineGridPlanner,
+    CognitiveEngine,
+    CognitiveMemoryStore,
+    DesignSpace,
+    Dimension,
+    ExpectedHypervolumePlanner,
+    GaussianProcessPlanner,
+    ModelBasedPlanner,
+    ObjectiveSpec,
+    OptunaTPEPlanner,
+    TrustRegionPlanner,
+)
+
+MODELS = ("laminar", "kEpsilon", "kOmegaSST")
+
+
+def _space():
+    return DesignSpace(
+        bounds={"inlet": (0.0, 1.0)},
+        dimensions={
+            "model": Dimension(kind="categorical", choices=MODELS),
+            "level": Dimension(kind="int", low=1, high=5),
+            "dt": Dimension(low=1e-4, high=1e-1, log=True),
+        },
+    )
+
+
+def _sim(params):
+    assert params["model"] in MODELS
+    assert isinstance(params["level"], int) and 1 <= params["level"] <= 5
+    assert 1e-4 <= params["dt"] <= 1e-1
+    bonus = {"laminar": 0.0, "kEpsilon": 1.0, "kOmegaSST": 2.0}[params["model"]]
+    return {"accuracy": bonus + params["level"] - (np.log10(params["dt"]) + 3.0) ** 2 - params["inlet"]}
+
+
+def test_encode_decode_and_snap_round_trip():
+    space = _space()
+    assert space.bounds["model"] == (-0.5, 2.5)
+    assert space.bounds["level"] == (0.5, 5.5)
+    assert np.allclose(space.bounds["dt"], np.log([1e-4, 1e-1]))
+
+    params = {"inlet": 0.3, "model": "kOmegaSST", "level": 4, "dt": 1e-3}
+    decoded = space.decode(space.encode(params))
+    assert decoded["model"] == "kOmegaSST" and decoded["level"] == 4
+    assert np.isclose(decoded["dt"], 1e-3) and decoded["inlet"] == 0.3
+
+    names = list(space.bounds)
+    snapped = space.snap(np.array([[0.3, 1.7, 5.4, -7.0]]), names)
+    assert space.decode(dict(zip(names, snapped[0]))) == {
+        "inlet": 0.3,
+        "model": "kOmegaSST",
+        "level": 5,
+        "dt": float(np.exp(-7.0)),
+    }
+
+    parsed = DesignSpace.from_spec(
+        {
+            "inlet": [0, 1],
+            "model": {"type": "categorical", "choices": list(MODELS)},
+            "level": {"type": "int", "low": 1, "high": 5},
+            "dt": {"type": "float", "low": 1e-4, "high": 1e-1, "log": True},
+        }
+    )
+    assert list(parsed.bounds) == ["inlet", "model", "level", "dt"]
+    assert parsed.bounds == {k: space.bounds[k] for k in parsed.bounds}
+
+
+def test_every_planner_proposes_valid_typed_values():
+    planners = {
+        "baseline": BaselineGridPlanner(),
+        "model_based": ModelBasedPlanner(acquisition="ei", refine_starts=2),
+        "gaussian_process": GaussianProcessPlanner(),
+        "ehvi": ExpectedHypervolumePlanner(random_candidates=64, mc_samples=8),
+        "trust_region": TrustRegionPlanner(random_candidates=128),
+        "optuna_tpe": OptunaTPEPlanner(startup_trials=4),
+    }
+    with tempfile.TemporaryDirectory() as td:
+        for name, planner in planners.items():
+            engine = CognitiveEngine(
+                domain="cfd",
+                planner=planner,
+                memory=CognitiveMemoryStore(path=os.path.join(td, f"{name}.jsonl")),
+                simulator=_sim,
+            )
+            for _ in range(5):
+                results = engine.run_iteration(
+                    design_space=_space(),
+                    objectives=[ObjectiveSpec(name="accuracy", direction="maximize")],
+                    constraints=[],
+                    n=2,
+                )
+                assert all(r.status == "ok" for r in results), name
+
+            # the typed values survive the memory round trip
+            stored = engine.memory.load_all()
+            assert {r.parameters["model"] for r in stored} <= set(MODELS)
+            assert all(isinstance(r.parameters["level"], int) for r in stored)
+
+
+def test_categorical_distance_is_hamming():
+    space = _space()
+    names = list(space.bounds)
+    lo = np.array([space.bounds[k][0] for k in names])
+    span = np.array([space.bounds[k][1] for k in names]) - lo
+    mismatch = np.where(space.categorical_mask(names), span, 0.0)
+
+    a = np.array([[0.5, 0.0, 3.0, -5.0]])
+    b = np.array([[0.5, 1.0, 3.0, -5.0], [0.5, 2.0, 3.0, -5.0]])
+    d = ModelBasedPlanner._distance_matrix(a, b, mismatch)
+    # "laminar" is as far from "kEpsilon" as from "kOmegaSST"
+    assert np.allclose(d, [[3.0, 3.0]])